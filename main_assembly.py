@@ -24,7 +24,7 @@ Integra todas as fases do compilador e gera código Assembly AVR:
 6. Geração Assembly AVR
 
 Usage:
-    python3 main_assembly.py <arquivo_entrada> [--nivel <nivel>] [--output <arquivo.s>]
+    python3 main_assembly.py <arquivo_entrada> [--nivel <nivel>] [--output <arquivo.s>] [--cache <n>] [--trabalhadores <n>] [--fundido] [--compartilhar]
     
 Exemplo:
     python3 main_assembly.py test_completo.txt --output output/programa.s
@@ -32,30 +32,49 @@ Exemplo:
 
 import sys
 from pathlib import Path
-from typing import List
+from typing import Iterable, Union
 
 sys.path.insert(0, str(Path(__file__).parent))
 
-from src.lexer import parse_expressao as tokenizar
+from src.lexer import parse_expressao as tokenizar, iterar_linhas
 from src.parser import parsear
-from src.grammar import construir_gramatica
-from src.syntax_tree import converter_derivacao_para_arvore
-from src.arvore_atribuida import gerar_arvore_atribuida
+from src.parser_iterativo import parsear_arvore
+from src.grammar import obter_gramatica
+from src.syntax_tree import converter_derivacao_para_arvore, criar_no
+from src.arvore_atribuida import gerar_visao_atribuida
 from src.gerador_tac import GeradorTAC
 from src.otimizador_tac import OtimizadorTAC
 from src.gerador_assembly_avr import GeradorAssemblyAVR
+from src.cache_expressoes import CacheExpressoes, TAMANHO_CACHE_PADRAO
+from src.arvore_compartilhada import TabelaNos
+from src.tokenizacao_paralela import tokenizar_paralelo, TAMANHO_LOTE_PADRAO
 
 
-def compilar_para_assembly(expressoes: List[str], nivel_otimizacao: str = 'completo',
-                          baud_rate: int = 9600, debug_print: bool = False) -> tuple:
+def compilar_para_assembly(expressoes: Iterable[Union[str, dict]], nivel_otimizacao: str = 'completo',
+                          baud_rate: int = 9600, debug_print: bool = False,
+                          tamanho_cache: int = TAMANHO_CACHE_PADRAO, trabalhadores: int = 1,
+                          tamanho_lote: int = TAMANHO_LOTE_PADRAO, fundido: bool = False,
+                          compartilhar_nos: bool = False) -> tuple:
     """
     Compila expressões RPN para Assembly AVR
     
     Args:
-        expressoes: Lista de expressões RPN
+        expressoes: Expressões RPN (strings) ou lotes já tokenizados de
+                    tokenizar_fluxo; pode ser um gerador consumido sob demanda
         nivel_otimizacao: Nível de otimização TAC
         baud_rate: Taxa UART
         debug_print: Se True, adiciona prints de debug após operações
+        tamanho_cache: Máximo de expressões no cache do front-end (0 desativa)
+        trabalhadores: Processos da tokenização paralela (None = um por
+                       núcleo); com valor diferente de 1, as
+                       expressões (strings) são tokenizadas em faixas de
+                       tamanho_lote linhas e linhas vazias são ignoradas
+        tamanho_lote: Linhas por tarefa da tokenização paralela
+        fundido: Se True, o parser monta direto a árvore atribuída
+                 (parsear_arvore), sem derivação nem cópias intermediárias
+        compartilhar_nos: Se True, a árvore sintática é montada com nós
+                          compartilhados (hash-consing): subárvores iguais
+                          viram um único objeto; sem efeito com fundido
         
     Returns:
         (codigo_assembly, estatisticas)
@@ -66,33 +85,70 @@ def compilar_para_assembly(expressoes: List[str], nivel_otimizacao: str = 'compl
     print()
     
     # Fase 1-2: Preparação
-    gramatica = construir_gramatica()
+    gramatica = obter_gramatica()
     gerador_tac = GeradorTAC()
     otimizador = OtimizadorTAC()
+    tabela_nos = TabelaNos() if compartilhar_nos else None
+    fabrica_nos = tabela_nos.criar_no if tabela_nos is not None else criar_no
+    cache = CacheExpressoes(tamanho_cache, tabela_nos) if tamanho_cache > 0 else None
     
-    print(f" Compilando {len(expressoes)} expressões...")
+    if hasattr(expressoes, '__len__'):
+        print(f" Compilando {len(expressoes)} expressões...")
+    else:
+        print(" Compilando expressões do fluxo de entrada...")
     print()
     
+    if trabalhadores != 1:
+        # Fase 1 em paralelo: os lotes chegam tokenizados e na ordem original
+        expressoes = tokenizar_paralelo(expressoes, trabalhadores, tamanho_lote)
+    
     # Processar cada expressão
     sucessos = 0
     falhas = 0
     
-    for i, expressao in enumerate(expressoes, 1):
+    for i, item in enumerate(expressoes, 1):
+        # lotes de tokenizar_fluxo já chegam com os tokens prontos
+        expressao = item['expressao'] if isinstance(item, dict) else item
         try:
-            # Fase 1: Léxica
-            tokens = tokenizar(expressao)
-            if not tokens:
-                print(f"  {i}. ✗ {expressao} - Erro léxico")
-                falhas += 1
-                continue
+            arvore_atribuida = None
+            
+            if isinstance(item, dict) and item['erro'] is not None:
+                raise item['erro']
             
-            # Fase 2: Sintática
-            resultado_parser = parsear(tokens, gramatica['tabela'])
-            derivacao = resultado_parser['derivacao']
+            if cache is not None:
+                # Fases 1-2 com cache: linhas repetidas reaproveitam a árvore
+                # (gerar_visao_atribuida só projeta a árvore e o TAC só lê
+                # a árvore fundida, então nada do cache é copiado nem alterado);
+                # lotes da tokenização paralela entram com os tokens prontos
+                tokens = item['tokens'] if isinstance(item, dict) else None
+                resultado_cache = cache.analisar_expressao(expressao, gramatica['tabela'], copiar=False,
+                                                           fundido=fundido, tokens=tokens)
+                arvore = resultado_cache['arvore']
+                arvore_atribuida = resultado_cache['arvore_atribuida']
+            else:
+                # Fase 1: Léxica
+                if isinstance(item, dict):
+                    tokens = item['tokens']
+                else:
+                    tokens = tokenizar(expressao)
+                if not tokens:
+                    print(f"  {i}. ✗ {expressao} - Erro léxico")
+                    falhas += 1
+                    continue
+                
+                # Fase 2: Sintática
+                if fundido:
+                    # Fases 2-3 fundidas: a árvore atribuída sai do parser
+                    arvore_atribuida = parsear_arvore(tokens)['arvore']
+                else:
+                    resultado_parser = parsear(tokens, gramatica['tabela'])
+                    derivacao = resultado_parser['derivacao']
+                    arvore = converter_derivacao_para_arvore(derivacao, fabrica_nos)
             
             # Fase 3: Semântica
-            arvore = converter_derivacao_para_arvore(derivacao)
-            arvore_atribuida = gerar_arvore_atribuida(arvore)
+            if arvore_atribuida is None:
+                # visão sem cópia: a árvore só é lida pelo TAC logo abaixo
+                arvore_atribuida = gerar_visao_atribuida(arvore)
             
             # Fase 4: TAC
             num_antes = len(gerador_tac.instrucoes)
@@ -109,6 +165,14 @@ def compilar_para_assembly(expressoes: List[str], nivel_otimizacao: str = 'compl
     
     print()
     print(f"Resultado: {sucessos} sucessos, {falhas} falhas")
+    if cache is not None:
+        stats_cache = cache.obter_estatisticas()
+        print(f"Cache: {stats_cache['acertos']} acertos, {stats_cache['falhas']} falhas, "
+              f"{stats_cache['remocoes']} remoções ({stats_cache['taxa_acerto'] * 100:.1f}% de acerto)")
+    if tabela_nos is not None:
+        stats_nos = tabela_nos.obter_estatisticas()
+        print(f"Nós compartilhados: {stats_nos['criados']} criados, {stats_nos['reaproveitados']} reaproveitados "
+              f"({stats_nos['taxa_reaproveitamento'] * 100:.1f}% de reaproveitamento)")
     print()
     
     # Fase 5: Otimização TAC
@@ -136,7 +200,7 @@ def compilar_para_assembly(expressoes: List[str], nivel_otimizacao: str = 'compl
     
     # Estatísticas finais
     estatisticas = {
-        'expressoes_total': len(expressoes),
+        'expressoes_total': sucessos + falhas,
         'expressoes_sucesso': sucessos,
         'expressoes_falhas': falhas,
         'tac_original': len(tac_original),
@@ -145,7 +209,9 @@ def compilar_para_assembly(expressoes: List[str], nivel_otimizacao: str = 'compl
         'percentual_reducao': percentual,
         'linhas_assembly': stats_asm['linhas_codigo'],
         'baud_rate': baud_rate,
-        'nivel_otimizacao': nivel_otimizacao
+        'nivel_otimizacao': nivel_otimizacao,
+        'cache': cache.obter_estatisticas() if cache is not None else None,
+        'nos_compartilhados': tabela_nos.obter_estatisticas() if tabela_nos is not None else None
     }
     
     return codigo_assembly, estatisticas
@@ -161,6 +227,10 @@ def main():
         print("  --output <arquivo>  Arquivo de saída Assembly (.s)")
         print("  --baud <rate>       Taxa UART (9600 ou 115200)")
         print("  --debug             Adicionar prints de debug após operações")
+        print(f"  --cache <n>         Expressões no cache do front-end (padrão {TAMANHO_CACHE_PADRAO}, 0 desativa)")
+        print("  --trabalhadores <n> Processos da análise léxica (padrão 1, 0 = um por núcleo)")
+        print("  --fundido           Parser monta direto a árvore atribuída (sem derivação)")
+        print("  --compartilhar      Subárvores iguais compartilhadas na árvore sintática")
         print()
         print("Exemplo:")
         print("  python3 main_assembly.py test_completo.txt --output programa.s")
@@ -173,6 +243,10 @@ def main():
     output = 'output/programa.s'
     baud = 9600
     debug = False
+    tamanho_cache = TAMANHO_CACHE_PADRAO
+    trabalhadores = 1
+    fundido = False
+    compartilhar_nos = False
     
     if '--nivel' in sys.argv:
         idx = sys.argv.index('--nivel')
@@ -192,23 +266,38 @@ def main():
     if '--debug' in sys.argv:
         debug = True
     
+    if '--cache' in sys.argv:
+        idx = sys.argv.index('--cache')
+        if idx + 1 < len(sys.argv):
+            tamanho_cache = int(sys.argv[idx + 1])
+    
+    if '--trabalhadores' in sys.argv:
+        idx = sys.argv.index('--trabalhadores')
+        if idx + 1 < len(sys.argv):
+            trabalhadores = int(sys.argv[idx + 1]) or None
+    
+    if '--fundido' in sys.argv:
+        fundido = True
+    
+    if '--compartilhar' in sys.argv:
+        compartilhar_nos = True
+    
     # Ler arquivo
     caminho = Path(arquivo_entrada)
     if not caminho.exists():
         print(f" Arquivo não encontrado: {arquivo_entrada}")
         sys.exit(1)
     
+    # Compilar (o arquivo é lido em fluxo, linha a linha)
     with open(caminho, 'r', encoding='utf-8') as f:
-        linhas = f.readlines()
-    
-    expressoes = [
-        linha.strip()
-        for linha in linhas
-        if linha.strip() and not linha.strip().startswith('#')
-    ]
-    
-    # Compilar
-    assembly, stats = compilar_para_assembly(expressoes, nivel, baud, debug)
+        expressoes = (
+            linha.strip()
+            for _, linha in iterar_linhas(f)
+            if linha.strip() and not linha.strip().startswith('#')
+        )
+        assembly, stats = compilar_para_assembly(expressoes, nivel, baud, debug, tamanho_cache, trabalhadores,
+                                                  fundido=fundido,
+                                                  compartilhar_nos=compartilhar_nos)
     
     # Salvar
     output_path = Path(output)
@@ -7,6 +7,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.token_types import *
 from src.tabela_simbolos import *
 from src.analisador_tipos import ErroSemantico
+from src.visitantes import Visitante, percorrer_com_visitantes
 
 def analisar_semantica_controle(arvore_sintatica, tabela_simbolos):
     """
@@ -44,25 +45,35 @@ def validar_estruturas_controle(no, tabela_simbolos, erros):
         tabela_simbolos (dict): tabela de símbolos
         erros (list): lista de erros encontrados
     """
-    if not no:
-        return
+    percorrer_com_visitantes(no, [ValidadorControle(tabela_simbolos, erros)])
+
+class ValidadorControle(Visitante):
+    """
+    visitante que valida IF e WHILE em pré-ordem; espera a árvore já
+    anotada com tipos (as condições são checadas pelo tipo dos operandos)
     
-    tipo_no = no.get('tipo')
+    Args:
+        tabela_simbolos (dict): tabela de símbolos
+        erros (list): lista onde os erros são acrescentados
+    """
     
-    # validar estrutura específica
-    if tipo_no == 'DECISAO':
-        erro = validar_estrutura_decisao(no, tabela_simbolos)
-        if erro:
-            erros.append(erro)
+    def __init__(self, tabela_simbolos, erros):
+        self.tabela_simbolos = tabela_simbolos
+        self.erros = erros
     
-    elif tipo_no == 'LACO':
-        erro = validar_estrutura_laco(no, tabela_simbolos)
+    def entrar(self, no, nivel):
+        tipo_no = no.get('tipo')
+        
+        # validar estrutura específica
+        if tipo_no == 'DECISAO':
+            erro = validar_estrutura_decisao(no, self.tabela_simbolos)
+        elif tipo_no == 'LACO':
+            erro = validar_estrutura_laco(no, self.tabela_simbolos)
+        else:
+            return
+        
         if erro:
-            erros.append(erro)
-    
-    # recursão nos filhos
-    for filho in no.get('filhos', []):
-        validar_estruturas_controle(filho, tabela_simbolos, erros)
+            self.erros.append(erro)
 
 def validar_estrutura_decisao(no, tabela_simbolos):
     """
@@ -256,36 +267,42 @@ def validar_aninhamento_controle(arvore):
     Returns:
         list: lista de avisos sobre aninhamento profundo
     """
-    avisos = []
+    aninhamento, = percorrer_com_visitantes(arvore, [AninhamentoControle()])
+    return aninhamento.avisos
+
+class AninhamentoControle(Visitante):
+    """
+    visitante que acompanha quantos IF/WHILE envolvem cada nó e avisa
+    quando o aninhamento passa de 3 níveis
+    """
     
-    def contar_profundidade(no, nivel=0):
-        if not no:
-            return nivel
-        
+    def __init__(self):
+        self.nivel = 0
+        self.profundidade = 0
+        self.avisos = []
+    
+    def entrar(self, no, nivel):
         tipo_no = no.get('tipo')
-        novo_nivel = nivel
         
         if tipo_no in ['DECISAO', 'LACO']:
-            novo_nivel = nivel + 1
+            self.nivel += 1
+            self.profundidade = max(self.profundidade, self.nivel)
             
             # avisar se aninhamento muito profundo
-            if novo_nivel > 3:
-                avisos.append({
+            if self.nivel > 3:
+                self.avisos.append({
                     'tipo': 'AVISO_CONTROLE',
-                    'mensagem': f'Aninhamento profundo de estruturas de controle (nível {novo_nivel})',
+                    'mensagem': f'Aninhamento profundo de estruturas de controle (nível {self.nivel})',
                     'linha': no.get('linha'),
                     'contexto': f'tipo: {tipo_no}'
                 })
-        
-        max_prof = novo_nivel
-        for filho in no.get('filhos', []):
-            prof_filho = contar_profundidade(filho, novo_nivel)
-            max_prof = max(max_prof, prof_filho)
-        
-        return max_prof
     
-    profundidade = contar_profundidade(arvore)
-    return avisos
+    def sair(self, no, nivel):
+        if no.get('tipo') in ['DECISAO', 'LACO']:
+            self.nivel -= 1
+    
+    def resultado(self):
+        return self.profundidade
 
 def gerar_relatorio_controle(erros, avisos=None):
     """
@@ -340,14 +357,14 @@ if __name__ == '__main__':
     
     from src.lexer import parse_expressao
     from src.parser import parsear
-    from src.grammar import construir_gramatica
+    from src.grammar import obter_gramatica
     from src.syntax_tree import gerar_arvore
     from src.gramatica_atributos import definir_gramatica_atributos
     from src.analisador_tipos import analisar_semantica
     
     try:
         # construir infraestrutura
-        gramatica_info = construir_gramatica()
+        gramatica_info = obter_gramatica()
         tabela = gramatica_info['tabela']
         gramatica_atributos = definir_gramatica_atributos()
         tabela_simbolos = inicializar_tabela_simbolos()
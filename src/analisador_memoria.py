@@ -7,6 +7,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.token_types import *
 from src.tabela_simbolos import *
 from src.analisador_tipos import ErroSemantico
+from src.visitantes import Visitante, percorrer_com_visitantes, iterar_pre_ordem
 
 def analisar_semantica_memoria(arvore_sintatica, tabela_simbolos):
     """
@@ -44,30 +45,37 @@ def validar_comandos_memoria(no, tabela_simbolos, erros):
         tabela_simbolos (dict): tabela de símbolos
         erros (list): lista de erros encontrados
     """
-    if not no:
-        return
-    
-    tipo_no = no.get('tipo')
+    percorrer_com_visitantes(no, [ValidadorMemoria(tabela_simbolos, erros)])
+
+class ValidadorMemoria(Visitante):
+    """
+    visitante que valida os comandos de memória em pré-ordem; espera a
+    árvore já anotada com tipos
     
-    # validar comando específico
-    if tipo_no == 'COMANDO_ARMAZENAR':
-        erro = validar_comando_armazenar(no, tabela_simbolos)
-        if erro:
-            erros.append(erro)
+    Args:
+        tabela_simbolos (dict): tabela de símbolos
+        erros (list): lista onde os erros são acrescentados
+    """
     
-    elif tipo_no == 'COMANDO_RECUPERAR':
-        erro = validar_comando_recuperar(no, tabela_simbolos)
-        if erro:
-            erros.append(erro)
+    def __init__(self, tabela_simbolos, erros):
+        self.tabela_simbolos = tabela_simbolos
+        self.erros = erros
     
-    elif tipo_no == 'COMANDO_RES':
-        erro = validar_comando_res(no, tabela_simbolos)
+    def entrar(self, no, nivel):
+        tipo_no = no.get('tipo')
+        
+        # validar comando específico
+        if tipo_no == 'COMANDO_ARMAZENAR':
+            erro = validar_comando_armazenar(no, self.tabela_simbolos)
+        elif tipo_no == 'COMANDO_RECUPERAR':
+            erro = validar_comando_recuperar(no, self.tabela_simbolos)
+        elif tipo_no == 'COMANDO_RES':
+            erro = validar_comando_res(no, self.tabela_simbolos)
+        else:
+            return
+        
         if erro:
-            erros.append(erro)
-    
-    # recursão nos filhos
-    for filho in no.get('filhos', []):
-        validar_comandos_memoria(filho, tabela_simbolos, erros)
+            self.erros.append(erro)
 
 def validar_comando_armazenar(no, tabela_simbolos):
     """
@@ -262,36 +270,39 @@ def validar_uso_identificadores(arvore, tabela_simbolos):
     """
     erros = []
     
-    def verificar_no(no):
-        if not no:
-            return
-        
-        tipo_no = no.get('tipo')
-        
+    for no, _ in iterar_pre_ordem(arvore):
         # identificador em operação ou expressão
-        if tipo_no == 'IDENTIFICADOR':
-            nome = no.get('valor')
-            linha = no.get('linha')
-            
-            # verificar se não é parte de comando de armazenamento
-            # (nesses casos, o identificador será declarado)
-            pai = no.get('pai')  # assumindo que adicionamos referência ao pai
-            
-            if not simbolo_existe(tabela_simbolos, nome):
-                erros.append({
-                    'tipo': 'ERRO_MEMORIA',
-                    'mensagem': f"Identificador '{nome}' não declarado",
-                    'linha': linha,
-                    'contexto': f"({nome})"
-                })
-        
-        # recursão
-        for filho in no.get('filhos', []):
-            verificar_no(filho)
+        if no.get('tipo') == 'IDENTIFICADOR':
+            erro = validar_identificador_declarado(no, tabela_simbolos)
+            if erro:
+                erros.append(erro)
     
-    verificar_no(arvore)
     return erros
 
+def validar_identificador_declarado(no, tabela_simbolos):
+    """
+    valida que um nó IDENTIFICADOR se refere a um símbolo declarado
+    
+    Args:
+        no (dict): nó IDENTIFICADOR
+        tabela_simbolos (dict): tabela de símbolos
+        
+    Returns:
+        dict: erro encontrado ou None
+    """
+    nome = no.get('valor')
+    linha = no.get('linha')
+    
+    if not simbolo_existe(tabela_simbolos, nome):
+        return {
+            'tipo': 'ERRO_MEMORIA',
+            'mensagem': f"Identificador '{nome}' não declarado",
+            'linha': linha,
+            'contexto': f"({nome})"
+        }
+    
+    return None  # sem erro
+
 def gerar_relatorio_memoria(tabela_simbolos, erros):
     """
     gera relatório de análise de memória
@@ -350,14 +361,14 @@ if __name__ == '__main__':
     
     from src.lexer import parse_expressao
     from src.parser import parsear
-    from src.grammar import construir_gramatica
+    from src.grammar import obter_gramatica
     from src.syntax_tree import gerar_arvore
     from src.gramatica_atributos import definir_gramatica_atributos
     from src.analisador_tipos import analisar_semantica
     
     try:
         # construir infraestrutura
-        gramatica_info = construir_gramatica()
+        gramatica_info = obter_gramatica()
         tabela = gramatica_info['tabela']
         gramatica_atributos = definir_gramatica_atributos()
         tabela_simbolos = inicializar_tabela_simbolos()
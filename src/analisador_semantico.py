@@ -0,0 +1,180 @@
+# analisador semântico unificado
+# tipos, comandos de memória, estruturas de controle, uso de identificadores,
+# aninhamento e regras de julgamento numa única passada pela árvore, com a
+# mesma tabela de símbolos; os resultados são os das análises separadas
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.visitantes import Visitante, percorrer_com_visitantes
+from src.analisador_tipos import AnotadorTipos, montar_regra_julgamento
+from src.analisador_memoria import ValidadorMemoria, validar_identificador_declarado
+from src.analisador_controle import ValidadorControle, AninhamentoControle
+
+# tipos de nó guardados durante a passada para as validações que dependem
+# da árvore inteira anotada
+COMANDOS_MEMORIA = ('COMANDO_ARMAZENAR', 'COMANDO_RECUPERAR', 'COMANDO_RES')
+ESTRUTURAS_CONTROLE = ('DECISAO', 'LACO')
+
+def analisar_semantica_unificada(arvore_sintatica, tabela_simbolos, linha_atual=1):
+    """
+    análise semântica completa numa única passada pela árvore
+    
+    equivale a analisar_semantica, analisar_semantica_memoria,
+    analisar_semantica_controle, validar_uso_identificadores,
+    validar_aninhamento_controle e gerar_relatorio_julgamento_tipos
+    chamados nessa ordem, com as mesmas listas de erros e avisos
+    
+    Args:
+        arvore_sintatica (dict): AST da Fase 2 (anotada no lugar)
+        tabela_simbolos (dict): tabela de símbolos compartilhada pelas análises
+        linha_atual (int): linha herdada pela raiz
+    
+    Returns:
+        dict: arvore_anotada, erros_tipos, erros_memoria, erros_controle,
+              erros_identificadores, avisos_controle, profundidade_controle
+              e regras_julgamento
+    """
+    analisador, = percorrer_com_visitantes(arvore_sintatica,
+                                           [AnalisadorSemantico(tabela_simbolos, linha_atual)])
+    analisador.finalizar()
+    resultado = analisador.resultado()
+    resultado['arvore_anotada'] = arvore_sintatica
+    return resultado
+
+class AnalisadorSemantico(Visitante):
+    """
+    visitante que faz todas as análises semânticas na mesma passada
+    
+    tipos e aninhamento são calculados durante o percurso. memória,
+    controle e identificadores precisam dos filhos anotados e, como o
+    armazenamento declara símbolos, da ordem das análises separadas (toda
+    a memória antes do controle e dos identificadores): os nós desses tipos
+    são guardados em pré-ordem e validados uma vez em finalizar, chamado ao
+    fim do percurso, sem novo percurso; resultado só lê o que foi calculado
+    
+    Args:
+        tabela_simbolos (dict): tabela de símbolos
+        linha_atual (int): linha herdada pela raiz
+    """
+    
+    def __init__(self, tabela_simbolos, linha_atual=1):
+        self.tabela_simbolos = tabela_simbolos
+        self.erros_tipos = []
+        self.anotador = AnotadorTipos(tabela_simbolos, self.erros_tipos, linha_atual)
+        self.aninhamento = AninhamentoControle()
+        # erro interno na anotação interrompe só a anotação, como em analisar_semantica
+        self.anotacao_interrompida = False
+        
+        self.comandos_memoria = []
+        self.estruturas_controle = []
+        self.identificadores = []
+        # (no, caminho) em pré-ordem; caminhos[n] dá o caminho dos filhos do nível n
+        self.julgamentos = []
+        self.caminhos = []
+        
+        # preenchidos por finalizar
+        self.finalizado = False
+        self.erros_memoria = []
+        self.erros_controle = []
+        self.erros_identificadores = []
+        self.regras_julgamento = []
+    
+    def entrar(self, no, nivel):
+        if not self.anotacao_interrompida:
+            self.anotador.entrar(no, nivel)
+        self.aninhamento.entrar(no, nivel)
+        
+        tipo_no = no.get('tipo')
+        if tipo_no in COMANDOS_MEMORIA:
+            self.comandos_memoria.append(no)
+        elif tipo_no in ESTRUTURAS_CONTROLE:
+            self.estruturas_controle.append(no)
+        elif tipo_no == 'IDENTIFICADOR':
+            self.identificadores.append(no)
+        
+        # caminho no formato de gerar_relatorio_julgamento_tipos; o índice conta os filhos None
+        caminhos = self.caminhos
+        del caminhos[nivel:]
+        caminho = next(caminhos[nivel - 1]) if nivel else ""
+        self.julgamentos.append((no, caminho))
+        
+        filhos = no.get('filhos')
+        if filhos:
+            caminhos.append(f"{caminho}/{tipo_no}[{i}]" for i, filho in enumerate(filhos) if filho)
+    
+    def sair(self, no, nivel):
+        if not self.anotacao_interrompida:
+            try:
+                self.anotador.sair(no, nivel)
+            except Exception as e:
+                self.erros_tipos.append({
+                    'tipo': 'ERRO_INTERNO',
+                    'mensagem': str(e),
+                    'linha': None
+                })
+                self.anotacao_interrompida = True
+        self.aninhamento.sair(no, nivel)
+    
+    def finalizar(self):
+        """
+        valida os nós guardados, na ordem das análises separadas
+        
+        chamado uma vez ao fim do percurso: a validação de memória declara
+        símbolos na tabela, então chamadas seguintes não fazem nada
+        """
+        if self.finalizado:
+            return
+        self.finalizado = True
+        
+        erros_memoria = self.erros_memoria
+        try:
+            validador = ValidadorMemoria(self.tabela_simbolos, erros_memoria)
+            for no in self.comandos_memoria:
+                validador.entrar(no, None)
+        except Exception as e:
+            erros_memoria.append({
+                'tipo': 'ERRO_INTERNO',
+                'mensagem': f"Erro interno na análise de memória: {str(e)}",
+                'linha': None
+            })
+        
+        erros_controle = self.erros_controle
+        try:
+            validador = ValidadorControle(self.tabela_simbolos, erros_controle)
+            for no in self.estruturas_controle:
+                validador.entrar(no, None)
+        except Exception as e:
+            erros_controle.append({
+                'tipo': 'ERRO_INTERNO',
+                'mensagem': f"Erro interno na análise de controle: {str(e)}",
+                'linha': None
+            })
+        
+        for no in self.identificadores:
+            erro = validar_identificador_declarado(no, self.tabela_simbolos)
+            if erro:
+                self.erros_identificadores.append(erro)
+        
+        for no, caminho in self.julgamentos:
+            regra = montar_regra_julgamento(no, caminho)
+            if regra:
+                self.regras_julgamento.append(regra)
+    
+    def resultado(self):
+        """
+        resultados calculados no percurso e em finalizar (sem efeitos)
+        
+        Returns:
+            dict: listas de erros e avisos, profundidade de controle e regras
+        """
+        return {
+            'erros_tipos': self.erros_tipos,
+            'erros_memoria': self.erros_memoria,
+            'erros_controle': self.erros_controle,
+            'erros_identificadores': self.erros_identificadores,
+            'avisos_controle': self.aninhamento.avisos,
+            'profundidade_controle': self.aninhamento.resultado(),
+            'regras_julgamento': self.regras_julgamento
+        }
@@ -7,6 +7,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.token_types import *
 from src.gramatica_atributos import definir_gramatica_atributos, promover_tipo, obter_regra_semantica
 from src.tabela_simbolos import *
+from src.visitantes import Visitante, percorrer_com_visitantes
 
 class ErroSemantico(Exception):
     """exceção para erros semânticos"""
@@ -48,7 +49,7 @@ def analisar_semantica(arvore_sintatica, gramatica_atributos, tabela_simbolos):
 
 def anotar_tipos_arvore(no, tabela_simbolos, erros, linha_atual=1):
     """
-    percorre árvore anotando tipos (pós-ordem)
+    percorre árvore anotando tipos (pós-ordem, sem recursão)
     
     Args:
         no (dict): nó da árvore
@@ -59,32 +60,48 @@ def anotar_tipos_arvore(no, tabela_simbolos, erros, linha_atual=1):
     Returns:
         dict: nó anotado com tipo
     """
-    if not no:
-        return no
-    
-    # adicionar linha ao nó se não tiver
-    if 'linha' not in no:
-        no['linha'] = linha_atual
+    percorrer_com_visitantes(no, [AnotadorTipos(tabela_simbolos, erros, linha_atual)])
+    return no
+
+class AnotadorTipos(Visitante):
+    """
+    visitante que anota 'linha' (na entrada, herdada do pai) e
+    'tipo_inferido' (na saída, com os filhos já anotados) em cada nó
     
-    # processar filhos primeiro (pós-ordem)
-    if 'filhos' in no and no['filhos']:
-        for i, filho in enumerate(no['filhos']):
-            no['filhos'][i] = anotar_tipos_arvore(filho, tabela_simbolos, erros, no.get('linha', linha_atual))
+    Args:
+        tabela_simbolos (dict): tabela de símbolos
+        erros (list): lista onde os erros de tipo são acrescentados
+        linha_atual (int): linha herdada pela raiz
+    """
     
-    # inferir tipo do nó atual
-    try:
-        tipo = inferir_tipo_no(no, tabela_simbolos, erros)
-        no['tipo_inferido'] = tipo
-    except ErroSemantico as e:
-        erros.append({
-            'tipo': 'ERRO_TIPO',
-            'mensagem': e.mensagem,
-            'linha': e.linha or no.get('linha'),
-            'contexto': e.contexto
-        })
-        no['tipo_inferido'] = 'erro'
+    def __init__(self, tabela_simbolos, erros, linha_atual=1):
+        self.tabela_simbolos = tabela_simbolos
+        self.erros = erros
+        # linhas[n] é a linha herdada pelos nós do nível n
+        self.linhas = [linha_atual]
     
-    return no
+    def entrar(self, no, nivel):
+        linhas = self.linhas
+        del linhas[nivel + 1:]
+        
+        # adicionar linha ao nó se não tiver
+        if 'linha' not in no:
+            no['linha'] = linhas[nivel]
+        linhas.append(no.get('linha', linhas[nivel]))
+    
+    def sair(self, no, nivel):
+        # inferir tipo do nó atual
+        try:
+            tipo = inferir_tipo_no(no, self.tabela_simbolos, self.erros)
+            no['tipo_inferido'] = tipo
+        except ErroSemantico as e:
+            self.erros.append({
+                'tipo': 'ERRO_TIPO',
+                'mensagem': e.mensagem,
+                'linha': e.linha or no.get('linha'),
+                'contexto': e.contexto
+            })
+            no['tipo_inferido'] = 'erro'
 
 def inferir_tipo_no(no, tabela_simbolos, erros):
     """
@@ -415,48 +432,66 @@ def gerar_relatorio_julgamento_tipos(arvore_anotada):
         if not no:
             return
         
-        tipo_no = no.get('tipo')
-        tipo_inferido = no.get('tipo_inferido')
-        linha = no.get('linha', '?')
-        
-        if tipo_inferido and tipo_inferido != 'erro':
-            regra = {
-                'linha': linha,
-                'tipo_no': tipo_no,
-                'tipo_inferido': tipo_inferido,
-                'caminho': caminho
-            }
-            
-            if tipo_no == 'OPERACAO':
-                regra['operador'] = no.get('operador')
-                filhos = no.get('filhos', [])
-                if len(filhos) >= 2:
-                    regra['tipos_operandos'] = [
-                        filhos[0].get('tipo_inferido'),
-                        filhos[1].get('tipo_inferido')
-                    ]
-            
+        regra = montar_regra_julgamento(no, caminho)
+        if regra:
             regras.append(regra)
         
         # recursão nos filhos
+        tipo_no = no.get('tipo')
         for i, filho in enumerate(no.get('filhos', [])):
             coletar_regras(filho, f"{caminho}/{tipo_no}[{i}]")
     
     coletar_regras(arvore_anotada)
     return regras
 
+def montar_regra_julgamento(no, caminho):
+    """
+    regra de dedução aplicada a um nó anotado
+    
+    Args:
+        no (dict): nó com tipo anotado
+        caminho (str): caminho do nó a partir da raiz
+        
+    Returns:
+        dict: regra aplicada, ou None se o nó não tem tipo válido
+    """
+    tipo_no = no.get('tipo')
+    tipo_inferido = no.get('tipo_inferido')
+    linha = no.get('linha', '?')
+    
+    if not tipo_inferido or tipo_inferido == 'erro':
+        return None
+    
+    regra = {
+        'linha': linha,
+        'tipo_no': tipo_no,
+        'tipo_inferido': tipo_inferido,
+        'caminho': caminho
+    }
+    
+    if tipo_no == 'OPERACAO':
+        regra['operador'] = no.get('operador')
+        filhos = no.get('filhos', [])
+        if len(filhos) >= 2:
+            regra['tipos_operandos'] = [
+                filhos[0].get('tipo_inferido'),
+                filhos[1].get('tipo_inferido')
+            ]
+    
+    return regra
+
 if __name__ == '__main__':
     # teste do analisador de tipos
     print("=== TESTE DO ANALISADOR DE TIPOS ===\n")
     
     from src.lexer import parse_expressao
     from src.parser import parsear
-    from src.grammar import construir_gramatica
+    from src.grammar import obter_gramatica
     from src.syntax_tree import gerar_arvore
     
     try:
         # construir infraestrutura
-        gramatica_info = construir_gramatica()
+        gramatica_info = obter_gramatica()
         tabela = gramatica_info['tabela']
         gramatica_atributos = definir_gramatica_atributos()
         tabela_simbolos = inicializar_tabela_simbolos()
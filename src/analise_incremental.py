@@ -0,0 +1,153 @@
+# análise léxica e sintática incremental para arquivos editados
+# cada linha é uma expressão independente, então uma edição só precisa
+# reanalisar as linhas que mudaram; as demais reaproveitam o resultado anterior
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import parse_expressao, LexerError
+from src.parser import parsear, ParserError
+from src.syntax_tree import SyntaxTreeError
+from src.arvore_compacta import gerar_arvore_compacta
+
+def dividir_linhas(texto):
+    """
+    divide um texto em linhas pelo '\\n' (um '\\n' final não cria linha vazia)
+    
+    Args:
+        texto (str): texto do arquivo ou trecho da edição
+    
+    Returns:
+        list: linhas sem a quebra
+    """
+    if not texto:
+        return []
+    linhas = texto.split('\n')
+    if texto.endswith('\n'):
+        linhas.pop()
+    return linhas
+
+def analisar_linha(linha, tabela_ll1):
+    """
+    análise léxica, sintática e árvore de uma única linha
+    
+    a árvore fica guardada no estado enquanto a linha não muda, então é
+    montada na forma compacta (arvore_compacta), lida como dicionário
+    
+    Args:
+        linha (str): conteúdo da linha
+        tabela_ll1 (dict): tabela de análise LL(1)
+    
+    Returns:
+        dict: {'texto', 'tokens', 'derivacao', 'arvore', 'erro'}, ou None
+              para linhas vazias e comentários
+    """
+    texto = linha.rstrip()
+    if not texto.strip() or texto.lstrip().startswith('#'):
+        return None
+    
+    resultado = {
+        'texto': linha,
+        'tokens': None,
+        'derivacao': None,
+        'arvore': None,
+        'erro': None
+    }
+    
+    try:
+        resultado['tokens'] = parse_expressao(texto)
+        resultado['derivacao'] = parsear(resultado['tokens'], tabela_ll1)['derivacao']
+        resultado['arvore'] = gerar_arvore_compacta(resultado['derivacao'])
+    except (LexerError, ParserError, SyntaxTreeError) as e:
+        resultado['erro'] = e
+    
+    return resultado
+
+def criar_estado(texto, tabela_ll1):
+    """
+    analisa um arquivo inteiro e cria o estado usado nas edições seguintes
+    
+    Args:
+        texto (str): conteúdo do arquivo
+        tabela_ll1 (dict): tabela de análise LL(1)
+    
+    Returns:
+        dict: estado com 'linhas', 'resultados' (um por linha, None para
+              linhas vazias/comentários) e 'linhas_reanalisadas'
+    """
+    linhas = dividir_linhas(texto)
+    return {
+        'linhas': linhas,
+        'resultados': [analisar_linha(linha, tabela_ll1) for linha in linhas],
+        'linhas_reanalisadas': len(linhas)
+    }
+
+def aplicar_edicao(estado, linha_inicio, linha_fim, texto_novo, tabela_ll1):
+    """
+    aplica uma edição de intervalo de linhas e reanalisa só o necessário
+    
+    as linhas linha_inicio..linha_fim (numeradas a partir de 1, inclusive)
+    são substituídas pelas linhas de texto_novo. linha_fim = linha_inicio - 1
+    insere sem remover e texto_novo vazio remove o intervalo. linhas fora do
+    intervalo, e linhas do intervalo cujo texto não mudou, mantêm o mesmo
+    objeto de resultado do estado anterior
+    
+    Args:
+        estado (dict): estado anterior (não é modificado)
+        linha_inicio (int): primeira linha substituída
+        linha_fim (int): última linha substituída
+        texto_novo (str): texto que ocupa o lugar do intervalo
+        tabela_ll1 (dict): tabela de análise LL(1)
+    
+    Returns:
+        dict: novo estado
+    
+    Raises:
+        ValueError: se o intervalo estiver fora do arquivo
+    """
+    total = len(estado['linhas'])
+    if not (1 <= linha_inicio <= total + 1) or not (linha_inicio - 1 <= linha_fim <= total):
+        raise ValueError(f"Intervalo de linhas inválido: {linha_inicio}..{linha_fim} (arquivo com {total} linhas)")
+    
+    inicio = linha_inicio - 1
+    antigas = estado['linhas'][inicio:linha_fim]
+    resultados_antigos = estado['resultados'][inicio:linha_fim]
+    
+    # linhas do intervalo que permaneceram iguais reaproveitam o resultado
+    anteriores = {}
+    for linha, resultado in zip(antigas, resultados_antigos):
+        anteriores.setdefault(linha, resultado)
+    
+    novas = dividir_linhas(texto_novo)
+    novos_resultados = []
+    reanalisadas = 0
+    
+    for linha in novas:
+        if linha in anteriores:
+            novos_resultados.append(anteriores[linha])
+        else:
+            novos_resultados.append(analisar_linha(linha, tabela_ll1))
+            reanalisadas += 1
+    
+    return {
+        'linhas': estado['linhas'][:inicio] + novas + estado['linhas'][linha_fim:],
+        'resultados': estado['resultados'][:inicio] + novos_resultados + estado['resultados'][linha_fim:],
+        'linhas_reanalisadas': reanalisadas
+    }
+
+def obter_erros(estado):
+    """
+    lista os erros léxicos e sintáticos do estado
+    
+    Args:
+        estado (dict): estado da análise incremental
+    
+    Returns:
+        list: pares (numero_linha, erro) com numeração a partir de 1
+    """
+    return [
+        (numero, resultado['erro'])
+        for numero, resultado in enumerate(estado['resultados'], 1)
+        if resultado is not None and resultado['erro'] is not None
+    ]
@@ -5,12 +5,43 @@ import os
 import json
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.arvore_binaria import salvar_arvores_binario, eh_arquivo_arvore_binaria, carregar_arvore_binario
+from src.visao_no import VisaoNo
+
 class ArvoreAtribuidaError(Exception):
     """exceção para erros na árvore atribuída"""
     def __init__(self, mensagem):
         self.mensagem = mensagem
         super().__init__(f"Erro na árvore atribuída: {mensagem}")
 
+def criar_no_atribuido(tipo, valor=None, filhos=None, linha=1):
+    """
+    cria nó já no formato final da árvore atribuída (o mesmo de limpar_arvore)
+    
+    usado pelo front-end fundido, que monta a árvore final direto no parser;
+    os atributos semânticos são preenchidos depois no próprio nó
+    
+    Args:
+        tipo (str): tipo do nó
+        valor (any): valor associado ao nó (omitido quando None)
+        filhos (list): lista de nós filhos
+        linha (int): linha da expressão
+    
+    Returns:
+        dict: nó da árvore atribuída
+    """
+    no = {
+        'tipo': tipo,
+        'tipo_inferido': None,
+        'linha': linha
+    }
+    
+    if valor is not None:
+        no['valor'] = valor
+    
+    no['filhos'] = filhos if filhos else []
+    return no
+
 def gerar_arvore_atribuida(arvore_anotada):
     """
     constrói árvore sintática abstrata atribuída final
@@ -29,9 +60,89 @@ def gerar_arvore_atribuida(arvore_anotada):
     
     return arvore_final
 
+def gerar_visao_atribuida(arvore_anotada):
+    """
+    árvore atribuída sem cópia: projeção somente leitura sobre a árvore anotada
+    
+    a visão lê o nó anotado a cada acesso, então mudanças feitas depois na
+    árvore anotada aparecem nela; serve para quem só lê a árvore em seguida
+    (a geração de TAC em main_assembly). para gravar, alterar ou comparar
+    com isinstance(..., dict), use gerar_arvore_atribuida
+    
+    Args:
+        arvore_anotada (dict): árvore com anotações de tipo
+        
+    Returns:
+        NoAtribuido: visão da árvore atribuída
+    
+    Raises:
+        ArvoreAtribuidaError: se a árvore estiver vazia
+    """
+    if not arvore_anotada:
+        raise ArvoreAtribuidaError("Árvore anotada vazia")
+    
+    return NoAtribuido(arvore_anotada)
+
+class NoAtribuido(VisaoNo):
+    """
+    visão somente leitura de um nó anotado no formato da árvore atribuída
+    
+    expõe só os campos de limpar_arvore, na mesma ordem: tipo, tipo_inferido,
+    linha (1 se ausente), valor e operador (se não forem None) e filhos (sem
+    os filhos None). os campos são lidos do nó anotado a cada acesso; a lista
+    de filhos é montada no primeiro acesso e guardada. o nó anotado não é
+    copiado nem alterado, então pode ser imutável (arvore_compartilhada) ou
+    estar guardado no cache de expressões
+    """
+    
+    __slots__ = ('no', 'lista_filhos')
+    
+    def __init__(self, no):
+        self.no = no
+        self.lista_filhos = None
+    
+    def obter_filhos(self):
+        """visões dos filhos não vazios, criadas uma única vez"""
+        if self.lista_filhos is None:
+            filhos = self.no.get('filhos')
+            self.lista_filhos = [NoAtribuido(filho) for filho in filhos if filho] if filhos else []
+        return self.lista_filhos
+    
+    def __getitem__(self, chave):
+        if chave == 'filhos':
+            return self.obter_filhos()
+        if chave == 'tipo' or chave == 'tipo_inferido':
+            return self.no.get(chave)
+        if chave == 'linha':
+            return self.no.get('linha', 1)
+        if chave == 'valor' or chave == 'operador':
+            valor = self.no.get(chave)
+            if valor is not None:
+                return valor
+        raise KeyError(chave)
+    
+    def keys(self):
+        """chaves do nó, na ordem de limpar_arvore"""
+        chaves = ['tipo', 'tipo_inferido', 'linha']
+        if self.no.get('valor') is not None:
+            chaves.append('valor')
+        if self.no.get('operador') is not None:
+            chaves.append('operador')
+        chaves.append('filhos')
+        return chaves
+    
+    def como_dicionario(self):
+        """
+        Returns:
+            dict: a subárvore como dicionários novos (igual a limpar_arvore)
+        """
+        return limpar_arvore(self.no)
+
 def limpar_arvore(no):
     """
-    remove informações desnecessárias e organiza estrutura
+    remove informações desnecessárias e organiza estrutura, copiando os nós
+    
+    percorre a árvore com pilha explícita, sem esbarrar no limite de recursão
     
     Args:
         no (dict): nó da árvore
@@ -42,57 +153,68 @@ def limpar_arvore(no):
     if not no:
         return None
     
-    # criar novo nó com campos ordenados
-    no_limpo = {
-        'tipo': no.get('tipo'),
-        'tipo_inferido': no.get('tipo_inferido'),
-        'linha': no.get('linha', 1)
-    }
-    
-    # adicionar campos específicos por tipo
-    if no.get('valor') is not None:
-        no_limpo['valor'] = no['valor']
-    
-    if no.get('operador') is not None:
-        no_limpo['operador'] = no['operador']
-    
-    # processar filhos recursivamente
-    if no.get('filhos'):
-        no_limpo['filhos'] = []
-        for filho in no['filhos']:
-            filho_limpo = limpar_arvore(filho)
-            if filho_limpo:
-                no_limpo['filhos'].append(filho_limpo)
-    else:
-        no_limpo['filhos'] = []
+    raiz = {}
+    pilha = [(no, raiz)]
+    while pilha:
+        no, no_limpo = pilha.pop()
+        
+        # campos ordenados
+        no_limpo['tipo'] = no.get('tipo')
+        no_limpo['tipo_inferido'] = no.get('tipo_inferido')
+        no_limpo['linha'] = no.get('linha', 1)
+        
+        # adicionar campos específicos por tipo
+        if no.get('valor') is not None:
+            no_limpo['valor'] = no['valor']
+        
+        if no.get('operador') is not None:
+            no_limpo['operador'] = no['operador']
+        
+        # filhos vazios são descartados; os demais são preenchidos depois
+        filhos = [filho for filho in no.get('filhos') or [] if filho]
+        no_limpo['filhos'] = [{} for _ in filhos]
+        pilha.extend(zip(filhos, no_limpo['filhos']))
     
-    return no_limpo
+    return raiz
 
-def salvar_arvore_json(arvore, nome_arquivo="arvore_atribuida.json"):
+def salvar_arvore_json(arvore, nome_arquivo="arvore_atribuida.json", formato='json'):
     """
-    salva árvore em formato JSON
+    salva árvore em formato JSON ou no formato binário (arvore_binaria)
     
     Args:
         arvore (dict): árvore atribuída
         nome_arquivo (str): nome do arquivo
+        formato (str): 'json' (legível, com indentação) ou 'binario'
+                       (compacto, mantém os literais numéricos decodificados)
     """
+    if formato not in ('json', 'binario'):
+        raise ArvoreAtribuidaError(f"Formato desconhecido: {formato}")
+    
     try:
+        if formato == 'binario':
+            salvar_arvores_binario([arvore], nome_arquivo)
+            return
+        
         with open(nome_arquivo, 'w', encoding='utf-8') as arquivo:
-            json.dump(arvore, arquivo, indent=2, ensure_ascii=False)
+            # visões (NoAtribuido) são gravadas como dicionários
+            json.dump(arvore, arquivo, indent=2, ensure_ascii=False, default=lambda no: no.como_dicionario())
     except Exception as e:
         raise ArvoreAtribuidaError(f"Erro ao salvar árvore: {str(e)}")
 
 def carregar_arvore_json(nome_arquivo):
     """
-    carrega árvore de arquivo JSON
+    carrega árvore de arquivo JSON ou binário (detectado pelo cabeçalho)
     
     Args:
         nome_arquivo (str): nome do arquivo
         
     Returns:
-        dict: árvore atribuída
+        dict: árvore atribuída (o formato binário é lido por inteiro)
     """
     try:
+        if eh_arquivo_arvore_binaria(nome_arquivo):
+            return carregar_arvore_binario(nome_arquivo)
+        
         with open(nome_arquivo, 'r', encoding='utf-8') as arquivo:
             return json.load(arquivo)
     except Exception as e:
@@ -0,0 +1,517 @@
+# formato binário compacto para árvores sintáticas (e atribuídas)
+# os nós são gravados em pré-ordem com registros de tamanho fixo, e o leitor
+# mapeia o arquivo (mmap) e só decodifica os nós que forem acessados
+
+import sys
+import os
+import mmap
+import struct
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.token_types import NumeroLiteral, decodificar_numero
+from src.visao_no import VisaoNo
+
+# formato binário de árvores (little-endian):
+#   cabeçalho: magic, versão, reservado, nº de strings, nº de raízes, nº de nós,
+#              nº de campos
+#   tabela de strings: (nº de strings + 1) deslocamentos uint32 + textos utf-8,
+#                      alinhada em 4 bytes
+#   raízes: índice uint32 do nó raiz de cada árvore
+#   nós: registros em pré-ordem (fim da subárvore, primeiro campo, nº de
+#        campos, marca); os filhos de i começam em i + 1 e cada irmão começa
+#        no fim da subárvore do anterior
+#   campos: registros (índice da chave, tipo do valor, valor) na ordem das
+#           chaves do nó; textos são índices na tabela de strings
+MAGICO_ARVORE = b'RPNA'
+VERSAO_FORMATO_ARVORE = 1
+CABECALHO_ARVORE = struct.Struct('<4sHHIIII')
+REGISTRO_NO = struct.Struct('<IIHH')
+REGISTRO_CAMPO = struct.Struct('<IB3xq')
+REGISTRO_CAMPO_REAL = struct.Struct('<IB3xd')
+
+# marca do registro de nó: nó comum ou filho None
+MARCA_NO = 0
+MARCA_NULO = 1
+
+# tipos de valor dos campos
+VALOR_NULO = 0
+VALOR_TEXTO = 1
+VALOR_NUMERO_LITERAL = 2
+VALOR_INTEIRO = 3
+VALOR_REAL = 4
+VALOR_LOGICO = 5
+VALOR_FILHOS = 6
+
+class ArvoreBinariaError(Exception):
+    """exceção para erros no formato binário de árvores"""
+    def __init__(self, mensagem):
+        self.mensagem = mensagem
+        super().__init__(f"Erro na árvore binária: {mensagem}")
+
+def alinhar(deslocamento):
+    """arredonda o deslocamento para o próximo múltiplo de 4"""
+    return (deslocamento + 3) & ~3
+
+def serializar_arvores_binario(raizes):
+    """
+    serializa árvores no formato binário
+    
+    aceita qualquer nó com a interface de dicionário (criar_no, árvore
+    atribuída, NoCompacto, NoCompartilhado); os valores podem ser None,
+    str (NumeroLiteral é preservado), int, float ou bool. o percurso usa
+    pilha explícita, então a profundidade não esbarra no limite de recursão
+    
+    Args:
+        raizes (list): nós raiz das árvores
+    
+    Returns:
+        bytes: conteúdo do arquivo binário
+    
+    Raises:
+        ArvoreBinariaError: se algum valor não for suportado
+    """
+    indices_strings = {}
+    textos = []
+    
+    def indice_texto(texto):
+        indice = indices_strings.get(texto)
+        if indice is None:
+            indice = indices_strings[texto] = len(textos)
+            textos.append(texto.encode('utf-8'))
+        return indice
+    
+    nos = []
+    campos = bytearray()
+    num_campos = 0
+    indices_raizes = []
+    
+    for raiz in raizes:
+        indices_raizes.append(len(nos))
+        
+        # pilha de iteradores de filhos, como em visitantes; pais guarda o
+        # registro que recebe o fim da subárvore quando os filhos terminam
+        pais = [None]
+        pilha = [iter((raiz,))]
+        while pilha:
+            for no in pilha[-1]:
+                if no is None:
+                    nos.append([len(nos) + 1, 0, 0, MARCA_NULO])
+                    continue
+                
+                registro = [0, num_campos, 0, MARCA_NO]
+                filhos = None
+                for chave, valor in no.items():
+                    if chave == 'filhos':
+                        filhos = valor
+                        campos += REGISTRO_CAMPO.pack(indice_texto(chave), VALOR_FILHOS, 0)
+                    elif valor is None:
+                        campos += REGISTRO_CAMPO.pack(indice_texto(chave), VALOR_NULO, 0)
+                    elif isinstance(valor, NumeroLiteral):
+                        campos += REGISTRO_CAMPO.pack(indice_texto(chave), VALOR_NUMERO_LITERAL, indice_texto(str(valor)))
+                    elif isinstance(valor, str):
+                        campos += REGISTRO_CAMPO.pack(indice_texto(chave), VALOR_TEXTO, indice_texto(valor))
+                    elif isinstance(valor, bool):
+                        campos += REGISTRO_CAMPO.pack(indice_texto(chave), VALOR_LOGICO, int(valor))
+                    elif isinstance(valor, int):
+                        try:
+                            campos += REGISTRO_CAMPO.pack(indice_texto(chave), VALOR_INTEIRO, valor)
+                        except struct.error:
+                            raise ArvoreBinariaError(f"Inteiro fora do intervalo em '{chave}': {valor}")
+                    elif isinstance(valor, float):
+                        campos += REGISTRO_CAMPO_REAL.pack(indice_texto(chave), VALOR_REAL, valor)
+                    else:
+                        raise ArvoreBinariaError(f"Valor não suportado em '{chave}': {type(valor).__name__}")
+                    registro[2] += 1
+                
+                num_campos += registro[2]
+                nos.append(registro)
+                if filhos:
+                    pais.append(registro)
+                    pilha.append(iter(filhos))
+                    break
+                registro[0] = len(nos)
+            else:
+                pilha.pop()
+                pai = pais.pop()
+                if pai is not None:
+                    pai[0] = len(nos)
+    
+    deslocamentos = [0]
+    for texto in textos:
+        deslocamentos.append(deslocamentos[-1] + len(texto))
+    
+    conteudo = bytearray(CABECALHO_ARVORE.pack(
+        MAGICO_ARVORE, VERSAO_FORMATO_ARVORE, 0,
+        len(textos), len(indices_raizes), len(nos), num_campos
+    ))
+    conteudo += struct.pack(f'<{len(deslocamentos)}I', *deslocamentos)
+    conteudo += b''.join(textos)
+    conteudo += bytes(alinhar(len(conteudo)) - len(conteudo))
+    conteudo += struct.pack(f'<{len(indices_raizes)}I', *indices_raizes)
+    conteudo += b''.join(REGISTRO_NO.pack(*registro) for registro in nos)
+    conteudo += campos
+    
+    return bytes(conteudo)
+
+def salvar_arvores_binario(raizes, nome_arquivo="arvores.bin"):
+    """
+    salva árvores no formato binário
+    
+    Args:
+        raizes (list): nós raiz das árvores
+        nome_arquivo (str): nome do arquivo de saída
+    
+    Raises:
+        ArvoreBinariaError: em caso de erro
+    """
+    conteudo = serializar_arvores_binario(raizes)
+    try:
+        with open(nome_arquivo, 'wb') as arquivo:
+            arquivo.write(conteudo)
+    except OSError as e:
+        raise ArvoreBinariaError(f"Erro ao salvar árvores: {str(e)}")
+
+def eh_arquivo_arvore_binaria(nome_arquivo):
+    """
+    verifica se o arquivo está no formato binário de árvores
+    
+    Args:
+        nome_arquivo (str): nome do arquivo
+    
+    Returns:
+        bool: True se o arquivo começa com MAGICO_ARVORE
+    """
+    with open(nome_arquivo, 'rb') as arquivo:
+        return arquivo.read(len(MAGICO_ARVORE)) == MAGICO_ARVORE
+
+class ArvoreBinaria:
+    """
+    leitor preguiçoso do formato binário de árvores
+    
+    o arquivo é mapeado em memória e só o cabeçalho, os deslocamentos da
+    tabela de strings e as raízes são lidos na abertura; cada nó é
+    decodificado no primeiro acesso (NoBinario) e textos e literais são
+    convertidos uma única vez. arvores[i] é a raiz da i-ésima árvore. as
+    visões dependem do mapa: use como_dicionario antes de fechar se a
+    árvore precisar sobreviver ao leitor
+    """
+    
+    def __init__(self, fonte):
+        """
+        Args:
+            fonte: nome do arquivo, ou bytes com o conteúdo já em memória
+        
+        Raises:
+            ArvoreBinariaError: se o arquivo não existe ou é inválido
+        """
+        self.mapa = None
+        
+        if isinstance(fonte, (bytes, bytearray, memoryview)):
+            self.visao = memoryview(fonte)
+        else:
+            if not os.path.exists(fonte):
+                raise ArvoreBinariaError(f"Arquivo não encontrado: {fonte}")
+            # o mapa guarda o próprio descritor: o arquivo pode ser fechado
+            with open(fonte, 'rb') as arquivo:
+                try:
+                    self.mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    raise ArvoreBinariaError("Arquivo binário vazio")
+            self.visao = memoryview(self.mapa)
+        
+        try:
+            self.ler_cabecalho()
+        except ArvoreBinariaError:
+            self.fechar()
+            raise
+    
+    def ler_cabecalho(self):
+        """lê cabeçalho, deslocamentos das strings e raízes, validando os tamanhos"""
+        visao = self.visao
+        try:
+            magico, versao, _, num_strings, num_raizes, num_nos, num_campos = CABECALHO_ARVORE.unpack_from(visao, 0)
+        except struct.error:
+            raise ArvoreBinariaError("Arquivo binário truncado: cabeçalho incompleto")
+        
+        if magico != MAGICO_ARVORE:
+            raise ArvoreBinariaError("Arquivo binário sem o cabeçalho de árvores")
+        if versao != VERSAO_FORMATO_ARVORE:
+            raise ArvoreBinariaError(f"Versão do formato binário não suportada: {versao}")
+        
+        try:
+            inicio = CABECALHO_ARVORE.size
+            self.deslocamentos = struct.unpack_from(f'<{num_strings + 1}I', visao, inicio)
+            self.inicio_textos = inicio + 4 * (num_strings + 1)
+            
+            inicio = alinhar(self.inicio_textos + self.deslocamentos[-1])
+            self.raizes = struct.unpack_from(f'<{num_raizes}I', visao, inicio)
+        except struct.error as e:
+            raise ArvoreBinariaError(f"Arquivo binário corrompido: {str(e)}")
+        
+        self.inicio_nos = inicio + 4 * num_raizes
+        self.inicio_campos = self.inicio_nos + num_nos * REGISTRO_NO.size
+        self.num_nos = num_nos
+        self.num_campos = num_campos
+        if self.inicio_campos + num_campos * REGISTRO_CAMPO.size > len(visao):
+            raise ArvoreBinariaError("Arquivo binário truncado: registros incompletos")
+        if any(raiz >= num_nos for raiz in self.raizes):
+            raise ArvoreBinariaError("Arquivo binário corrompido: raiz fora dos nós")
+        
+        self.textos = [None] * num_strings
+        self.literais = {}
+    
+    def __len__(self):
+        return len(self.raizes)
+    
+    def __getitem__(self, posicao):
+        return self.no(self.raizes[posicao])
+    
+    def __iter__(self):
+        return (self.no(raiz) for raiz in self.raizes)
+    
+    def texto(self, indice):
+        """string da tabela, decodificada no primeiro uso"""
+        texto = self.textos[indice]
+        if texto is None:
+            inicio = self.inicio_textos
+            texto = self.textos[indice] = sys.intern(str(
+                self.visao[inicio + self.deslocamentos[indice]:inicio + self.deslocamentos[indice + 1]], 'utf-8'
+            ))
+        return texto
+    
+    def registro(self, indice):
+        """
+        Args:
+            indice (int): índice do nó
+        
+        Returns:
+            tuple: (fim da subárvore, primeiro campo, nº de campos, marca)
+        """
+        if not 0 <= indice < self.num_nos:
+            raise ArvoreBinariaError(f"Arquivo binário corrompido: nó inexistente {indice}")
+        return REGISTRO_NO.unpack_from(self.visao, self.inicio_nos + indice * REGISTRO_NO.size)
+    
+    def no(self, indice):
+        """visão do nó (None para filho None gravado)"""
+        if self.registro(indice)[3] == MARCA_NULO:
+            return None
+        return NoBinario(self, indice)
+    
+    def filhos(self, indice):
+        """
+        Args:
+            indice (int): índice do nó
+        
+        Returns:
+            list: índices dos filhos, em ordem
+        """
+        fim = self.registro(indice)[0]
+        filhos = []
+        filho = indice + 1
+        while filho < fim:
+            filhos.append(filho)
+            filho = self.registro(filho)[0]
+        return filhos
+    
+    def decodificar_campos(self, posicao, quantidade):
+        """
+        decodifica registros de campo consecutivos
+        
+        Args:
+            posicao (int): byte do primeiro registro
+            quantidade (int): número de registros
+        
+        Returns:
+            dict: campos na ordem gravada ('filhos' como lista vazia)
+        """
+        visao = self.visao
+        textos = self.textos
+        campos = {}
+        try:
+            for chave, tipo_valor, valor in REGISTRO_CAMPO.iter_unpack(
+                visao[posicao:posicao + quantidade * REGISTRO_CAMPO.size]
+            ):
+                if tipo_valor == VALOR_TEXTO:
+                    valor = textos[valor] or self.texto(valor)
+                elif tipo_valor == VALOR_FILHOS:
+                    valor = []
+                elif tipo_valor == VALOR_NUMERO_LITERAL:
+                    literal = self.literais.get(valor)
+                    if literal is None:
+                        literal = self.literais[valor] = decodificar_numero(self.texto(valor))
+                    valor = literal
+                elif tipo_valor == VALOR_NULO:
+                    valor = None
+                elif tipo_valor == VALOR_REAL:
+                    valor = REGISTRO_CAMPO_REAL.unpack_from(visao, posicao)[2]
+                elif tipo_valor == VALOR_LOGICO:
+                    valor = bool(valor)
+                elif tipo_valor != VALOR_INTEIRO:
+                    raise ArvoreBinariaError(f"Arquivo binário corrompido: tipo de valor {tipo_valor}")
+                campos[textos[chave] or self.texto(chave)] = valor
+                posicao += REGISTRO_CAMPO.size
+        except IndexError:
+            raise ArvoreBinariaError("Arquivo binário corrompido: índice de string inválido")
+        
+        return campos
+    
+    def campos(self, indice):
+        """
+        decodifica os campos do nó, na ordem em que foram gravados
+        
+        Args:
+            indice (int): índice do nó
+        
+        Returns:
+            dict: campos do nó, com 'filhos' apontando para as visões dos filhos
+        """
+        _, primeiro, quantidade, _ = self.registro(indice)
+        if primeiro + quantidade > self.num_campos:
+            raise ArvoreBinariaError(f"Arquivo binário corrompido: campos do nó {indice}")
+        
+        campos = self.decodificar_campos(self.inicio_campos + primeiro * REGISTRO_CAMPO.size, quantidade)
+        if 'filhos' in campos:
+            campos['filhos'] = [self.no(filho) for filho in self.filhos(indice)]
+        return campos
+    
+    def materializar(self, indice):
+        """
+        converte a subárvore do nó em dicionários, sem recursão
+        
+        os nós da subárvore e os seus campos ocupam intervalos contínuos, lidos
+        em sequência; cada nó é anexado à lista de filhos do nó aberto mais
+        recente cuja subárvore o contém
+        
+        Args:
+            indice (int): índice do nó raiz
+        
+        Returns:
+            dict: nó raiz (None se for um filho None gravado)
+        """
+        fim_raiz, primeiro, _, marca = self.registro(indice)
+        if marca == MARCA_NULO:
+            return None
+        if fim_raiz > self.num_nos:
+            raise ArvoreBinariaError(f"Arquivo binário corrompido: subárvore do nó {indice}")
+        
+        registros = REGISTRO_NO.iter_unpack(
+            self.visao[self.inicio_nos + indice * REGISTRO_NO.size:self.inicio_nos + fim_raiz * REGISTRO_NO.size]
+        )
+        posicao = self.inicio_campos + primeiro * REGISTRO_CAMPO.size
+        
+        raiz = None
+        abertos = []
+        for atual, (fim, _, quantidade, marca) in enumerate(registros, indice):
+            no = None
+            if marca == MARCA_NO:
+                no = self.decodificar_campos(posicao, quantidade)
+                posicao += quantidade * REGISTRO_CAMPO.size
+            
+            while abertos and atual >= abertos[-1][0]:
+                abertos.pop()
+            if abertos:
+                abertos[-1][1].append(no)
+            else:
+                raiz = no
+            
+            if fim > atual + 1:
+                abertos.append((fim, no['filhos']))
+        
+        return raiz
+    
+    def carregar_todas(self):
+        """
+        Returns:
+            list: todas as árvores como dicionários
+        """
+        return [self.materializar(raiz) for raiz in self.raizes]
+    
+    def fechar(self):
+        """libera o mapa do arquivo"""
+        if self.mapa is not None:
+            self.visao.release()
+            self.mapa.close()
+            self.mapa = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *excecao):
+        self.fechar()
+        return False
+
+class NoBinario(VisaoNo):
+    """
+    visão somente leitura de um nó do arquivo binário
+    
+    os campos são decodificados no primeiro acesso e guardados; no['filhos']
+    devolve visões dos filhos, que por sua vez só são lidas quando acessadas.
+    a interface de dicionário vem de VisaoNo
+    """
+    
+    __slots__ = ('arvore', 'indice', 'dados')
+    
+    def __init__(self, arvore, indice):
+        self.arvore = arvore
+        self.indice = indice
+        self.dados = None
+    
+    def carregar(self):
+        """decodifica os campos do nó (uma vez)"""
+        if self.dados is None:
+            self.dados = self.arvore.campos(self.indice)
+        return self.dados
+    
+    def __getitem__(self, chave):
+        valor = self.carregar()[chave]
+        if chave == 'filhos':
+            # lista nova: a guardada na visão não pode ser alterada por fora
+            return list(valor)
+        return valor
+    
+    def keys(self):
+        """chaves do nó, na ordem gravada"""
+        return self.carregar().keys()
+    
+    def como_dicionario(self):
+        """
+        Returns:
+            dict: a subárvore inteira como dicionários novos
+        """
+        return self.arvore.materializar(self.indice)
+
+def carregar_arvores_binario(nome_arquivo):
+    """
+    abre um arquivo binário de árvores para leitura preguiçosa
+    
+    Args:
+        nome_arquivo (str): nome do arquivo
+    
+    Returns:
+        ArvoreBinaria: leitor; feche com fechar() ou use em um bloco with
+    
+    Raises:
+        ArvoreBinariaError: se o arquivo não existe ou é inválido
+    """
+    return ArvoreBinaria(nome_arquivo)
+
+def carregar_arvore_binario(nome_arquivo):
+    """
+    lê por inteiro a única árvore de um arquivo binário, fechando o mapa
+    
+    Args:
+        nome_arquivo (str): nome do arquivo
+    
+    Returns:
+        dict: árvore como dicionários novos (mutáveis)
+    
+    Raises:
+        ArvoreBinariaError: se o arquivo é inválido ou não tem exatamente uma
+                            árvore (várias árvores: carregar_arvores_binario)
+    """
+    with ArvoreBinaria(nome_arquivo) as arvores:
+        if len(arvores) != 1:
+            raise ArvoreBinariaError(
+                f"Arquivo com {len(arvores)} árvores: use carregar_arvores_binario"
+            )
+        return arvores.materializar(arvores.raizes[0])
@@ -0,0 +1,366 @@
+# árvore sintática compacta: arena de vetores paralelos em vez de um dict por nó
+
+import sys
+import os
+from array import array
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.syntax_tree import converter_derivacao_para_arvore, SyntaxTreeError
+from src.visao_no import VisaoNo
+
+# tipos de nó produzidos por converter_derivacao_para_arvore; o código é o índice
+TIPOS_NO = (
+    'EXPRESSAO',
+    'OPERACAO',
+    'COMPARACAO',
+    'NUMERO',
+    'IDENTIFICADOR',
+    'COMANDO_ARMAZENAR',
+    'COMANDO_RECUPERAR',
+    'COMANDO_RES',
+    'DECISAO',
+    'LACO',
+    'BLOCO_COMPOSTO',
+    'CONDICAO'
+)
+
+CODIGOS_TIPOS_NO = {tipo: codigo for codigo, tipo in enumerate(TIPOS_NO)}
+
+# marca de ausência nos vetores de índices (sem valor, sem filho, sem irmão)
+SEM_INDICE = -1
+
+class ArenaArvore:
+    """
+    arena que guarda os nós de uma ou mais árvores em vetores paralelos
+    
+    cada nó é um índice: tipos[i] tem o código do tipo (TIPOS_NO),
+    valores[i] o índice do valor em tabela_valores (valores repetidos, de
+    mesma classe, são guardados uma vez) e primeiro_filho[i]/proximo_irmao[i]
+    ligam os filhos. os nós são criados de baixo para cima, como em criar_no, e cada nó só
+    pode ser filho de um pai
+    
+    os nós precisam ser criados em pós-ordem (como fazem gerar_arvore_compacta
+    e compactar_arvore): adicionar_no recusa filhos que não sejam as
+    subárvores imediatamente anteriores ao novo nó, então cada subárvore
+    ocupa um intervalo contínuo de índices terminado na raiz
+    (iterar_pos_ordem, contar_nos)
+    """
+    
+    __slots__ = ('tipos', 'valores', 'primeiro_filho', 'proximo_irmao',
+                 'tabela_valores', 'indice_valores')
+    
+    def __init__(self):
+        self.tipos = array('B')
+        self.valores = array('i')
+        self.primeiro_filho = array('i')
+        self.proximo_irmao = array('i')
+        self.tabela_valores = []
+        self.indice_valores = {}
+    
+    def __len__(self):
+        return len(self.tipos)
+    
+    def adicionar_no(self, tipo, valor=None, filhos=()):
+        """
+        acrescenta um nó à arena
+        
+        Args:
+            tipo (str): tipo do nó (um de TIPOS_NO)
+            valor (any): valor associado ao nó
+            filhos (list): índices dos filhos, já criados na arena
+        
+        Returns:
+            int: índice do novo nó
+        
+        Raises:
+            SyntaxTreeError: se o tipo não for conhecido ou se os filhos não
+                             forem as subárvores imediatamente anteriores ao
+                             novo nó, em ordem (pós-ordem)
+        """
+        codigo = CODIGOS_TIPOS_NO.get(tipo)
+        if codigo is None:
+            raise SyntaxTreeError(f"Tipo desconhecido: {tipo}")
+        
+        if filhos:
+            self.validar_filhos(filhos)
+        
+        if valor is None:
+            indice_valor = SEM_INDICE
+        else:
+            # a classe entra na chave: NumeroLiteral e str de mesmo texto (ou
+            # 1, 1.0 e True) são valores diferentes, como em TabelaNos
+            indice_valor = self.indice_valores.setdefault((type(valor), valor), len(self.tabela_valores))
+            if indice_valor == len(self.tabela_valores):
+                self.tabela_valores.append(valor)
+        
+        # encadeia os filhos pelo próximo irmão
+        primeiro = SEM_INDICE
+        if filhos:
+            primeiro = filhos[0]
+            proximo_irmao = self.proximo_irmao
+            for anterior, filho in zip(filhos, filhos[1:]):
+                proximo_irmao[anterior] = filho
+        
+        self.tipos.append(codigo)
+        self.valores.append(indice_valor)
+        self.primeiro_filho.append(primeiro)
+        self.proximo_irmao.append(SEM_INDICE)
+        return len(self.tipos) - 1
+    
+    def validar_filhos(self, filhos):
+        """
+        confere que os filhos formam o bloco que termina logo antes do novo
+        nó: o último filho é o nó mais recente e cada filho termina onde
+        começa a subárvore do seguinte. com isso nenhum filho já tem pai
+        
+        Args:
+            filhos (list): índices dos filhos, em ordem
+        
+        Raises:
+            SyntaxTreeError: se os filhos não estiverem em pós-ordem contígua
+        """
+        if filhos[-1] != len(self.tipos) - 1:
+            raise SyntaxTreeError(
+                f"Filho {filhos[-1]} não é o último nó criado ({len(self.tipos) - 1}): "
+                f"os nós devem ser criados em pós-ordem"
+            )
+        
+        for anterior, filho in zip(filhos, filhos[1:]):
+            if anterior < 0 or anterior != self.inicio_subarvore(filho) - 1:
+                raise SyntaxTreeError(
+                    f"Filho {anterior} não termina logo antes da subárvore do filho {filho}: "
+                    f"os nós devem ser criados em pós-ordem"
+                )
+    
+    def criar_no(self, tipo, valor=None, filhos=None):
+        """
+        mesma assinatura de syntax_tree.criar_no, devolvendo a visão do nó
+        
+        Args:
+            tipo (str): tipo do nó
+            valor (any): valor associado ao nó
+            filhos (list): visões (NoCompacto) dos filhos, desta arena
+        
+        Returns:
+            NoCompacto: visão do novo nó
+        
+        Raises:
+            SyntaxTreeError: nas mesmas condições de adicionar_no
+        """
+        indices = [filho.indice for filho in filhos] if filhos else None
+        return NoCompacto(self, self.adicionar_no(tipo, valor, indices))
+    
+    def tipo(self, indice):
+        """nome do tipo do nó"""
+        return TIPOS_NO[self.tipos[indice]]
+    
+    def valor(self, indice):
+        """valor do nó (None quando não tem)"""
+        indice_valor = self.valores[indice]
+        return self.tabela_valores[indice_valor] if indice_valor != SEM_INDICE else None
+    
+    def filhos(self, indice):
+        """
+        Args:
+            indice (int): índice do nó
+        
+        Returns:
+            list: índices dos filhos, em ordem
+        """
+        filhos = []
+        filho = self.primeiro_filho[indice]
+        while filho != SEM_INDICE:
+            filhos.append(filho)
+            filho = self.proximo_irmao[filho]
+        return filhos
+    
+    def iterar_pre_ordem(self, raiz):
+        """
+        percorre a subárvore em pré-ordem sem recursão
+        
+        Args:
+            raiz (int): índice do nó raiz
+        
+        Yields:
+            int: índice de cada nó
+        """
+        primeiro_filho = self.primeiro_filho
+        proximo_irmao = self.proximo_irmao
+        
+        # ao visitar um nó empilha o irmão seguinte e depois o primeiro filho,
+        # então a subárvore do filho termina antes de o irmão sair da pilha
+        pilha = [raiz]
+        while pilha:
+            indice = pilha.pop()
+            yield indice
+            
+            irmao = proximo_irmao[indice]
+            if irmao != SEM_INDICE and indice != raiz:
+                pilha.append(irmao)
+            filho = primeiro_filho[indice]
+            if filho != SEM_INDICE:
+                pilha.append(filho)
+    
+    def inicio_subarvore(self, raiz):
+        """
+        Args:
+            raiz (int): índice do nó raiz
+        
+        Returns:
+            int: menor índice da subárvore (a folha mais à esquerda)
+        """
+        primeiro_filho = self.primeiro_filho
+        indice = raiz
+        while primeiro_filho[indice] != SEM_INDICE:
+            indice = primeiro_filho[indice]
+        return indice
+    
+    def iterar_pos_ordem(self, raiz):
+        """
+        percorre a subárvore em pós-ordem: é o intervalo de índices que
+        termina na raiz, sem pilha nem ligações
+        
+        Args:
+            raiz (int): índice do nó raiz
+        
+        Returns:
+            range: índices dos nós
+        """
+        return range(self.inicio_subarvore(raiz), raiz + 1)
+    
+    def contar_nos(self, raiz):
+        """
+        Args:
+            raiz (int): índice do nó raiz
+        
+        Returns:
+            int: número de nós da subárvore
+        """
+        return raiz - self.inicio_subarvore(raiz) + 1
+    
+    def no(self, indice):
+        """visão de dicionário somente leitura do nó"""
+        return NoCompacto(self, indice)
+    
+    def tamanho_bytes(self):
+        """
+        memória ocupada pelos vetores de nós (sem contar os valores)
+        
+        Returns:
+            int: bytes
+        """
+        return sum(
+            vetor.itemsize * len(vetor)
+            for vetor in (self.tipos, self.valores, self.primeiro_filho, self.proximo_irmao)
+        )
+
+class NoCompacto(VisaoNo):
+    """
+    visão somente leitura de um nó da arena com a interface de dicionário
+    
+    a interface de dicionário vem de VisaoNo; quem precisa alterar os nós
+    (análise semântica) usa como_dicionario
+    """
+    
+    __slots__ = ('arena', 'indice')
+    
+    def __init__(self, arena, indice):
+        self.arena = arena
+        self.indice = indice
+    
+    def __getitem__(self, chave):
+        if chave == 'tipo':
+            return self.arena.tipo(self.indice)
+        if chave == 'valor':
+            return self.arena.valor(self.indice)
+        if chave == 'filhos':
+            return [NoCompacto(self.arena, filho) for filho in self.arena.filhos(self.indice)]
+        raise KeyError(chave)
+    
+    def como_dicionario(self):
+        """
+        converte a subárvore para o formato de criar_no (dicionários novos)
+        
+        Returns:
+            dict: nó raiz com os filhos também convertidos
+        """
+        arena = self.arena
+        convertidos = {}
+        
+        # pós-ordem com pilha explícita: o nó é montado depois dos filhos
+        pilha = [(self.indice, False)]
+        while pilha:
+            indice, filhos_prontos = pilha.pop()
+            filhos = arena.filhos(indice)
+            if not filhos_prontos:
+                pilha.append((indice, True))
+                pilha.extend((filho, False) for filho in filhos)
+                continue
+            
+            convertidos[indice] = {
+                'tipo': arena.tipo(indice),
+                'valor': arena.valor(indice),
+                'filhos': [convertidos.pop(filho) for filho in filhos]
+            }
+        
+        return convertidos[self.indice]
+
+def gerar_arvore_compacta(derivacao, arena=None):
+    """
+    constrói a árvore sintática direto na arena, sem dicionários por nó
+    
+    Args:
+        derivacao (dict): estrutura de derivação do parser
+        arena (ArenaArvore): arena de destino (uma nova se None); várias
+                             árvores podem compartilhar a mesma arena
+    
+    Returns:
+        NoCompacto: visão da raiz
+    
+    Raises:
+        SyntaxTreeError: em caso de erro
+    """
+    if not derivacao:
+        raise SyntaxTreeError("Derivação vazia")
+    
+    if arena is None:
+        arena = ArenaArvore()
+    
+    return converter_derivacao_para_arvore(derivacao, arena.criar_no)
+
+def compactar_arvore(raiz, arena=None):
+    """
+    copia uma árvore com a interface de dicionário para a arena
+    
+    subárvores compartilhadas (o mesmo filho em vários pais, TabelaNos) são
+    copiadas uma vez por ocorrência; filhos None são descartados
+    
+    Args:
+        raiz (dict): nó raiz (dicionário, NoCompacto, NoCompartilhado...)
+        arena (ArenaArvore): arena de destino (uma nova se None)
+    
+    Returns:
+        NoCompacto: visão da raiz
+    """
+    if arena is None:
+        arena = ArenaArvore()
+    
+    # pós-ordem com pilha explícita: os índices dos filhos prontos ficam no
+    # fim de criados e o nó os consome ao ser criado
+    criados = []
+    pilha = [(raiz, None)]
+    while pilha:
+        no, quantidade = pilha.pop()
+        if quantidade is None:
+            filhos = [filho for filho in no.get('filhos') or [] if filho is not None]
+            pilha.append((no, len(filhos)))
+            # filhos empilhados ao contrário para serem criados em ordem
+            pilha.extend((filho, None) for filho in reversed(filhos))
+            continue
+        
+        inicio = len(criados) - quantidade
+        filhos = criados[inicio:]
+        del criados[inicio:]
+        criados.append(arena.adicionar_no(no['tipo'], no.get('valor'), filhos))
+    
+    return NoCompacto(arena, criados[0])
@@ -0,0 +1,211 @@
+# árvore sintática com compartilhamento estrutural (hash-consing)
+# subárvores iguais, como ((FAT CONT *) FAT) repetida em várias linhas de
+# fatorial.txt, viram um único objeto imutável guardado numa tabela de
+# referências fracas; o hash estrutural de cada nó é calculado uma vez
+
+import sys
+import os
+import weakref
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.syntax_tree import converter_derivacao_para_arvore, SyntaxTreeError
+from src.visao_no import VisaoNo
+
+class NoCompartilhado(VisaoNo):
+    """
+    nó imutável da árvore com a interface de dicionário de criar_no
+    
+    no['tipo'], no.get('valor'), no['filhos'] e 'filhos' in no se comportam
+    como no dicionário, então imprimir_arvore, salvar_arvore, os percursos e
+    gerar_arvore_atribuida (que copia a árvore) funcionam sem mudança. não
+    há atribuição: quem precisa anotar os nós usa como_dicionario
+    
+    o nó é hashable pelo conteúdo (hash guardado na criação), então serve de
+    chave em dicionários de memoização; nós da mesma TabelaNos são iguais se
+    e somente se forem o mesmo objeto
+    """
+    
+    __slots__ = ('tipo', 'valor', 'filhos', 'hash_estrutural', '__weakref__')
+    
+    def __init__(self, tipo, valor, filhos, hash_estrutural):
+        self.tipo = tipo
+        self.valor = valor
+        self.filhos = filhos
+        self.hash_estrutural = hash_estrutural
+    
+    def __getitem__(self, chave):
+        if chave == 'tipo':
+            return self.tipo
+        if chave == 'valor':
+            return self.valor
+        if chave == 'filhos':
+            # lista nova, como no dicionário; os filhos continuam compartilhados
+            return list(self.filhos)
+        raise KeyError(chave)
+    
+    def como_dicionario(self):
+        """
+        converte a subárvore para o formato de criar_no (dicionários novos)
+        
+        subárvores compartilhadas viram cópias independentes, então o
+        resultado pode ser anotado sem afetar outras árvores
+        
+        Returns:
+            dict: nó raiz com os filhos também convertidos
+        """
+        convertidos = []
+        
+        # pós-ordem com pilha explícita: o nó é montado depois dos filhos
+        pilha = [(self, False)]
+        while pilha:
+            no, filhos_prontos = pilha.pop()
+            if no is None:
+                convertidos.append(None)
+                continue
+            
+            if not filhos_prontos:
+                pilha.append((no, True))
+                pilha.extend((filho, False) for filho in reversed(no.filhos))
+                continue
+            
+            quantidade = len(no.filhos)
+            filhos = convertidos[len(convertidos) - quantidade:] if quantidade else []
+            del convertidos[len(convertidos) - quantidade:]
+            convertidos.append({'tipo': no.tipo, 'valor': no.valor, 'filhos': filhos})
+        
+        return convertidos[0]
+    
+    def __eq__(self, outro):
+        if self is outro:
+            return True
+        if isinstance(outro, NoCompartilhado):
+            # a comparação das tuplas de filhos testa identidade antes
+            return (self.hash_estrutural == outro.hash_estrutural and self.tipo == outro.tipo
+                    and self.valor == outro.valor and self.filhos == outro.filhos)
+        return super().__eq__(outro)
+    
+    def __hash__(self):
+        return self.hash_estrutural
+
+class TabelaNos:
+    """
+    tabela de internação dos nós compartilhados
+    
+    a chave é (tipo, classe do valor, valor, filhos): os filhos já são
+    internados, então comparar a tupla de filhos custa uma comparação de
+    identidade por filho. a classe do valor entra na chave para que um
+    NumeroLiteral nunca seja trocado por uma string de mesmo texto. a tabela
+    guarda referências fracas: um nó some dela quando nenhuma árvore o usa
+    """
+    
+    def __init__(self):
+        self.nos = weakref.WeakValueDictionary()
+        self.estatisticas = {
+            'criados': 0,
+            'reaproveitados': 0
+        }
+    
+    def __len__(self):
+        return len(self.nos)
+    
+    def criar_no(self, tipo, valor=None, filhos=None):
+        """
+        mesma assinatura de syntax_tree.criar_no, devolvendo o nó internado
+        
+        Args:
+            tipo (str): tipo do nó
+            valor (any): valor associado ao nó (hashable)
+            filhos (list): nós filhos, criados por esta tabela
+        
+        Returns:
+            NoCompartilhado: nó único para esse conteúdo
+        
+        Raises:
+            SyntaxTreeError: se algum filho não for NoCompartilhado
+        """
+        filhos = tuple(filhos) if filhos else ()
+        for filho in filhos:
+            if filho is not None and not isinstance(filho, NoCompartilhado):
+                raise SyntaxTreeError(f"Filho não compartilhado: {filho!r}")
+        
+        chave = (tipo, type(valor), valor, filhos)
+        no = self.nos.get(chave)
+        if no is not None:
+            self.estatisticas['reaproveitados'] += 1
+            return no
+        
+        no = NoCompartilhado(tipo, valor, filhos, hash(chave))
+        self.nos[chave] = no
+        self.estatisticas['criados'] += 1
+        return no
+    
+    def obter_estatisticas(self):
+        """
+        Returns:
+            dict: nós criados, reaproveitados, vivos na tabela e taxa de
+                  reaproveitamento
+        """
+        pedidos = self.estatisticas['criados'] + self.estatisticas['reaproveitados']
+        return {
+            'criados': self.estatisticas['criados'],
+            'reaproveitados': self.estatisticas['reaproveitados'],
+            'vivos': len(self.nos),
+            'taxa_reaproveitamento': self.estatisticas['reaproveitados'] / pedidos if pedidos else 0.0
+        }
+
+# tabela padrão, usada quando nenhuma é informada
+TABELA_PADRAO = TabelaNos()
+
+def gerar_arvore_compartilhada(derivacao, tabela=None):
+    """
+    constrói a árvore sintática internando as subárvores repetidas
+    
+    Args:
+        derivacao (dict): estrutura de derivação do parser
+        tabela (TabelaNos): tabela de internação (TABELA_PADRAO se None);
+                            árvores da mesma tabela compartilham subárvores
+    
+    Returns:
+        NoCompartilhado: nó raiz
+    
+    Raises:
+        SyntaxTreeError: em caso de erro
+    """
+    if not derivacao:
+        raise SyntaxTreeError("Derivação vazia")
+    
+    if tabela is None:
+        tabela = TABELA_PADRAO
+    
+    return converter_derivacao_para_arvore(derivacao, tabela.criar_no)
+
+def compartilhar_arvore(raiz, tabela=None):
+    """
+    interna uma árvore no formato de criar_no
+    
+    Args:
+        raiz (dict): nó raiz
+        tabela (TabelaNos): tabela de internação (TABELA_PADRAO se None)
+    
+    Returns:
+        NoCompartilhado: nó raiz
+    """
+    if tabela is None:
+        tabela = TABELA_PADRAO
+    
+    internados = {}
+    pilha = [(raiz, False)]
+    while pilha:
+        no, filhos_prontos = pilha.pop()
+        filhos = no.get('filhos') or []
+        if not filhos_prontos:
+            pilha.append((no, True))
+            pilha.extend((filho, False) for filho in filhos if filho)
+            continue
+        
+        internados[id(no)] = tabela.criar_no(
+            no['tipo'], no.get('valor'),
+            [internados[id(filho)] if filho else None for filho in filhos]
+        )
+    
+    return internados[id(raiz)]
@@ -0,0 +1,233 @@
+# cache LRU do front-end (léxico, sintático e árvore) por texto da expressão
+# programas gerados repetem as mesmas linhas muitas vezes; uma linha repetida
+# custa uma consulta ao dicionário em vez de análise léxica + sintática
+
+import sys
+import os
+from collections import OrderedDict
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import parse_expressao
+from src.token_types import Token
+from src.parser import parsear
+from src.syntax_tree import converter_derivacao_para_arvore, criar_no
+from src.parser_iterativo import parsear_arvore
+
+# número padrão de expressões mantidas no cache
+TAMANHO_CACHE_PADRAO = 1024
+
+def normalizar_expressao(linha):
+    """
+    normaliza os espaços de uma expressão para uso como chave do cache
+    
+    espaços só separam tokens, então colapsar sequências de espaços em um
+    único espaço não altera os tokens reconhecidos
+    
+    Args:
+        linha (str): expressão RPN
+    
+    Returns:
+        str: expressão sem espaços nas pontas e com espaços simples
+    """
+    return ' '.join(linha.split())
+
+def copiar_estrutura(valor):
+    """
+    copia dicionários e listas aninhados, compartilhando as folhas imutáveis
+    
+    mais barato que copy.deepcopy para derivações e árvores, que só contêm
+    dicionários, listas, strings e números
+    
+    Args:
+        valor: estrutura a copiar
+    
+    Returns:
+        cópia independente da estrutura
+    """
+    if isinstance(valor, dict):
+        return {chave: copiar_estrutura(item) for chave, item in valor.items()}
+    if isinstance(valor, list):
+        return [copiar_estrutura(item) for item in valor]
+    return valor
+
+def copiar_tokens(tokens):
+    """
+    copia os tokens guardados no cache
+    
+    Token não impede atribuição (um __setattr__ que a recusasse deixaria a
+    análise léxica mais lenta), então o cache só entrega cópias
+    
+    Args:
+        tokens (list): tokens da entrada do cache
+    
+    Returns:
+        list: novos Token com os mesmos campos
+    """
+    return [Token(token.codigo, token.valor, token.posicao) for token in tokens]
+
+class CacheExpressoes:
+    """
+    cache LRU limitado para o front-end do compilador
+    
+    a chave é o texto normalizado da expressão. cada entrada guarda os tokens
+    e, quando já calculadas, a derivação e a árvore sintática. as posições dos
+    tokens dependem dos espaços da linha, então uma linha com espaçamento
+    diferente reaproveita derivação e árvore, mas tem seus tokens refeitos.
+    
+    a tabela LL(1) não faz parte da chave: use um cache por gramática.
+    erros léxicos e sintáticos não são guardados e são levantados a cada uso
+    
+    com uma TabelaNos as árvores são montadas com nós compartilhados
+    (arvore_compartilhada): linhas diferentes com subárvores iguais guardam
+    essas subárvores uma só vez, e copiar_estrutura não copia nós imutáveis
+    """
+    
+    def __init__(self, tamanho_maximo=TAMANHO_CACHE_PADRAO, tabela_nos=None):
+        """
+        Args:
+            tamanho_maximo (int): número máximo de expressões no cache
+            tabela_nos (TabelaNos): tabela de internação das árvores (None
+                                    monta dicionários com criar_no)
+        """
+        if tamanho_maximo < 1:
+            raise ValueError("Tamanho do cache deve ser pelo menos 1")
+        
+        self.tamanho_maximo = tamanho_maximo
+        self.criar_no = tabela_nos.criar_no if tabela_nos is not None else criar_no
+        self.entradas = OrderedDict()
+        self.estatisticas = {
+            'acertos': 0,
+            'falhas': 0,
+            'remocoes': 0
+        }
+    
+    def __len__(self):
+        return len(self.entradas)
+    
+    def obter_entrada(self, linha, tokens=None):
+        """
+        busca ou cria a entrada da expressão, atualizando contadores e a ordem LRU
+        
+        Args:
+            linha (str): expressão RPN
+            tokens (list): tokens da linha já analisados (ex.: lotes de
+                           tokenizar_paralelo); None faz a análise léxica
+        
+        Returns:
+            dict: entrada com 'texto', 'tokens', 'derivacao' e 'arvore'
+        
+        Raises:
+            LexerError: se a expressão tem erro léxico
+        """
+        chave = normalizar_expressao(linha)
+        entrada = self.entradas.get(chave)
+        
+        if entrada is not None:
+            self.entradas.move_to_end(chave)
+            self.estatisticas['acertos'] += 1
+            
+            if entrada['texto'] != linha:
+                # mesmo conteúdo com outro espaçamento: posições mudam
+                entrada = dict(entrada, texto=linha, tokens=tokens if tokens is not None else parse_expressao(linha))
+            return entrada
+        
+        self.estatisticas['falhas'] += 1
+        entrada = {
+            'texto': linha,
+            'tokens': tokens if tokens is not None else parse_expressao(linha),
+            'derivacao': None,
+            'arvore': None,
+            'arvore_atribuida': None
+        }
+        
+        self.entradas[chave] = entrada
+        if len(self.entradas) > self.tamanho_maximo:
+            self.entradas.popitem(last=False)
+            self.estatisticas['remocoes'] += 1
+        
+        return entrada
+    
+    def tokenizar(self, linha):
+        """
+        equivalente a parse_expressao, com cache
+        
+        Args:
+            linha (str): expressão RPN
+        
+        Returns:
+            list: cópias dos tokens guardados
+        """
+        return copiar_tokens(self.obter_entrada(linha)['tokens'])
+    
+    def analisar_expressao(self, linha, tabela_ll1, copiar=True, fundido=False, tokens=None):
+        """
+        análise léxica, sintática e construção da árvore, com cache
+        
+        Args:
+            linha (str): expressão RPN
+            tabela_ll1 (dict): tabela de análise LL(1)
+            copiar (bool): se False, devolve as estruturas guardadas no cache,
+                           que não devem ser modificadas pelo chamador
+            fundido (bool): se True, monta só a árvore atribuída com o
+                            front-end fundido (parsear_arvore); derivação e
+                            árvore ficam como estiverem no cache
+            tokens (list): tokens da linha já analisados; numa falha do cache
+                           são usados no lugar da análise léxica
+        
+        Returns:
+            dict: {'tokens', 'derivacao', 'arvore', 'arvore_atribuida'}
+        
+        Raises:
+            LexerError, ParserError: em caso de erro na expressão
+        """
+        entrada = self.obter_entrada(linha, tokens)
+        
+        # a entrada pode ser uma cópia com tokens refeitos; guarda na original
+        original = self.entradas.get(normalizar_expressao(linha))
+        
+        if fundido and entrada['arvore_atribuida'] is None:
+            arvore_atribuida = parsear_arvore(entrada['tokens'])['arvore']
+            for alvo in (entrada, original):
+                if alvo is not None:
+                    alvo['arvore_atribuida'] = arvore_atribuida
+        
+        if not fundido and entrada['arvore'] is None:
+            derivacao = parsear(entrada['tokens'], tabela_ll1)['derivacao']
+            arvore = converter_derivacao_para_arvore(derivacao, self.criar_no)
+            
+            for alvo in (entrada, original):
+                if alvo is not None:
+                    alvo['derivacao'] = derivacao
+                    alvo['arvore'] = arvore
+        
+        if not copiar:
+            return {
+                'tokens': entrada['tokens'],
+                'derivacao': entrada['derivacao'],
+                'arvore': entrada['arvore'],
+                'arvore_atribuida': entrada['arvore_atribuida']
+            }
+        
+        return {
+            'tokens': copiar_tokens(entrada['tokens']),
+            'derivacao': copiar_estrutura(entrada['derivacao']),
+            'arvore': copiar_estrutura(entrada['arvore']),
+            'arvore_atribuida': copiar_estrutura(entrada['arvore_atribuida'])
+        }
+    
+    def limpar(self):
+        """remove todas as entradas, mantendo os contadores"""
+        self.entradas.clear()
+    
+    def obter_estatisticas(self):
+        """
+        Returns:
+            dict: acertos, falhas, remoções, tamanho atual e taxa de acerto
+        """
+        consultas = self.estatisticas['acertos'] + self.estatisticas['falhas']
+        return {
+            **self.estatisticas,
+            'tamanho': len(self.entradas),
+            'tamanho_maximo': self.tamanho_maximo,
+            'taxa_acerto': self.estatisticas['acertos'] / consultas if consultas else 0.0
+        }
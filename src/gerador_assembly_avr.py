@@ -29,6 +29,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.otimizador_tac import InstrucaoTAC
+from src.token_types import valor_numerico
 
 
 class GeradorAssemblyAVR:
@@ -541,11 +542,15 @@ class GeradorAssemblyAVR:
     
     def eh_constante(self, valor: str) -> bool:
         """Verifica se um valor é uma constante numérica"""
-        try:
-            float(valor)
-            return True
-        except (ValueError, TypeError):
-            return False
+        return valor_numerico(valor) is not None
+    
+    def valor_inteiro(self, valor: str) -> int:
+        """
+        Obtém o valor inteiro de uma constante (truncado)
+        
+        Literais do léxico já chegam decodificados, sem nova conversão de texto.
+        """
+        return int(valor_numerico(valor))
     
     def eh_variavel_nomeada(self, nome: str) -> bool:
         """
@@ -659,7 +664,7 @@ class GeradorAssemblyAVR:
         
         if self.eh_constante(valor):
             # Valor é constante
-            const_val = int(float(valor)) & 0xFF
+            const_val = self.valor_inteiro(valor) & 0xFF
             
             if self.eh_variavel_nomeada(resultado):
                 # Resultado é variável nomeada → Salvar na SRAM
@@ -726,7 +731,7 @@ class GeradorAssemblyAVR:
         # Obter registrador/valor do primeiro operando
         if self.eh_constante(op1):
             # Primeira constante
-            val1 = int(float(op1))
+            val1 = self.valor_inteiro(op1)
             reg_temp1 = self.alocar_registrador('_temp_op1')
             asm.append(f"    ldi r{reg_temp1}, {val1}")
             reg_op1 = reg_temp1
@@ -744,7 +749,7 @@ class GeradorAssemblyAVR:
         
         # Obter registrador/valor do segundo operando
         if self.eh_constante(op2):
-            val2 = int(float(op2))
+            val2 = self.valor_inteiro(op2)
             reg_temp2 = self.alocar_registrador('_temp_op2')
             asm.append(f"    ldi r{reg_temp2}, {val2}")
             reg_op2 = reg_temp2
@@ -924,7 +929,7 @@ class GeradorAssemblyAVR:
         # Obter valor de origem
         if self.eh_constante(src):
             # Fonte é constante
-            const_val = int(float(src)) & 0xFF
+            const_val = self.valor_inteiro(src) & 0xFF
             
             if self.eh_variavel_nomeada(dest):
                 # Destino é variável nomeada → Salvar na SRAM
@@ -1003,7 +1008,7 @@ class GeradorAssemblyAVR:
         
         # Se condição é constante, avaliar em tempo de compilação
         if self.eh_constante(condicao):
-            val = int(float(condicao))
+            val = self.valor_inteiro(condicao)
             if val == 0:
                 # Condição sempre falsa, sempre pula
                 asm.append(f"    rjmp {label}  ; {condicao} é falso (constante)")
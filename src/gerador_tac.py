@@ -17,6 +17,8 @@ from typing import List, Dict, Optional, Any, Union
 # Adicionar diretório ao path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.arvore_atribuida import NoAtribuido
+
 class InstrucaoTAC:
     """
     Representa uma instrução Three Address Code
@@ -140,8 +142,8 @@ class GeradorTAC:
         Returns:
             Valor do atributo ou padrão
         """
-        # Se é um dicionário
-        if isinstance(no, dict):
+        # Se é um dicionário (ou a visão da árvore atribuída)
+        if isinstance(no, (dict, NoAtribuido)):
             return no.get(atributo, padrao)
         
         # Se é um objeto com atributos
@@ -204,10 +206,11 @@ class GeradorTAC:
             temp = self.novo_temporario()
             valor = self.obter_atributo(no, 'valor', '0')
             
+            # literais do léxico (NumeroLiteral) seguem tipados até o backend
             instrucao = InstrucaoTAC(
                 tipo='ATRIBUICAO',
                 resultado=temp,
-                operando1=str(valor),
+                operando1=valor if isinstance(valor, str) else str(valor),
                 linha=linha
             )
             self.adicionar_instrucao(instrucao)
@@ -2,24 +2,51 @@
 
 import sys
 import os
+import json
+import hashlib
+from array import array
+from collections import deque
+from functools import lru_cache
+from types import MappingProxyType
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.token_types import *
 
+# versão do arquivo de cache da análise; mudar invalida caches antigos
+VERSAO_CACHE_GRAMATICA = 1
+# diretório do cache em disco; opcional: só é usado com RPN_CACHE_DIR definido
+DIRETORIO_CACHE_GRAMATICA = os.environ.get('RPN_CACHE_DIR') or None
+# chaves obrigatórias de um arquivo de cache (resultado de analisar_gramatica)
+CHAVES_CACHE_GRAMATICA = ('hash', 'producoes', 'first', 'follow', 'tabela')
+
+@lru_cache(maxsize=None)
+def calcular_impressao_codigo():
+    """
+    hash do código-fonte deste módulo, que entra no nome do arquivo de cache:
+    qualquer mudança no cálculo de FIRST, FOLLOW ou da tabela invalida os
+    caches antigos sem depender de alguém lembrar de mudar
+    VERSAO_CACHE_GRAMATICA. só é calculado quando o cache em disco é usado
+    
+    Returns:
+        str: sha256 em hexadecimal
+    """
+    with open(os.path.abspath(__file__), 'rb') as arquivo:
+        return hashlib.sha256(arquivo.read()).hexdigest()
+
 class GramaticaError(Exception):
     """exceção para erros na gramática"""
     def __init__(self, mensagem):
         self.mensagem = mensagem
         super().__init__(f"Erro na gramática: {mensagem}")
 
-def construir_gramatica():
+def definir_producoes():
     """
     define regras de produção da gramática RPN
     
     Returns:
-        dict: estrutura com produções, first, follow e tabela LL(1)
+        dict: não_terminal -> lista de produções (nova cópia a cada chamada)
     """
-    gramatica = {
+    return {
         'PROGRAMA': [
             ['EXPRESSAO']
         ],
@@ -81,6 +108,17 @@ def construir_gramatica():
             ['<=']
         ]
     }
+
+def construir_gramatica():
+    """
+    constrói a gramática RPN recalculando FIRST, FOLLOW e tabela LL(1)
+    
+    para uso repetido prefira obter_gramatica, que reaproveita a análise
+    
+    Returns:
+        dict: estrutura com produções, first, follow e tabela LL(1)
+    """
+    gramatica = definir_producoes()
     
     # calcular conjuntos FIRST e FOLLOW
     first = calcular_all_first(gramatica)
@@ -98,7 +136,8 @@ def construir_gramatica():
         'producoes': gramatica,
         'first': first,
         'follow': follow,
-        'tabela': tabela
+        'tabela': tabela,
+        'tabela_densa': TabelaLL1Densa(gramatica, tabela)
     }
 
 def eh_terminal(simbolo):
@@ -113,6 +152,193 @@ def eh_nao_terminal(simbolo):
     """verifica se símbolo é não-terminal (maiúscula)"""
     return simbolo and simbolo[0].isupper() and simbolo not in ['RES', 'IF', 'WHILE']
 
+# conjuntos de terminais são representados como inteiros (bitsets): o bit i
+# corresponde ao terminal de índice i; o bit 0 é sempre 'ε'
+BIT_EPSILON = 1
+
+def indexar_terminais(gramatica):
+    """
+    atribui um bit a cada terminal da gramática
+    
+    Args:
+        gramatica (dict): produções da gramática
+        
+    Returns:
+        tuple: (lista de terminais por índice, dicionário terminal -> bit)
+    """
+    terminais = ['ε', '$']
+    for producoes in gramatica.values():
+        for producao in producoes:
+            for simbolo in producao:
+                if eh_terminal(simbolo) and simbolo not in terminais:
+                    terminais.append(simbolo)
+    
+    return terminais, {terminal: 1 << i for i, terminal in enumerate(terminais)}
+
+def bits_para_conjunto(bits, terminais):
+    """
+    converte um bitset de terminais em set
+    
+    Args:
+        bits (int): bitset
+        terminais (list): terminais por índice
+        
+    Returns:
+        set: terminais cujos bits estão ligados
+    """
+    conjunto = set()
+    indice = 0
+    while bits:
+        if bits & 1:
+            conjunto.add(terminais[indice])
+        bits >>= 1
+        indice += 1
+    return conjunto
+
+def compilar_producoes(gramatica, bit_terminal):
+    """
+    representa cada produção como tupla de pares (eh_terminal, valor), onde
+    valor é o bit do terminal ou o nome do não-terminal
+    
+    Args:
+        gramatica (dict): produções da gramática
+        bit_terminal (dict): terminal -> bit
+        
+    Returns:
+        dict: não_terminal -> lista de produções compiladas
+    """
+    return {
+        nao_terminal: [
+            tuple((True, bit_terminal[s]) if eh_terminal(s) else (False, s) for s in producao)
+            for producao in producoes
+        ]
+        for nao_terminal, producoes in gramatica.items()
+    }
+
+def first_sequencia_bits(sequencia, first_bits):
+    """
+    FIRST de uma sequência de símbolos compilados
+    
+    Args:
+        sequencia (tuple): pares (eh_terminal, valor)
+        first_bits (dict): não_terminal -> bitset FIRST
+        
+    Returns:
+        int: bitset FIRST da sequência (com BIT_EPSILON se toda ela é anulável)
+    """
+    resultado = 0
+    for terminal, valor in sequencia:
+        if terminal:
+            return resultado | valor
+        bits = first_bits.get(valor, 0)
+        resultado |= bits & ~BIT_EPSILON
+        if not bits & BIT_EPSILON:
+            return resultado
+    return resultado | BIT_EPSILON
+
+def calcular_first_bits(gramatica, bit_terminal):
+    """
+    calcula FIRST de todos os não-terminais por ponto fixo com lista de trabalho
+    
+    um não-terminal só é recalculado quando o FIRST de algum símbolo das suas
+    produções muda, então recursão à esquerda e cadeias de ε não causam
+    recursão nem recálculo desnecessário
+    
+    Args:
+        gramatica (dict): produções da gramática
+        bit_terminal (dict): terminal -> bit
+        
+    Returns:
+        dict: não_terminal -> bitset FIRST
+    """
+    producoes = compilar_producoes(gramatica, bit_terminal)
+    first_bits = {nao_terminal: 0 for nao_terminal in gramatica}
+    
+    # dependentes[B]: não-terminais com B em alguma produção
+    dependentes = {nao_terminal: set() for nao_terminal in gramatica}
+    for nao_terminal, lista in producoes.items():
+        for producao in lista:
+            for terminal, valor in producao:
+                if not terminal and valor in dependentes:
+                    dependentes[valor].add(nao_terminal)
+    
+    pendentes = deque(gramatica)
+    na_fila = set(gramatica)
+    
+    while pendentes:
+        nao_terminal = pendentes.popleft()
+        na_fila.discard(nao_terminal)
+        
+        bits = first_bits[nao_terminal]
+        for producao in producoes[nao_terminal]:
+            bits |= first_sequencia_bits(producao, first_bits)
+        
+        if bits != first_bits[nao_terminal]:
+            first_bits[nao_terminal] = bits
+            for dependente in dependentes[nao_terminal]:
+                if dependente not in na_fila:
+                    na_fila.add(dependente)
+                    pendentes.append(dependente)
+    
+    return first_bits
+
+def calcular_follow_bits(gramatica, first_bits, bit_terminal, simbolo_inicial='PROGRAMA'):
+    """
+    calcula FOLLOW de todos os não-terminais por ponto fixo com lista de trabalho
+    
+    para A -> α B β, FIRST(β) - {ε} entra em FOLLOW(B) de uma vez; se β é
+    anulável, cria-se a aresta A -> B e FOLLOW(A) é propagado a B pelas arestas
+    
+    Args:
+        gramatica (dict): produções da gramática
+        first_bits (dict): não_terminal -> bitset FIRST
+        bit_terminal (dict): terminal -> bit
+        simbolo_inicial (str): símbolo que recebe '$'
+        
+    Returns:
+        dict: não_terminal -> bitset FOLLOW
+    """
+    producoes = compilar_producoes(gramatica, bit_terminal)
+    follow_bits = {nao_terminal: 0 for nao_terminal in gramatica}
+    arestas = {nao_terminal: set() for nao_terminal in gramatica}
+    
+    if simbolo_inicial in follow_bits:
+        follow_bits[simbolo_inicial] = bit_terminal['$']
+    
+    for nao_terminal, lista in producoes.items():
+        for producao in lista:
+            # percorre da direita para a esquerda acumulando FIRST do sufixo
+            sufixo = BIT_EPSILON
+            for terminal, valor in reversed(producao):
+                if terminal:
+                    sufixo = valor
+                    continue
+                
+                if valor in follow_bits:
+                    follow_bits[valor] |= sufixo & ~BIT_EPSILON
+                    if sufixo & BIT_EPSILON and valor != nao_terminal:
+                        arestas[nao_terminal].add(valor)
+                
+                bits = first_bits.get(valor, 0)
+                sufixo = (bits & ~BIT_EPSILON) | sufixo if bits & BIT_EPSILON else bits
+    
+    pendentes = deque(gramatica)
+    na_fila = set(gramatica)
+    
+    while pendentes:
+        nao_terminal = pendentes.popleft()
+        na_fila.discard(nao_terminal)
+        
+        for destino in arestas[nao_terminal]:
+            bits = follow_bits[destino] | follow_bits[nao_terminal]
+            if bits != follow_bits[destino]:
+                follow_bits[destino] = bits
+                if destino not in na_fila:
+                    na_fila.add(destino)
+                    pendentes.append(destino)
+    
+    return follow_bits
+
 def calcular_first(simbolo, gramatica, memo=None):
     """
     calcula conjunto FIRST para um símbolo
@@ -120,63 +346,23 @@ def calcular_first(simbolo, gramatica, memo=None):
     Args:
         simbolo (str): símbolo da gramática
         gramatica (dict): produções da gramática
-        memo (dict): memoização para evitar recálculo
+        memo (dict): conjuntos já calculados; preenchido com todos os
+                     não-terminais na primeira consulta
         
     Returns:
         set: conjunto FIRST do símbolo
     """
+    # terminal: FIRST é o próprio símbolo
+    if eh_terminal(simbolo):
+        return {simbolo}
+    
     if memo is None:
         memo = {}
     
-    if simbolo in memo:
-        return memo[simbolo]
-    
-    first = set()
+    if simbolo not in memo:
+        memo.update(calcular_all_first(gramatica))
     
-    # terminal: FIRST é o próprio símbolo
-    if eh_terminal(simbolo):
-        first.add(simbolo)
-        memo[simbolo] = first
-        return first
-    
-    # não-terminal: analisar produções
-    if simbolo not in gramatica:
-        memo[simbolo] = first
-        return first
-    
-    for producao in gramatica[simbolo]:
-        if not producao:  # produção vazia (epsilon)
-            first.add('ε')
-            continue
-        
-        # analisar primeiro símbolo da produção
-        primeiro = producao[0]
-        
-        if eh_terminal(primeiro):
-            first.add(primeiro)
-        else:
-            # recursivamente adicionar FIRST do não-terminal
-            first_primeiro = calcular_first(primeiro, gramatica, memo)
-            first.update(first_primeiro - {'ε'})
-            
-            # se primeiro pode derivar epsilon, analisar próximos símbolos
-            if 'ε' in first_primeiro:
-                for i in range(1, len(producao)):
-                    simbolo_atual = producao[i]
-                    if eh_terminal(simbolo_atual):
-                        first.add(simbolo_atual)
-                        break
-                    else:
-                        first_atual = calcular_first(simbolo_atual, gramatica, memo)
-                        first.update(first_atual - {'ε'})
-                        if 'ε' not in first_atual:
-                            break
-                else:
-                    # todos derivam epsilon
-                    first.add('ε')
-    
-    memo[simbolo] = first
-    return first
+    return memo.get(simbolo, set())
 
 def calcular_all_first(gramatica):
     """
@@ -188,13 +374,10 @@ def calcular_all_first(gramatica):
     Returns:
         dict: mapeamento não_terminal -> conjunto FIRST
     """
-    first = {}
-    memo = {}
-    
-    for nao_terminal in gramatica:
-        first[nao_terminal] = calcular_first(nao_terminal, gramatica, memo)
+    terminais, bit_terminal = indexar_terminais(gramatica)
+    first_bits = calcular_first_bits(gramatica, bit_terminal)
     
-    return first
+    return {nao_terminal: bits_para_conjunto(bits, terminais) for nao_terminal, bits in first_bits.items()}
 
 def calcular_follow(nao_terminal, gramatica, first, memo=None):
     """
@@ -204,7 +387,8 @@ def calcular_follow(nao_terminal, gramatica, first, memo=None):
         nao_terminal (str): não-terminal alvo
         gramatica (dict): produções da gramática
         first (dict): conjuntos FIRST
-        memo (dict): memoização
+        memo (dict): conjuntos já calculados; preenchido com todos os
+                     não-terminais na primeira consulta
         
     Returns:
         set: conjunto FOLLOW do não-terminal
@@ -212,60 +396,10 @@ def calcular_follow(nao_terminal, gramatica, first, memo=None):
     if memo is None:
         memo = {}
     
-    if nao_terminal in memo:
-        return memo[nao_terminal]
-    
-    follow = set()
-    
-    # símbolo inicial tem $ no FOLLOW
-    if nao_terminal == 'PROGRAMA':
-        follow.add('$')
+    if nao_terminal not in memo:
+        memo.update(calcular_all_follow(gramatica, first))
     
-    # analisar todas as produções
-    for nt, producoes in gramatica.items():
-        for producao in producoes:
-            for i, simbolo in enumerate(producao):
-                if simbolo == nao_terminal:
-                    # encontrou o não-terminal na produção
-                    
-                    # se há símbolo após, adicionar FIRST dele
-                    if i + 1 < len(producao):
-                        proximo = producao[i + 1]
-                        
-                        if eh_terminal(proximo):
-                            follow.add(proximo)
-                        else:
-                            # adicionar FIRST do próximo (sem epsilon)
-                            follow.update(first.get(proximo, set()) - {'ε'})
-                            
-                            # se próximo deriva epsilon, continuar
-                            if 'ε' in first.get(proximo, set()):
-                                # verificar símbolos seguintes
-                                j = i + 2
-                                while j < len(producao):
-                                    simbolo_seguinte = producao[j]
-                                    if eh_terminal(simbolo_seguinte):
-                                        follow.add(simbolo_seguinte)
-                                        break
-                                    else:
-                                        follow.update(first.get(simbolo_seguinte, set()) - {'ε'})
-                                        if 'ε' not in first.get(simbolo_seguinte, set()):
-                                            break
-                                    j += 1
-                                else:
-                                    # chegou ao fim da produção
-                                    if nt != nao_terminal:
-                                        # adicionar FOLLOW do lado esquerdo
-                                        follow_nt = calcular_follow(nt, gramatica, first, memo)
-                                        follow.update(follow_nt)
-                    else:
-                        # está no final da produção
-                        if nt != nao_terminal:
-                            follow_nt = calcular_follow(nt, gramatica, first, memo)
-                            follow.update(follow_nt)
-    
-    memo[nao_terminal] = follow
-    return follow
+    return memo.get(nao_terminal, set())
 
 def calcular_all_follow(gramatica, first):
     """
@@ -278,13 +412,14 @@ def calcular_all_follow(gramatica, first):
     Returns:
         dict: mapeamento não_terminal -> conjunto FOLLOW
     """
-    follow = {}
-    memo = {}
-    
-    for nao_terminal in gramatica:
-        follow[nao_terminal] = calcular_follow(nao_terminal, gramatica, first, memo)
+    terminais, bit_terminal = indexar_terminais(gramatica)
+    first_bits = {
+        nao_terminal: sum(bit_terminal[terminal] for terminal in conjunto if terminal in bit_terminal)
+        for nao_terminal, conjunto in first.items()
+    }
+    follow_bits = calcular_follow_bits(gramatica, first_bits, bit_terminal)
     
-    return follow
+    return {nao_terminal: bits_para_conjunto(bits, terminais) for nao_terminal, bits in follow_bits.items()}
 
 def construir_tabela_ll1(gramatica, first, follow):
     """
@@ -335,6 +470,27 @@ def construir_tabela_ll1(gramatica, first, follow):
     
     return tabela
 
+def listar_conflitos(tabela):
+    """
+    lista as entradas da tabela com mais de uma produção
+    
+    Args:
+        tabela (dict): tabela LL(1)
+        
+    Returns:
+        list: tuplas (não_terminal, terminal, produções, controlado); conflitos
+              controlados ficam em CONTEUDO e são resolvidos pelo parser
+    """
+    conflitos = []
+    
+    for nao_terminal, entradas in tabela.items():
+        for terminal, producoes in entradas.items():
+            if len(producoes) > 1:
+                controlado = nao_terminal in ['CONTEUDO', 'CONTEUDO_REAL', 'OPERACAO_OU_COMANDO']
+                conflitos.append((nao_terminal, terminal, producoes, controlado))
+    
+    return conflitos
+
 def validar_gramatica_ll1(tabela):
     """
     verifica se há conflitos na tabela (múltiplas produções)
@@ -348,31 +504,107 @@ def validar_gramatica_ll1(tabela):
     """
     conflitos_criticos = []
     
-    for nao_terminal, entradas in tabela.items():
-        for terminal, producoes in entradas.items():
-            if len(producoes) > 1:
-                # conflitos em CONTEUDO são resolvidos pelo parser dinamicamente
-                if nao_terminal in ['CONTEUDO', 'CONTEUDO_REAL', 'OPERACAO_OU_COMANDO']:
-                    print(f"Conflito controlado em [{nao_terminal}, {terminal}]")
-                    continue
-                
-                conflitos_criticos.append((nao_terminal, terminal, producoes))
-                print(f"Conflito CRÍTICO em [{nao_terminal}, {terminal}]: {producoes}")
+    for nao_terminal, terminal, producoes, controlado in listar_conflitos(tabela):
+        # conflitos em CONTEUDO são resolvidos pelo parser dinamicamente
+        if controlado:
+            print(f"Conflito controlado em [{nao_terminal}, {terminal}]")
+            continue
+        
+        conflitos_criticos.append((nao_terminal, terminal, producoes))
+        print(f"Conflito CRÍTICO em [{nao_terminal}, {terminal}]: {producoes}")
     
     return len(conflitos_criticos) == 0
 
+# valor das células sem produção na tabela densa
+SEM_PRODUCAO = -1
+
+class TabelaLL1Densa:
+    """
+    tabela LL(1) densa indexada por inteiros
+    
+    não-terminais e terminais recebem índices pequenos e cada produção é
+    guardada uma única vez em producoes; a célula [nt][t] fica em
+    celulas[nt * num_terminais + t] e guarda o índice da produção ou
+    SEM_PRODUCAO. em conflitos vale a primeira produção, como em obter_producao
+    """
+    
+    __slots__ = ('nao_terminais', 'terminais', 'indice_nao_terminal', 'indice_terminal',
+                 'producoes', 'num_terminais', 'celulas')
+    
+    def __init__(self, gramatica, tabela):
+        """
+        Args:
+            gramatica (dict): produções da gramática
+            tabela (dict): tabela LL(1) (construir_tabela_ll1)
+        """
+        terminais, _ = indexar_terminais(gramatica)
+        self.nao_terminais = tuple(gramatica)
+        self.terminais = tuple(terminal for terminal in terminais if terminal != 'ε')
+        self.indice_nao_terminal = {nt: i for i, nt in enumerate(self.nao_terminais)}
+        self.indice_terminal = {terminal: i for i, terminal in enumerate(self.terminais)}
+        self.num_terminais = len(self.terminais)
+        
+        self.producoes = tuple(
+            (nao_terminal, tuple(producao))
+            for nao_terminal, producoes in gramatica.items()
+            for producao in producoes
+        )
+        indice_producao = {}
+        for i, producao in enumerate(self.producoes):
+            indice_producao.setdefault(producao, i)
+        
+        codigo_tipo = 'h' if len(self.producoes) < 2 ** 15 else 'i'
+        self.celulas = array(codigo_tipo, [SEM_PRODUCAO]) * (len(self.nao_terminais) * self.num_terminais)
+        
+        for nao_terminal, entradas in tabela.items():
+            linha = self.indice_nao_terminal[nao_terminal] * self.num_terminais
+            for terminal, producoes in entradas.items():
+                if producoes and terminal in self.indice_terminal:
+                    self.celulas[linha + self.indice_terminal[terminal]] = indice_producao[(nao_terminal, tuple(producoes[0]))]
+    
+    def producao(self, id_nao_terminal, id_terminal):
+        """
+        Args:
+            id_nao_terminal (int): índice do não-terminal
+            id_terminal (int): índice do terminal
+        
+        Returns:
+            int: índice da produção em producoes, ou SEM_PRODUCAO
+        """
+        return self.celulas[id_nao_terminal * self.num_terminais + id_terminal]
+    
+    def obter(self, nao_terminal, terminal):
+        """
+        Args:
+            nao_terminal (str): não-terminal
+            terminal (str): terminal (lookahead)
+        
+        Returns:
+            tuple: símbolos da produção ou None se não existe
+        """
+        id_nao_terminal = self.indice_nao_terminal.get(nao_terminal)
+        id_terminal = self.indice_terminal.get(terminal)
+        if id_nao_terminal is None or id_terminal is None:
+            return None
+        
+        indice = self.celulas[id_nao_terminal * self.num_terminais + id_terminal]
+        return self.producoes[indice][1] if indice != SEM_PRODUCAO else None
+
 def obter_producao(tabela, nao_terminal, terminal):
     """
     obtém produção da tabela LL(1)
     
     Args:
-        tabela (dict): tabela LL(1)
+        tabela (dict ou TabelaLL1Densa): tabela LL(1)
         nao_terminal (str): não-terminal
         terminal (str): terminal (lookahead)
         
     Returns:
-        list: produção ou None se não existe
+        list: produção (tuple na tabela densa) ou None se não existe
     """
+    if isinstance(tabela, TabelaLL1Densa):
+        return tabela.obter(nao_terminal, terminal)
+    
     if nao_terminal not in tabela:
         return None
     
@@ -382,6 +614,176 @@ def obter_producao(tabela, nao_terminal, terminal):
     producoes = tabela[nao_terminal][terminal]
     return producoes[0] if producoes else None
 
+def hash_producoes(gramatica):
+    """
+    calcula a chave do cache: hash do conjunto de produções e da versão do
+    formato (o código da análise entra no caminho do arquivo)
+    
+    Args:
+        gramatica (dict): produções da gramática
+        
+    Returns:
+        str: sha256 em hexadecimal
+    """
+    canonico = json.dumps(gramatica, sort_keys=True, ensure_ascii=False)
+    texto = f"{VERSAO_CACHE_GRAMATICA}:{canonico}"
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+def analisar_gramatica(gramatica):
+    """
+    calcula FIRST, FOLLOW e tabela LL(1) em forma serializável
+    
+    os conflitos são impressos aqui, só quando a análise é realmente feita
+    
+    Args:
+        gramatica (dict): produções da gramática
+        
+    Returns:
+        dict: 'hash', 'producoes', 'first', 'follow' (listas ordenadas) e 'tabela'
+    """
+    first = calcular_all_first(gramatica)
+    follow = calcular_all_follow(gramatica, first)
+    tabela = construir_tabela_ll1(gramatica, first, follow)
+    validar_gramatica_ll1(tabela)
+    
+    return {
+        'hash': hash_producoes(gramatica),
+        'producoes': gramatica,
+        'first': {nt: sorted(conjunto) for nt, conjunto in first.items()},
+        'follow': {nt: sorted(conjunto) for nt, conjunto in follow.items()},
+        'tabela': tabela
+    }
+
+def congelar_gramatica(dados):
+    """
+    converte a análise em estruturas imutáveis
+    
+    dicionários viram MappingProxyType, conjuntos viram frozenset e
+    produções viram tuplas, então a estrutura pode ser compartilhada
+    
+    Args:
+        dados (dict): resultado de analisar_gramatica (ou lido do cache)
+        
+    Returns:
+        MappingProxyType: 'hash', 'producoes', 'first', 'follow', 'tabela'
+                          e 'tabela_densa'
+    """
+    def congelar_producoes(producoes):
+        return tuple(tuple(producao) for producao in producoes)
+    
+    # a tabela densa é derivada na carga; as células ficam somente leitura
+    tabela_densa = TabelaLL1Densa(dados['producoes'], dados['tabela'])
+    tabela_densa.celulas = memoryview(tabela_densa.celulas).toreadonly()
+    
+    return MappingProxyType({
+        'hash': dados['hash'],
+        'producoes': MappingProxyType({
+            nt: congelar_producoes(producoes) for nt, producoes in dados['producoes'].items()
+        }),
+        'first': MappingProxyType({nt: frozenset(conjunto) for nt, conjunto in dados['first'].items()}),
+        'follow': MappingProxyType({nt: frozenset(conjunto) for nt, conjunto in dados['follow'].items()}),
+        'tabela': MappingProxyType({
+            nt: MappingProxyType({
+                terminal: congelar_producoes(producoes) for terminal, producoes in entradas.items()
+            })
+            for nt, entradas in dados['tabela'].items()
+        }),
+        'tabela_densa': tabela_densa
+    })
+
+def caminho_cache_gramatica(chave, diretorio_cache):
+    """caminho do arquivo de cache para o hash das produções e o código da análise"""
+    return os.path.join(diretorio_cache, f"gramatica-{chave[:16]}-{calcular_impressao_codigo()[:16]}.json")
+
+def ler_cache_gramatica(caminho, chave):
+    """
+    lê a análise salva em disco
+    
+    Args:
+        caminho (str): arquivo de cache
+        chave (str): hash esperado das produções
+        
+    Returns:
+        dict: análise salva, ou None se ausente, ilegível, incompleta ou de
+              outra gramática
+    """
+    try:
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            dados = json.load(arquivo)
+    except (OSError, ValueError):
+        return None
+    
+    if not isinstance(dados, dict) or dados.get('hash') != chave:
+        return None
+    
+    # arquivo truncado ou de formato antigo: recalcular em vez de falhar
+    for nome in CHAVES_CACHE_GRAMATICA[1:]:
+        if not isinstance(dados.get(nome), dict):
+            return None
+    return dados
+
+def salvar_cache_gramatica(caminho, dados):
+    """
+    salva a análise em disco (escrita atômica; falhas são ignoradas, pois o
+    cache é só uma otimização)
+    
+    Args:
+        caminho (str): arquivo de cache
+        dados (dict): resultado de analisar_gramatica
+    """
+    temporario = f"{caminho}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            json.dump(dados, arquivo, ensure_ascii=False)
+        os.replace(temporario, caminho)
+    except OSError:
+        if os.path.exists(temporario):
+            os.remove(temporario)
+
+def carregar_gramatica(gramatica=None, diretorio_cache=DIRETORIO_CACHE_GRAMATICA):
+    """
+    obtém a análise congelada da gramática, usando o cache em disco
+    
+    Args:
+        gramatica (dict): produções (None = gramática RPN)
+        diretorio_cache (str): diretório do cache (None desativa o disco;
+                               o padrão vem de RPN_CACHE_DIR)
+        
+    Returns:
+        MappingProxyType: gramática congelada (veja congelar_gramatica)
+    """
+    if gramatica is None:
+        gramatica = definir_producoes()
+    
+    chave = hash_producoes(gramatica)
+    caminho = caminho_cache_gramatica(chave, diretorio_cache) if diretorio_cache else None
+    dados = ler_cache_gramatica(caminho, chave) if caminho else None
+    
+    if dados is not None:
+        try:
+            return congelar_gramatica(dados)
+        except (KeyError, TypeError, ValueError, AttributeError, IndexError, GramaticaError):
+            # conteúdo inconsistente dentro das chaves esperadas
+            pass
+    
+    dados = analisar_gramatica(gramatica)
+    if caminho:
+        salvar_cache_gramatica(caminho, dados)
+    
+    return congelar_gramatica(dados)
+
+@lru_cache(maxsize=None)
+def obter_gramatica():
+    """
+    gramática RPN congelada, construída uma única vez por processo
+    
+    Returns:
+        MappingProxyType: 'hash', 'producoes', 'first', 'follow', 'tabela'
+                          e 'tabela_densa'
+    """
+    return carregar_gramatica()
+
 
 
 if __name__ == '__main__':
@@ -1,8 +1,11 @@
 # analisador léxico com autômato finito determinístico
-# atualizado para suportar operadores relacionais
+# o AFD é dirigido por tabela: as regras de token_types são compiladas em um
+# único padrão e cada casamento produz um token inteiro
 
+import re
 import sys
 import os
+from itertools import chain
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.token_types import *
@@ -13,263 +16,177 @@ class LexerError(Exception):
         self.mensagem = mensagem
         self.posicao = posicao
         super().__init__(f"Erro léxico{' na posição ' + str(posicao) if posicao else ''}: {mensagem}")
-
-def criar_contexto():
-    """
-    cria o contexto inicial para análise léxica
     
-    Returns:
-        dict: contexto com estado inicial
-    """
-    return {
-        'tokens': [],
-        'buffer': '',
-        'posicao': 0,
-        'contador_parenteses': 0,
-        'estado_atual': 'inicial'
-    }
+    def __reduce__(self):
+        # preserva mensagem e posição ao atravessar processos (pickle)
+        return (self.__class__, (self.mensagem, self.posicao))
 
-def adicionar_token_ao_contexto(contexto, tipo, valor):
-    """
-    adiciona um token ao contexto
-    
-    Args:
-        contexto (dict): contexto da análise
-        tipo (str): tipo do token
-        valor (str): valor do token
-    """
-    token = criar_token(tipo, valor, contexto['posicao'] - len(valor))
-    contexto['tokens'].append(token)
+# regras léxicas compiladas a partir dos conjuntos de token_types.
+# a ordem dos grupos define a prioridade; 'invalido' captura qualquer
+# caractere que nenhuma outra regra aceitou
+REGRAS_LEXICAS = [
+    ('espaco', r'\s+'),
+    ('numero', r'[0-9]+(?:\.[0-9]*)?'),
+    ('identificador', r'[A-Z]+'),
+    ('abre', r'\('),
+    ('fecha', r'\)'),
+    ('operador', '[' + ''.join(re.escape(c) for c in sorted(OPERADORES_VALIDOS)) + ']'),
+    ('relacional', '[' + ''.join(re.escape(c) for c in sorted(OPERADORES_RELACIONAIS)) + ']=?'),
+    ('invalido', r'.'),
+]
 
-def limpar_buffer(contexto):
-    """limpa o buffer do contexto"""
-    contexto['buffer'] = ''
+PADRAO_TOKENS = re.compile(
+    '|'.join(f'(?P<{nome}>{padrao})' for nome, padrao in REGRAS_LEXICAS),
+    re.DOTALL
+)
 
-# estados do AFD implementados como funções
+# mesmas regras em modo de bytes ASCII, para bytes, memoryview e mmap
+PADRAO_TOKENS_BYTES = re.compile(PADRAO_TOKENS.pattern.encode('ascii'), re.DOTALL)
 
-def estado_inicial(char, contexto):
+def normalizar_classes_unicode(linha):
     """
-    estado inicial - decide qual estado seguir baseado no caractere
+    substitui caracteres não-ASCII por um representante ASCII da mesma classe
+    léxica, para que o padrão compilado os reconheça como o AFD original
+    
+    espaços viram ' ', dígitos viram '0', letras maiúsculas viram 'A' e
+    qualquer outro caractere vira '\\x00' (inválido). o comprimento da linha
+    é preservado, então posições e fatias continuam valendo na linha original
     
     Args:
-        char (str): caractere atual
-        contexto (dict): contexto da análise
+        linha (str): linha com pelo menos um caractere não-ASCII
         
     Returns:
-        str: próximo estado
+        str: linha equivalente contendo apenas caracteres ASCII
     """
-    if eh_espaco(char):
-        return 'inicial'
-    elif eh_digito(char):
-        contexto['buffer'] += char
-        return 'numero'
-    elif eh_letra_maiuscula(char):
-        contexto['buffer'] += char
-        return 'identificador'
-    elif eh_operador_valido(char):
-        adicionar_token_ao_contexto(contexto, OPERADOR, char)
-        return 'inicial'
-    elif eh_operador_relacional(char):
-        contexto['buffer'] += char
-        return 'operador_relacional'
-    elif eh_parentese_abre(char):
-        contexto['contador_parenteses'] += 1
-        adicionar_token_ao_contexto(contexto, PARENTESE_ABRE, char)
-        return 'inicial'
-    elif eh_parentese_fecha(char):
-        if contexto['contador_parenteses'] <= 0:
-            raise LexerError("Parêntese de fechamento sem abertura correspondente", contexto['posicao'])
-        contexto['contador_parenteses'] -= 1
-        adicionar_token_ao_contexto(contexto, PARENTESE_FECHA, char)
-        return 'inicial'
-    else:
-        raise LexerError(f"Caractere inválido: '{char}'", contexto['posicao'])
+    tabela = {}
+    for char in set(linha):
+        if ord(char) < 128:
+            continue
+        if eh_espaco(char):
+            tabela[ord(char)] = ' '
+        elif eh_digito(char):
+            tabela[ord(char)] = '0'
+        elif eh_letra_maiuscula(char):
+            tabela[ord(char)] = 'A'
+        else:
+            tabela[ord(char)] = '\x00'
+    return linha.translate(tabela)
 
-def estado_numero(char, contexto):
+def escanear_linha(linha):
     """
-    estado para reconhecimento de números
+    reconhece os tokens de uma linha usando o padrão compilado
+    
+    cada casamento do padrão corresponde a um token completo do AFD, então o
+    laço executa uma vez por token e não uma vez por caractere. posições e
+    mensagens de erro seguem exatamente as do AFD por estados
     
     Args:
-        char (str): caractere atual
-        contexto (dict): contexto da análise
+        linha (str): linha contendo expressão RPN
         
     Returns:
-        str: próximo estado
-    """
-    if eh_digito(char):
-        contexto['buffer'] += char
-        return 'numero'
-    elif eh_ponto_decimal(char):
-        if '.' in contexto['buffer']:
-            raise LexerError(f"Número malformado: múltiplos pontos decimais em '{contexto['buffer'] + char}'", 
-                           contexto['posicao'] - len(contexto['buffer']))
-        contexto['buffer'] += char
-        return 'numero_decimal'
-    else:
-        # finaliza o número inteiro
-        adicionar_token_ao_contexto(contexto, NUMERO, contexto['buffer'])
-        limpar_buffer(contexto)
+        list: lista de tokens reconhecidos
         
-        # processa o caractere atual no estado inicial
-        return processar_char_no_estado(char, contexto, 'inicial')
+    Raises:
+        LexerError: em caso de erro léxico
+    """
+    texto = linha if linha.isascii() else normalizar_classes_unicode(linha)
+    return escanear_trecho(texto, 0, len(linha), PADRAO_TOKENS, lambda inicio, fim: linha[inicio:fim])
 
-def estado_numero_decimal(char, contexto):
+def escanear_trecho(texto, inicio_linha, fim_linha, padrao, extrair, inicio_varredura=None, continuacao=None):
     """
-    estado para números após o ponto decimal
+    reconhece os tokens de uma linha delimitada dentro de um texto maior
+    
+    serve tanto para str quanto para buffers de bytes (bytes, memoryview,
+    mmap): o padrão é aplicado entre os deslocamentos sem copiar o texto e
+    só os valores dos tokens são extraídos
     
     Args:
-        char (str): caractere atual
-        contexto (dict): contexto da análise
+        texto: str ou buffer de bytes em que o padrão é aplicado
+        inicio_linha (int): deslocamento do início da linha em texto (pode
+                            ser negativo se o começo da linha já foi descartado)
+        fim_linha (int): deslocamento do fim da linha (exclusivo)
+        padrao: PADRAO_TOKENS ou PADRAO_TOKENS_BYTES
+        extrair (callable): extrair(inicio, fim) devolve o trecho original como str
+        inicio_varredura (int): onde a varredura começa (padrão: inicio_linha)
+        continuacao (dict): para linhas lidas em partes: {'abertos': n} traz
+                            a contagem de parênteses e recebe a nova; o
+                            balanceamento fica a cargo de quem chama. fim_linha
+                            deve então cair logo após um separador (espaço ou
+                            parêntese), para que nenhum token seja cortado
         
     Returns:
-        str: próximo estado
-    """
-    if eh_digito(char):
-        contexto['buffer'] += char
-        return 'numero_decimal'
-    elif eh_ponto_decimal(char):
-        raise LexerError(f"Número malformado: múltiplos pontos decimais em '{contexto['buffer'] + char}'", 
-                       contexto['posicao'] - len(contexto['buffer']))
-    else:
-        # verifica se tem dígitos após o ponto
-        if contexto['buffer'].endswith('.'):
-            raise LexerError(f"Número malformado: ponto decimal sem dígitos subsequentes em '{contexto['buffer']}'", 
-                           contexto['posicao'] - len(contexto['buffer']))
+        list: lista de tokens, com posições relativas ao início da linha
         
-        # finaliza o número decimal
-        adicionar_token_ao_contexto(contexto, NUMERO, contexto['buffer'])
-        limpar_buffer(contexto)
-        
-        # processa o caractere atual no estado inicial
-        return processar_char_no_estado(char, contexto, 'inicial')
-
-def estado_identificador(char, contexto):
+    Raises:
+        LexerError: em caso de erro léxico
     """
-    estado para reconhecimento de identificadores e palavras reservadas
+    tokens = []
+    contador_parenteses = continuacao['abertos'] if continuacao is not None else 0
+    if inicio_varredura is None:
+        inicio_varredura = inicio_linha
     
-    Args:
-        char (str): caractere atual
-        contexto (dict): contexto da análise
+    for casamento in padrao.finditer(texto, inicio_varredura, fim_linha):
+        grupo = casamento.lastgroup
+        if grupo == 'espaco':
+            continue
         
-    Returns:
-        str: próximo estado
-    """
-    if eh_letra_maiuscula(char):
-        contexto['buffer'] += char
-        return 'identificador'
-    else:
-        # finaliza o identificador
-        if eh_palavra_reservada(contexto['buffer']):
-            adicionar_token_ao_contexto(contexto, PALAVRA_RESERVADA, contexto['buffer'])
-        else:
-            adicionar_token_ao_contexto(contexto, IDENTIFICADOR, contexto['buffer'])
+        inicio, fim = casamento.span()
+        coluna = inicio - inicio_linha
         
-        limpar_buffer(contexto)
+        # tokens de um caractere usam a própria posição; tokens acumulados em
+        # buffer recebem coluna + 1 quando encerrados por outro caractere
+        posicao_buffer = coluna + 1 if fim < fim_linha else coluna
         
-        # processa o caractere atual no estado inicial
-        return processar_char_no_estado(char, contexto, 'inicial')
-
-def estado_operador_relacional(char, contexto):
-    """
-    estado para reconhecimento de operadores relacionais (==, !=, >=, <=)
-    
-    Args:
-        char (str): caractere atual
-        contexto (dict): contexto da análise
+        if grupo == 'abre':
+            contador_parenteses += 1
+            tokens.append(Token(COD_PARENTESE_ABRE, '(', coluna))
         
-    Returns:
-        str: próximo estado
-    """
-    buffer_atual = contexto['buffer']
-    
-    # operadores de dois caracteres
-    if buffer_atual == '=' and char == '=':
-        contexto['buffer'] += char
-        adicionar_token_ao_contexto(contexto, OPERADOR_RELACIONAL, contexto['buffer'])
-        limpar_buffer(contexto)
-        return 'inicial'
-    
-    elif buffer_atual == '!' and char == '=':
-        contexto['buffer'] += char
-        adicionar_token_ao_contexto(contexto, OPERADOR_RELACIONAL, contexto['buffer'])
-        limpar_buffer(contexto)
-        return 'inicial'
-    
-    elif buffer_atual == '>' and char == '=':
-        contexto['buffer'] += char
-        adicionar_token_ao_contexto(contexto, OPERADOR_RELACIONAL, contexto['buffer'])
-        limpar_buffer(contexto)
-        return 'inicial'
-    
-    elif buffer_atual == '<' and char == '=':
-        contexto['buffer'] += char
-        adicionar_token_ao_contexto(contexto, OPERADOR_RELACIONAL, contexto['buffer'])
-        limpar_buffer(contexto)
-        return 'inicial'
-    
-    else:
-        # operador de um caractere (> ou <)
-        if buffer_atual in ['>', '<']:
-            adicionar_token_ao_contexto(contexto, OPERADOR_RELACIONAL, buffer_atual)
-            limpar_buffer(contexto)
-            return processar_char_no_estado(char, contexto, 'inicial')
-        else:
-            # caractere inválido após operador relacional
-            raise LexerError(f"Operador relacional inválido: '{buffer_atual + char}'", 
-                           contexto['posicao'] - len(buffer_atual))
-
-def processar_char_no_estado(char, contexto, estado):
-    """
-    processa um caractere em um estado específico
-    
-    Args:
-        char (str): caractere a processar
-        contexto (dict): contexto da análise
-        estado (str): estado atual
+        elif grupo == 'fecha':
+            if contador_parenteses <= 0:
+                raise LexerError("Parêntese de fechamento sem abertura correspondente", coluna + 1)
+            contador_parenteses -= 1
+            tokens.append(Token(COD_PARENTESE_FECHA, ')', coluna))
         
-    Returns:
-        str: próximo estado
-    """
-    estados = {
-        'inicial': estado_inicial,
-        'numero': estado_numero,
-        'numero_decimal': estado_numero_decimal,
-        'identificador': estado_identificador,
-        'operador_relacional': estado_operador_relacional
-    }
-    
-    return estados[estado](char, contexto)
-
-def finalizar_analise(contexto):
-    """
-    finaliza a análise léxica e valida o estado final
-    
-    Args:
-        contexto (dict): contexto da análise
-    """
-    # se há conteúdo no buffer, processa o token final
-    if contexto['buffer']:
-        if contexto['estado_atual'] == 'numero':
-            adicionar_token_ao_contexto(contexto, NUMERO, contexto['buffer'])
-        elif contexto['estado_atual'] == 'numero_decimal':
-            if contexto['buffer'].endswith('.'):
-                raise LexerError(f"Número malformado: ponto decimal sem dígitos subsequentes em '{contexto['buffer']}'")
-            adicionar_token_ao_contexto(contexto, NUMERO, contexto['buffer'])
-        elif contexto['estado_atual'] == 'identificador':
-            if eh_palavra_reservada(contexto['buffer']):
-                adicionar_token_ao_contexto(contexto, PALAVRA_RESERVADA, contexto['buffer'])
-            else:
-                adicionar_token_ao_contexto(contexto, IDENTIFICADOR, contexto['buffer'])
-        elif contexto['estado_atual'] == 'operador_relacional':
-            # operador relacional de um caractere
-            if contexto['buffer'] in ['>', '<']:
-                adicionar_token_ao_contexto(contexto, OPERADOR_RELACIONAL, contexto['buffer'])
+        elif grupo == 'identificador':
+            valor = extrair(inicio, fim)
+            codigo = COD_PALAVRA_RESERVADA if eh_palavra_reservada(valor) else COD_IDENTIFICADOR
+            tokens.append(Token(codigo, sys.intern(valor), posicao_buffer))
+        
+        elif grupo == 'numero':
+            valor = extrair(inicio, fim)
+            if fim < fim_linha and extrair(fim, fim + 1) == '.':
+                raise LexerError(f"Número malformado: múltiplos pontos decimais em '{valor}.'", coluna + 1)
+            if valor.endswith('.'):
+                raise LexerError(f"Número malformado: ponto decimal sem dígitos subsequentes em '{valor}'",
+                               coluna + 1 if fim < fim_linha else None)
+            tokens.append(Token(COD_NUMERO, decodificar_numero(valor), posicao_buffer))
+        
+        elif grupo == 'operador':
+            tokens.append(Token(COD_OPERADOR, extrair(inicio, fim), coluna))
+        
+        elif grupo == 'relacional':
+            valor = extrair(inicio, fim)
+            if len(valor) == 2:
+                tokens.append(Token(COD_OPERADOR_RELACIONAL, valor, coluna))
+            elif valor in ('>', '<'):
+                tokens.append(Token(COD_OPERADOR_RELACIONAL, valor, posicao_buffer))
+            elif fim < fim_linha:
+                raise LexerError(f"Operador relacional inválido: '{extrair(inicio, fim + 1)}'", coluna + 1)
             else:
-                raise LexerError(f"Operador relacional incompleto: '{contexto['buffer']}'")
+                raise LexerError(f"Operador relacional incompleto: '{valor}'")
+        
+        else:
+            raise LexerError(f"Caractere inválido: '{extrair(inicio, inicio + 1)}'", coluna + 1)
+    
+    if continuacao is not None:
+        continuacao['abertos'] = contador_parenteses
+        return tokens
     
     # verifica balanceamento de parênteses
-    if contexto['contador_parenteses'] != 0:
-        raise LexerError(f"Parênteses não balanceados: {contexto['contador_parenteses']} parênteses não fechados")
+    if contador_parenteses != 0:
+        raise LexerError(f"Parênteses não balanceados: {contador_parenteses} parênteses não fechados")
+    
+    return tokens
 
 def validar_estrutura_rpn(tokens):
     """
@@ -282,17 +199,17 @@ def validar_estrutura_rpn(tokens):
         raise LexerError("Expressão vazia")
     
     # deve começar com parêntese de abertura
-    if tokens[0]['tipo'] != PARENTESE_ABRE:
+    if tokens[0].codigo != COD_PARENTESE_ABRE:
         raise LexerError("Expressão RPN deve começar com parêntese de abertura")
     
     # deve terminar com parêntese de fechamento
-    if tokens[-1]['tipo'] != PARENTESE_FECHA:
+    if tokens[-1].codigo != COD_PARENTESE_FECHA:
         raise LexerError("Expressão RPN deve terminar com parêntese de fechamento")
 
 def parse_expressao(linha):
     """
     função principal do analisador léxico
-    analisa uma linha RPN usando autômato finito determinístico
+    analisa uma linha RPN usando o autômato compilado em PADRAO_TOKENS
     
     Args:
         linha (str): linha contendo expressão RPN
@@ -306,27 +223,286 @@ def parse_expressao(linha):
     if not linha or not linha.strip():
         raise LexerError("Linha vazia ou apenas espaços")
     
-    contexto = criar_contexto()
-    
     try:
-        # processa cada caractere da linha
-        for i, char in enumerate(linha):
-            contexto['posicao'] = i + 1
-            contexto['estado_atual'] = processar_char_no_estado(char, contexto, contexto['estado_atual'])
-        
-        # finaliza a análise
-        finalizar_analise(contexto)
+        tokens = escanear_linha(linha)
         
         # validação adicional da estrutura RPN
-        validar_estrutura_rpn(contexto['tokens'])
+        validar_estrutura_rpn(tokens)
         
-        return contexto['tokens']
+        return tokens
         
     except LexerError:
         raise
     except Exception as e:
         raise LexerError(f"Erro interno do analisador: {str(e)}")
 
+# tamanho dos blocos lidos de arquivos na análise em fluxo
+TAMANHO_BLOCO_PADRAO = 64 * 1024
+
+def iterar_linhas(fonte, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    itera as linhas de um arquivo ou de um iterador de blocos de texto
+    
+    os blocos podem cortar linhas em qualquer ponto; os pedaços são
+    reunidos antes de entregar a linha, então a numeração é a do texto
+    completo. apenas a linha corrente fica em memória
+    
+    Args:
+        fonte: objeto com método read() ou iterável de strings
+        tamanho_bloco (int): tamanho dos blocos lidos de objetos com read()
+        
+    Yields:
+        tuple: (numero_linha, linha) com numeração a partir de 1, sem '\\n'
+    """
+    if hasattr(fonte, 'read'):
+        blocos = iter(lambda: fonte.read(tamanho_bloco), '')
+    else:
+        blocos = fonte
+    
+    pendentes = []
+    numero_linha = 0
+    
+    for bloco in blocos:
+        if '\n' not in bloco:
+            if bloco:
+                pendentes.append(bloco)
+            continue
+        
+        partes = bloco.split('\n')
+        if pendentes:
+            pendentes.append(partes[0])
+            partes[0] = ''.join(pendentes)
+            pendentes = []
+        
+        # a última parte é o começo de uma linha ainda incompleta
+        resto = partes.pop()
+        if resto:
+            pendentes.append(resto)
+        
+        for linha in partes:
+            numero_linha += 1
+            yield numero_linha, linha
+    
+    if pendentes:
+        yield numero_linha + 1, ''.join(pendentes)
+
+def tokenizar_fluxo(fonte, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    analisa um arquivo ou iterador de blocos de forma preguiçosa,
+    produzindo um lote de tokens por expressão
+    
+    linhas vazias e comentários ('#') são ignorados. as posições dos tokens
+    são colunas da linha original, então espaços à esquerda são contados.
+    erros léxicos não interrompem o fluxo: são devolvidos no próprio lote
+    
+    Args:
+        fonte: objeto com método read() ou iterável de strings
+        tamanho_bloco (int): tamanho dos blocos lidos de objetos com read()
+        
+    Yields:
+        dict: lote com 'linha', 'expressao', 'tokens' e 'erro'
+              ('tokens' é None quando 'erro' contém um LexerError)
+    """
+    for numero_linha, linha in iterar_linhas(fonte, tamanho_bloco):
+        lote = analisar_linha_fluxo(numero_linha, linha)
+        if lote is not None:
+            yield lote
+
+def analisar_linha_fluxo(numero_linha, linha):
+    """
+    monta o lote de tokens de uma linha lida em fluxo
+    
+    Args:
+        numero_linha (int): número da linha no arquivo
+        linha (str): conteúdo da linha, sem a quebra
+        
+    Returns:
+        dict: lote com 'linha', 'expressao', 'tokens' e 'erro', ou None
+              para linhas vazias e comentários
+    """
+    linha = linha.rstrip()
+    expressao = linha.lstrip()
+    
+    if not expressao or expressao.startswith('#'):
+        return None
+    
+    try:
+        tokens = parse_expressao(linha)
+        erro = None
+    except LexerError as e:
+        tokens = None
+        erro = e
+    
+    return {
+        'linha': numero_linha,
+        'expressao': expressao,
+        'tokens': tokens,
+        'erro': erro
+    }
+
+# separadores que podem encerrar uma parte de linha lida aos pedaços: nenhum
+# token atravessa um espaço ou parêntese
+PADRAO_ULTIMO_SEPARADOR = re.compile(r'.*[\s()]', re.DOTALL)
+
+def iterar_tokens(fonte, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """
+    análise léxica sob demanda de uma única expressão, token a token
+    
+    a expressão pode chegar aos pedaços (arquivo ou iterador de blocos);
+    cada parte que termina em separador é analisada assim que lida, então o
+    parser pode consumir os primeiros tokens antes de o resto da linha
+    existir. tokens, posições e mensagens são os de parse_expressao; os
+    erros aparecem na ordem do texto, à medida que são alcançados
+    
+    Args:
+        fonte: str com a expressão, objeto com método read() ou iterável
+               de strings (os pedaços de uma linha, sem '\n')
+        tamanho_bloco (int): tamanho dos blocos lidos de objetos com read()
+        
+    Yields:
+        Token: próximo token da expressão
+        
+    Raises:
+        LexerError: em caso de erro léxico
+    """
+    if isinstance(fonte, str):
+        blocos = (fonte,)
+    elif hasattr(fonte, 'read'):
+        blocos = iter(lambda: fonte.read(tamanho_bloco), '')
+    else:
+        blocos = fonte
+    
+    # original guarda o trecho ainda não analisado; texto é a sua versão
+    # ASCII (mesmo comprimento) em que o padrão é aplicado
+    original = ''
+    texto = ''
+    descartados = 0
+    continuacao = {'abertos': 0}
+    ultimo = None
+    # se a expressão não começa com '(', o resto da linha ainda é analisado
+    # (sem entregar tokens) para que erros léxicos tenham precedência, como
+    # em parse_expressao
+    comeco_invalido = False
+    
+    def extrair(inicio, fim):
+        return original[inicio:fim]
+    
+    # None marca o fim da linha: a última parte vai até o final do texto
+    for bloco in chain(blocos, (None,)):
+        if bloco is None:
+            corte = len(texto)
+        else:
+            original += bloco
+            texto += bloco if bloco.isascii() else normalizar_classes_unicode(bloco)
+            
+            separador = PADRAO_ULTIMO_SEPARADOR.match(texto)
+            if separador is None:
+                continue
+            corte = separador.end()
+        
+        tokens = escanear_trecho(texto, -descartados, corte, PADRAO_TOKENS, extrair, 0, continuacao)
+        if tokens:
+            if ultimo is None and tokens[0].codigo != COD_PARENTESE_ABRE:
+                comeco_invalido = True
+            ultimo = tokens[-1]
+            if not comeco_invalido:
+                yield from tokens
+        
+        original = original[corte:]
+        texto = texto[corte:]
+        descartados += corte
+    
+    if ultimo is None:
+        raise LexerError("Linha vazia ou apenas espaços")
+    if continuacao['abertos'] != 0:
+        raise LexerError(f"Parênteses não balanceados: {continuacao['abertos']} parênteses não fechados")
+    if comeco_invalido:
+        raise LexerError("Expressão RPN deve começar com parêntese de abertura")
+    if ultimo.codigo != COD_PARENTESE_FECHA:
+        raise LexerError("Expressão RPN deve terminar com parêntese de fechamento")
+
+# auxiliares do modo de bytes
+PADRAO_QUEBRA_LINHA = re.compile(rb'\n')
+PADRAO_ESPACOS_INICIAIS = re.compile(rb'[ \t\r\f\v]*')
+# bytes que str.isspace/isdigit/isupper classificam de forma diferente do
+# modo ASCII (separadores \x1c-\x1f e qualquer byte não-ASCII)
+PADRAO_FORA_DO_ASCII = re.compile(rb'[\x1c-\x1f\x80-\xff]')
+ESPACOS_ASCII = frozenset(b' \t\n\r\f\v')
+
+def iterar_linhas_bytes(dados):
+    """
+    itera os limites das linhas de um buffer de bytes sem copiá-lo
+    
+    Args:
+        dados: bytes, bytearray, memoryview ou mmap
+        
+    Yields:
+        tuple: (numero_linha, inicio, fim) com fim excluindo o '\\n'
+    """
+    numero_linha = 0
+    inicio = 0
+    
+    for quebra in PADRAO_QUEBRA_LINHA.finditer(dados):
+        numero_linha += 1
+        yield numero_linha, inicio, quebra.start()
+        inicio = quebra.end()
+    
+    if inicio < len(dados):
+        yield numero_linha + 1, inicio, len(dados)
+
+def tokenizar_bytes(dados, codificacao='utf-8'):
+    """
+    análise léxica em modo de bytes ASCII sobre bytes, memoryview ou mmap
+    
+    o padrão é aplicado diretamente ao buffer, entre os limites de cada
+    linha; apenas os valores de identificadores, números e operadores viram
+    str. linhas com bytes fora do ASCII são decodificadas individualmente e
+    analisadas em modo texto, então o resultado é igual ao de tokenizar_fluxo
+    
+    Args:
+        dados: bytes, bytearray, memoryview ou mmap com o programa
+        codificacao (str): codificação usada nas linhas não-ASCII
+        
+    Yields:
+        dict: lote com 'linha', 'expressao', 'tokens' e 'erro', como em
+              tokenizar_fluxo (posições são colunas dentro da linha)
+    """
+    def extrair(inicio, fim):
+        return str(dados[inicio:fim], 'ascii')
+    
+    for numero_linha, inicio, fim in iterar_linhas_bytes(dados):
+        if PADRAO_FORA_DO_ASCII.search(dados, inicio, fim):
+            linha = str(dados[inicio:fim], codificacao)
+            lote = analisar_linha_fluxo(numero_linha, linha)
+            if lote is not None:
+                yield lote
+            continue
+        
+        # descarta espaços finais e ignora linhas vazias e comentários
+        while fim > inicio and dados[fim - 1] in ESPACOS_ASCII:
+            fim -= 1
+        primeiro = PADRAO_ESPACOS_INICIAIS.match(dados, inicio, fim).end()
+        if primeiro == fim or dados[primeiro] == ord('#'):
+            continue
+        
+        try:
+            tokens = escanear_trecho(dados, inicio, fim, PADRAO_TOKENS_BYTES, extrair)
+            validar_estrutura_rpn(tokens)
+            erro = None
+        except LexerError as e:
+            tokens = None
+            erro = e
+        except Exception as e:
+            tokens = None
+            erro = LexerError(f"Erro interno do analisador: {str(e)}")
+        
+        yield {
+            'linha': numero_linha,
+            'expressao': extrair(primeiro, fim),
+            'tokens': tokens,
+            'erro': erro
+        }
+
 def salvar_tokens(tokens, nome_arquivo="tokens.txt"):
     """
     salva os tokens gerados em um arquivo de texto
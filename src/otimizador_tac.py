@@ -14,6 +14,13 @@ Date: 22/11/2025
 
 from typing import List, Dict, Any, Optional, Set
 import copy
+import sys
+import os
+
+# Adicionar diretório ao path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.token_types import NumeroLiteral, valor_numerico
 
 
 class InstrucaoTAC:
@@ -62,20 +69,16 @@ class OtimizadorTAC:
         """
         Verifica se um valor é uma constante numérica
         
+        Literais vindos do léxico (NumeroLiteral) já trazem o valor
+        decodificado; strings comuns são interpretadas uma única vez.
+        
         Args:
             valor: String representando o valor
             
         Returns:
             True se é uma constante numérica
         """
-        if valor is None:
-            return False
-        
-        try:
-            float(valor)
-            return True
-        except (ValueError, TypeError):
-            return False
+        return valor_numerico(valor) is not None
     
     def obter_valor_numerico(self, valor: str) -> Optional[float]:
         """
@@ -85,11 +88,15 @@ class OtimizadorTAC:
             valor: String representando o valor
             
         Returns:
-            Valor numérico ou None
+            Valor numérico ou None (também para inteiros grandes demais
+            para float, que ficam sem dobramento)
         """
+        numero = valor_numerico(valor)
+        if numero is None:
+            return None
         try:
-            return float(valor)
-        except (ValueError, TypeError):
+            return float(numero)
+        except OverflowError:
             return None
     
     def calcular_operacao(self, op1: float, operador: str, op2: float) -> Optional[float]:
@@ -104,6 +111,10 @@ class OtimizadorTAC:
         Returns:
             Resultado da operação ou None se inválido
         """
+        # inteiros grandes demais para float chegam como None
+        if op1 is None or op2 is None:
+            return None
+        
         try:
             if operador == '+':
                 return op1 + op2
@@ -151,11 +162,11 @@ class OtimizadorTAC:
             valor: Número a formatar
             
         Returns:
-            String formatada
+            String formatada (NumeroLiteral, que mantém o valor numérico)
         """
         if valor == int(valor):
-            return str(int(valor))
-        return str(valor)
+            return NumeroLiteral(str(int(valor)), int(valor))
+        return NumeroLiteral(str(valor), valor)
     
     def constant_folding(self, instrucoes: List[InstrucaoTAC]) -> List[InstrucaoTAC]:
         """
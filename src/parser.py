@@ -24,15 +24,79 @@ def criar_contexto_parser(tokens):
         tokens (list): lista de tokens
         
     Returns:
-        dict: contexto com buffer, posição e pilha
+        dict: contexto com buffer, posição, pilha e índices de fechamento
     """
     return {
         'tokens': tokens,
         'posicao': 0,
         'pilha': [],
-        'derivacao': []
+        'derivacao': [],
+        'fechamentos': calcular_fechamentos(tokens)
     }
 
+def calcular_fechamentos(tokens):
+    """
+    associa cada parêntese de abertura ao seu fechamento, numa passada
+    
+    Args:
+        tokens (list): lista de tokens
+        
+    Returns:
+        list: para cada posição de '(', o índice do ')' correspondente;
+              -1 nas demais posições e em '(' sem fechamento
+    """
+    fechamentos = [-1] * len(tokens)
+    abertos = []
+    
+    for indice, token in enumerate(tokens):
+        if token.codigo == COD_PARENTESE_ABRE:
+            abertos.append(indice)
+        elif token.codigo == COD_PARENTESE_FECHA and abertos:
+            fechamentos[abertos.pop()] = indice
+    
+    return fechamentos
+
+def token_em(contexto, posicao):
+    """
+    retorna o token de uma posição qualquer sem mover o contexto
+    
+    Args:
+        contexto (dict): contexto do parser
+        posicao (int): índice do token
+        
+    Returns:
+        Token: token na posição ou None se fora da lista
+    """
+    if posicao is not None and posicao < len(contexto['tokens']):
+        return contexto['tokens'][posicao]
+    return None
+
+def pular_operando(contexto, posicao):
+    """
+    posição logo após o operando que começa em posicao, sem analisá-lo
+    
+    uma expressão aninhada termina no parêntese que fecha o seu '(';
+    a validação fica para a análise de fato
+    
+    Args:
+        contexto (dict): contexto do parser
+        posicao (int): índice do início do operando
+        
+    Returns:
+        int: índice após o operando, ou None se não há operando ali
+    """
+    token = token_em(contexto, posicao)
+    if token is None:
+        return None
+    
+    if token.codigo == COD_NUMERO or token.codigo == COD_IDENTIFICADOR:
+        return posicao + 1
+    
+    if token.codigo == COD_PARENTESE_ABRE and contexto['fechamentos'][posicao] >= 0:
+        return contexto['fechamentos'][posicao] + 1
+    
+    return None
+
 def token_atual(contexto):
     """
     retorna token atual sem avançar
@@ -41,7 +105,7 @@ def token_atual(contexto):
         contexto (dict): contexto do parser
         
     Returns:
-        dict: token atual ou None se fim
+        Token: token atual ou None se fim
     """
     pos = contexto['posicao']
     if pos < len(contexto['tokens']):
@@ -57,16 +121,16 @@ def avancar_token(contexto):
     """
     contexto['posicao'] += 1
 
-def match(tipo_esperado, contexto):
+def match(codigo_esperado, contexto):
     """
     verifica se token atual é do tipo esperado e avança
     
     Args:
-        tipo_esperado (str): tipo esperado do token
+        codigo_esperado (int): código COD_* do tipo esperado
         contexto (dict): contexto do parser
         
     Returns:
-        dict: token consumido
+        Token: token consumido
         
     Raises:
         ParserError: se token não corresponde
@@ -74,12 +138,12 @@ def match(tipo_esperado, contexto):
     token = token_atual(contexto)
     
     if token is None:
-        raise ParserError(f"Esperado {tipo_esperado}, encontrado fim de arquivo")
+        raise ParserError(f"Esperado {NOMES_TIPOS[codigo_esperado]}, encontrado fim de arquivo")
     
-    if token['tipo'] != tipo_esperado:
+    if token.codigo != codigo_esperado:
         raise ParserError(
-            f"Esperado {tipo_esperado}, encontrado {token['tipo']} ('{token['valor']}')",
-            posicao=token.get('posicao')
+            f"Esperado {NOMES_TIPOS[codigo_esperado]}, encontrado {token.tipo} ('{token.valor}')",
+            posicao=token.posicao
         )
     
     avancar_token(contexto)
@@ -94,7 +158,7 @@ def match_valor(valor_esperado, contexto):
         contexto (dict): contexto do parser
         
     Returns:
-        dict: token consumido
+        Token: token consumido
         
     Raises:
         ParserError: se valor não corresponde
@@ -107,7 +171,7 @@ def match_valor(valor_esperado, contexto):
     if token['valor'] != valor_esperado:
         raise ParserError(
             f"Esperado '{valor_esperado}', encontrado '{token['valor']}'",
-            posicao=token.get('posicao')
+            posicao=token.posicao
         )
     
     avancar_token(contexto)
@@ -118,7 +182,7 @@ def parsear(tokens, tabela_ll1):
     função principal do parser LL(1)
     
     Args:
-        tokens (list): lista de tokens
+        tokens (list): lista de tokens (Token ou dicionários)
         tabela_ll1 (dict): tabela de análise LL(1)
         
     Returns:
@@ -130,6 +194,10 @@ def parsear(tokens, tabela_ll1):
     if not tokens:
         raise ParserError("Lista de tokens vazia")
     
+    # tokens em formato de dicionário (ex.: lidos de arquivo) viram Token
+    if not isinstance(tokens[0], Token):
+        tokens = [como_token(token) for token in tokens]
+    
     contexto = criar_contexto_parser(tokens)
     
     try:
@@ -141,7 +209,7 @@ def parsear(tokens, tabela_ll1):
             token = token_atual(contexto)
             raise ParserError(
                 f"Tokens excedentes após expressão válida: '{token['valor']}'",
-                posicao=token.get('posicao')
+                posicao=token.posicao
             )
         
         return {
@@ -178,11 +246,11 @@ def parse_expressao(contexto, tabela):
     Returns:
         dict: nó da derivação
     """
-    match(PARENTESE_ABRE, contexto)
+    match(COD_PARENTESE_ABRE, contexto)
     
     conteudo = parse_conteudo(contexto, tabela)
     
-    match(PARENTESE_FECHA, contexto)
+    match(COD_PARENTESE_FECHA, contexto)
     
     return {
         'tipo': 'EXPRESSAO',
@@ -208,22 +276,22 @@ def parse_conteudo(contexto, tabela):
     # verificar tipo de conteúdo pelo lookahead
     
     # comando RES: (N RES)
-    if token['tipo'] == NUMERO:
+    if token.codigo == COD_NUMERO:
         # olhar próximo token e o token seguinte para decidir
         pos_backup = contexto['posicao']
         avancar_token(contexto)
         proximo = token_atual(contexto)
         
-        if proximo and proximo['tipo'] == PALAVRA_RESERVADA and proximo['valor'] == 'RES':
+        if proximo and proximo.codigo == COD_PALAVRA_RESERVADA and proximo['valor'] == 'RES':
             contexto['posicao'] = pos_backup
             return parse_comando_res(contexto, tabela)
-        elif proximo and proximo['tipo'] == IDENTIFICADOR:
+        elif proximo and proximo.codigo == COD_IDENTIFICADOR:
             # pode ser (V MEM) ou (A B op_rel)
             avancar_token(contexto)
             terceiro = token_atual(contexto)
             contexto['posicao'] = pos_backup  # voltar
             
-            if terceiro and terceiro['tipo'] == PARENTESE_FECHA:
+            if terceiro and terceiro.codigo == COD_PARENTESE_FECHA:
                 # é comando memória: (V MEM)
                 return parse_comando_memoria(contexto, tabela)
             else:
@@ -236,14 +304,14 @@ def parse_conteudo(contexto, tabela):
             return parse_operacao_ou_comparacao(contexto, tabela)
     
     # comando memória: (MEM)
-    elif token['tipo'] == IDENTIFICADOR:
+    elif token.codigo == COD_IDENTIFICADOR:
         # verificar se é só identificador ou operação
         pos_backup = contexto['posicao']
         avancar_token(contexto)
         proximo = token_atual(contexto)
         contexto['posicao'] = pos_backup
         
-        if proximo and proximo['tipo'] == PARENTESE_FECHA:
+        if proximo and proximo.codigo == COD_PARENTESE_FECHA:
             # apenas (MEM)
             return parse_comando_memoria(contexto, tabela)
         else:
@@ -251,38 +319,28 @@ def parse_conteudo(contexto, tabela):
             return parse_operacao_ou_comparacao(contexto, tabela)
     
     # expressão aninhada ou estrutura de controle ou comando de armazenamento
-    elif token['tipo'] == PARENTESE_ABRE:
-        # lookahead mais profundo para identificar o tipo
+    elif token.codigo == COD_PARENTESE_ABRE:
+        # o token após o fechamento da primeira sub-expressão decide o tipo
         # pode ser: ((expr) ID) = comando armazenar
         #          ((expr1) (expr2) op) = operação
         #          ((op1) (op2) op_rel ...) = estrutura de controle
-        pos_backup = contexto['posicao']
+        fim = pular_operando(contexto, contexto['posicao'])
+        proximo = token_em(contexto, fim)
         
-        try:
-            # ler primeira sub-expressão
-            parse_expressao(contexto, tabela)
-            proximo = token_atual(contexto)
-            
-            # se é identificador seguido de ), é comando armazenar
-            if proximo and proximo['tipo'] == IDENTIFICADOR:
-                avancar_token(contexto)
-                apos_id = token_atual(contexto)
-                contexto['posicao'] = pos_backup
-                
-                if apos_id and apos_id['tipo'] == PARENTESE_FECHA:
-                    return parse_comando_memoria(contexto, tabela)
+        # se é identificador seguido de ), é comando armazenar
+        if proximo and proximo.codigo == COD_IDENTIFICADOR:
+            apos_id = token_em(contexto, fim + 1)
             
-            # caso contrário, é operação ou estrutura
-            contexto['posicao'] = pos_backup
-            return parse_operacao_ou_estrutura(contexto, tabela)
-        except:
-            contexto['posicao'] = pos_backup
-            return parse_operacao_ou_estrutura(contexto, tabela)
+            if apos_id and apos_id.codigo == COD_PARENTESE_FECHA:
+                return parse_comando_memoria(contexto, tabela)
+        
+        # caso contrário, é operação ou estrutura
+        return parse_operacao_ou_estrutura(contexto, tabela)
     
     else:
         raise ParserError(
-            f"Token inesperado no início de conteúdo: {token['tipo']} ('{token['valor']}')",
-            posicao=token.get('posicao')
+            f"Token inesperado no início de conteúdo: {token.tipo} ('{token['valor']}')",
+            posicao=token.posicao
         )
 
 def parse_operacao_ou_comparacao(contexto, tabela):
@@ -290,33 +348,25 @@ def parse_operacao_ou_comparacao(contexto, tabela):
     decide entre operação aritmética ou comparação através de lookahead
     verifica qual tipo de operador vem após os dois operandos
     """
-    pos_backup = contexto['posicao']
+    # pular os dois operandos pelos índices de fechamento
+    fim = pular_operando(contexto, contexto['posicao'])
+    fim = pular_operando(contexto, fim) if fim is not None else None
+    token = token_em(contexto, fim)
     
-    try:
-        # pular primeiro operando
+    if token and token.codigo == COD_OPERADOR_RELACIONAL:
+        # é comparação ou estrutura de controle
+        return parse_comparacao_ou_estrutura(contexto, tabela)
+    elif token and token.codigo == COD_OPERADOR:
+        # é operação aritmética
+        return parse_operacao(contexto, tabela)
+    elif fim is None:
+        # operandos inválidos: a análise de fato aponta o erro
+        return parse_operacao(contexto, tabela)
+    else:
+        # operandos analisados antes, para que seus erros tenham precedência
         parse_operando(contexto, tabela)
-        # pular segundo operando
         parse_operando(contexto, tabela)
-        # verificar qual tipo de operador
-        token = token_atual(contexto)
-        
-        if token and token['tipo'] == OPERADOR_RELACIONAL:
-            # é comparação ou estrutura de controle
-            contexto['posicao'] = pos_backup
-            return parse_comparacao_ou_estrutura(contexto, tabela)
-        elif token and token['tipo'] == OPERADOR:
-            # é operação aritmética
-            contexto['posicao'] = pos_backup
-            return parse_operacao(contexto, tabela)
-        else:
-            contexto['posicao'] = pos_backup
-            raise ParserError(f"Esperado operador, encontrado {token['tipo'] if token else 'EOF'}")
-    except ParserError:
-        raise
-    except:
-        # em caso de erro, tentar como operação
-        contexto['posicao'] = pos_backup
-        return parse_operacao(contexto, tabela)
+        raise ParserError(f"Esperado operador, encontrado {token.tipo if token else 'EOF'}")
 
 def parse_operacao_ou_estrutura(contexto, tabela):
     """
@@ -325,28 +375,16 @@ def parse_operacao_ou_estrutura(contexto, tabela):
     """
     # lookahead para detectar estrutura de controle
     # estrutura: (operando operando op_rel (bloco) IF/WHILE) ou (operando operando op_rel (bloco) (bloco) IF)
-    pos_backup = contexto['posicao']
+    fim = pular_operando(contexto, contexto['posicao'])
+    fim = pular_operando(contexto, fim) if fim is not None else None
+    token = token_em(contexto, fim)
     
-    try:
-        # pular primeiro operando (expressão)
-        parse_operando(contexto, tabela)
-        # pular segundo operando
-        parse_operando(contexto, tabela)
-        # verificar se há operador relacional
-        token = token_atual(contexto)
-        
-        if token and token['tipo'] == OPERADOR_RELACIONAL:
-            # é comparação ou estrutura de controle
-            contexto['posicao'] = pos_backup
-            return parse_comparacao_ou_estrutura(contexto, tabela)
-        else:
-            # é operação aritmética
-            contexto['posicao'] = pos_backup
-            return parse_operacao(contexto, tabela)
-    except:
-        # em caso de erro, tentar como operação
-        contexto['posicao'] = pos_backup
-        return parse_operacao(contexto, tabela)
+    if token and token.codigo == COD_OPERADOR_RELACIONAL:
+        # é comparação ou estrutura de controle
+        return parse_comparacao_ou_estrutura(contexto, tabela)
+    
+    # é operação aritmética
+    return parse_operacao(contexto, tabela)
 
 def parse_bloco_composto(contexto, tabela):
     """
@@ -357,12 +395,12 @@ def parse_bloco_composto(contexto, tabela):
         dict: expressão única ou bloco composto com lista de expressões
     """
     # ler o bloco
-    match(PARENTESE_ABRE, contexto)
+    match(COD_PARENTESE_ABRE, contexto)
     
     # verificar se o primeiro token é parêntese abre (bloco composto)
     token_inicio = token_atual(contexto)
     
-    if token_inicio and token_inicio['tipo'] == PARENTESE_ABRE:
+    if token_inicio and token_inicio.codigo == COD_PARENTESE_ABRE:
         # bloco composto com múltiplas expressões: ((expr1) (expr2) ...)
         expressoes = []
         
@@ -370,19 +408,19 @@ def parse_bloco_composto(contexto, tabela):
             token = token_atual(contexto)
             
             # se encontrar fecha parêntese, terminou o bloco composto
-            if token and token['tipo'] == PARENTESE_FECHA:
-                match(PARENTESE_FECHA, contexto)
+            if token and token.codigo == COD_PARENTESE_FECHA:
+                match(COD_PARENTESE_FECHA, contexto)
                 break
             
             # se encontrar abre parêntese, é uma expressão
-            elif token and token['tipo'] == PARENTESE_ABRE:
+            elif token and token.codigo == COD_PARENTESE_ABRE:
                 expr = parse_expressao(contexto, tabela)
                 expressoes.append(expr)
             
             else:
                 raise ParserError(
                     f"Esperado '(' ou ')' em bloco composto, encontrado {token}",
-                    posicao=token.get('posicao') if token else None
+                    posicao=token.posicao if token else None
                 )
         
         # retornar bloco composto
@@ -395,7 +433,7 @@ def parse_bloco_composto(contexto, tabela):
         # bloco simples com uma única expressão: (expr)
         # parsear o conteúdo da expressão
         conteudo = parse_conteudo(contexto, tabela)
-        match(PARENTESE_FECHA, contexto)
+        match(COD_PARENTESE_FECHA, contexto)
         
         return {
             'tipo': 'EXPRESSAO',
@@ -415,16 +453,16 @@ def parse_comparacao_ou_estrutura(contexto, tabela):
     operando2 = parse_operando(contexto, tabela)
     
     token = token_atual(contexto)
-    if token is None or token['tipo'] != OPERADOR_RELACIONAL:
+    if token is None or token.codigo != COD_OPERADOR_RELACIONAL:
         raise ParserError("Esperado operador relacional")
     
-    operador = match(OPERADOR_RELACIONAL, contexto)
+    operador = match(COD_OPERADOR_RELACIONAL, contexto)
     
     # verificar o que vem depois
     token_seguinte = token_atual(contexto)
     
     # se é parêntese fecha, é comparação simples
-    if token_seguinte and token_seguinte['tipo'] == PARENTESE_FECHA:
+    if token_seguinte and token_seguinte.codigo == COD_PARENTESE_FECHA:
         return {
             'tipo': 'COMPARACAO',
             'operador': operador['valor'],
@@ -433,7 +471,7 @@ def parse_comparacao_ou_estrutura(contexto, tabela):
         }
     
     # se é parêntese abre, pode ser estrutura de controle
-    elif token_seguinte and token_seguinte['tipo'] == PARENTESE_ABRE:
+    elif token_seguinte and token_seguinte.codigo == COD_PARENTESE_ABRE:
         # ler primeiro bloco (pode ser composto)
         bloco1 = parse_bloco_composto(contexto, tabela)
         
@@ -441,13 +479,13 @@ def parse_comparacao_ou_estrutura(contexto, tabela):
         token_pos_bloco1 = token_atual(contexto)
         
         # se é outro parêntese abre, pode ser IF (dois blocos)
-        if token_pos_bloco1 and token_pos_bloco1['tipo'] == PARENTESE_ABRE:
+        if token_pos_bloco1 and token_pos_bloco1.codigo == COD_PARENTESE_ABRE:
             # ler segundo bloco (pode ser composto)
             bloco2 = parse_bloco_composto(contexto, tabela)
             
             # agora deve ter IF
             token_palavra = token_atual(contexto)
-            if token_palavra and token_palavra['tipo'] == PALAVRA_RESERVADA and token_palavra['valor'] == 'IF':
+            if token_palavra and token_palavra.codigo == COD_PALAVRA_RESERVADA and token_palavra['valor'] == 'IF':
                 match_valor('IF', contexto)
                 return {
                     'tipo': 'DECISAO',
@@ -463,11 +501,11 @@ def parse_comparacao_ou_estrutura(contexto, tabela):
             else:
                 raise ParserError(
                     f"Esperado IF após dois blocos, encontrado {token_palavra}",
-                    posicao=token_palavra.get('posicao') if token_palavra else None
+                    posicao=token_palavra.posicao if token_palavra else None
                 )
         
         # se é palavra reservada WHILE, é loop (um bloco)
-        elif token_pos_bloco1 and token_pos_bloco1['tipo'] == PALAVRA_RESERVADA and token_pos_bloco1['valor'] == 'WHILE':
+        elif token_pos_bloco1 and token_pos_bloco1.codigo == COD_PALAVRA_RESERVADA and token_pos_bloco1['valor'] == 'WHILE':
             match_valor('WHILE', contexto)
             return {
                 'tipo': 'LACO',
@@ -483,13 +521,13 @@ def parse_comparacao_ou_estrutura(contexto, tabela):
         else:
             raise ParserError(
                 f"Esperado IF ou WHILE após bloco, encontrado {token_pos_bloco1}",
-                posicao=token_pos_bloco1.get('posicao') if token_pos_bloco1 else None
+                posicao=token_pos_bloco1.posicao if token_pos_bloco1 else None
             )
     
     else:
         raise ParserError(
             f"Token inesperado após operador relacional: {token_seguinte}",
-            posicao=token_seguinte.get('posicao') if token_seguinte else None
+            posicao=token_seguinte.posicao if token_seguinte else None
         )
 
 def parse_operacao(contexto, tabela):
@@ -511,8 +549,8 @@ def parse_operacao(contexto, tabela):
     if token is None:
         raise ParserError("Esperado operador, encontrado fim de arquivo")
     
-    if token['tipo'] == OPERADOR:
-        operador = match(OPERADOR, contexto)
+    if token.codigo == COD_OPERADOR:
+        operador = match(COD_OPERADOR, contexto)
         return {
             'tipo': 'OPERACAO',
             'operador': operador['valor'],
@@ -521,8 +559,8 @@ def parse_operacao(contexto, tabela):
         }
     else:
         raise ParserError(
-            f"Esperado operador aritmético, encontrado {token['tipo']}",
-            posicao=token.get('posicao')
+            f"Esperado operador aritmético, encontrado {token.tipo}",
+            posicao=token.posicao
         )
 
 def parse_operando(contexto, tabela):
@@ -541,28 +579,28 @@ def parse_operando(contexto, tabela):
     if token is None:
         raise ParserError("Esperado operando, encontrado fim de arquivo")
     
-    if token['tipo'] == NUMERO:
-        numero = match(NUMERO, contexto)
+    if token.codigo == COD_NUMERO:
+        numero = match(COD_NUMERO, contexto)
         return {
             'tipo': 'NUMERO',
             'valor': numero['valor']
         }
     
-    elif token['tipo'] == IDENTIFICADOR:
-        identificador = match(IDENTIFICADOR, contexto)
+    elif token.codigo == COD_IDENTIFICADOR:
+        identificador = match(COD_IDENTIFICADOR, contexto)
         return {
             'tipo': 'IDENTIFICADOR',
             'valor': identificador['valor']
         }
     
-    elif token['tipo'] == PARENTESE_ABRE:
+    elif token.codigo == COD_PARENTESE_ABRE:
         # expressão aninhada
         return parse_expressao(contexto, tabela)
     
     else:
         raise ParserError(
-            f"Esperado operando, encontrado {token['tipo']} ('{token['valor']}')",
-            posicao=token.get('posicao')
+            f"Esperado operando, encontrado {token.tipo} ('{token['valor']}')",
+            posicao=token.posicao
         )
 
 def parse_comando_memoria(contexto, tabela):
@@ -578,10 +616,10 @@ def parse_comando_memoria(contexto, tabela):
     """
     token = token_atual(contexto)
     
-    if token['tipo'] == NUMERO:
+    if token.codigo == COD_NUMERO:
         # armazenar com número: (V MEM)
-        numero = match(NUMERO, contexto)
-        identificador = match(IDENTIFICADOR, contexto)
+        numero = match(COD_NUMERO, contexto)
+        identificador = match(COD_IDENTIFICADOR, contexto)
         
         return {
             'tipo': 'COMANDO_ARMAZENAR',
@@ -589,10 +627,10 @@ def parse_comando_memoria(contexto, tabela):
             'identificador': identificador['valor']
         }
     
-    elif token['tipo'] == PARENTESE_ABRE:
+    elif token.codigo == COD_PARENTESE_ABRE:
         # armazenar com expressão: ((expr) MEM)
         expressao = parse_expressao(contexto, tabela)
-        identificador = match(IDENTIFICADOR, contexto)
+        identificador = match(COD_IDENTIFICADOR, contexto)
         
         return {
             'tipo': 'COMANDO_ARMAZENAR_EXPRESSAO',
@@ -600,9 +638,9 @@ def parse_comando_memoria(contexto, tabela):
             'identificador': identificador['valor']
         }
     
-    elif token['tipo'] == IDENTIFICADOR:
+    elif token.codigo == COD_IDENTIFICADOR:
         # recuperar: (MEM)
-        identificador = match(IDENTIFICADOR, contexto)
+        identificador = match(COD_IDENTIFICADOR, contexto)
         
         return {
             'tipo': 'COMANDO_RECUPERAR',
@@ -612,7 +650,7 @@ def parse_comando_memoria(contexto, tabela):
     else:
         raise ParserError(
             f"Esperado número, expressão ou identificador no comando de memória",
-            posicao=token.get('posicao')
+            posicao=token.posicao
         )
 
 def parse_comando_res(contexto, tabela):
@@ -626,7 +664,7 @@ def parse_comando_res(contexto, tabela):
     Returns:
         dict: nó da derivação
     """
-    numero = match(NUMERO, contexto)
+    numero = match(COD_NUMERO, contexto)
     match_valor('RES', contexto)
     
     return {
@@ -658,7 +696,7 @@ def parse_estrutura_controle(contexto, tabela):
     if token is None:
         raise ParserError("Esperado IF ou WHILE, encontrado fim de arquivo")
     
-    if token['tipo'] == PALAVRA_RESERVADA:
+    if token.codigo == COD_PALAVRA_RESERVADA:
         if token['valor'] == 'WHILE':
             match_valor('WHILE', contexto)
             return {
@@ -679,12 +717,12 @@ def parse_estrutura_controle(contexto, tabela):
         else:
             raise ParserError(
                 f"Esperado IF ou WHILE, encontrado {token['valor']}",
-                posicao=token.get('posicao')
+                posicao=token.posicao
             )
     else:
         raise ParserError(
-            f"Esperado palavra reservada (IF/WHILE), encontrado {token['tipo']}",
-            posicao=token.get('posicao')
+            f"Esperado palavra reservada (IF/WHILE), encontrado {token.tipo}",
+            posicao=token.posicao
         )
 
 def parse_condicao(contexto, tabela):
@@ -705,8 +743,8 @@ def parse_condicao(contexto, tabela):
     if token is None:
         raise ParserError("Esperado operador relacional, encontrado fim de arquivo")
     
-    if token['tipo'] == OPERADOR_RELACIONAL:
-        operador = match(OPERADOR_RELACIONAL, contexto)
+    if token.codigo == COD_OPERADOR_RELACIONAL:
+        operador = match(COD_OPERADOR_RELACIONAL, contexto)
         return {
             'tipo': 'CONDICAO',
             'operando1': operando1,
@@ -715,18 +753,18 @@ def parse_condicao(contexto, tabela):
         }
     else:
         raise ParserError(
-            f"Esperado operador relacional, encontrado {token['tipo']}",
-            posicao=token.get('posicao')
+            f"Esperado operador relacional, encontrado {token.tipo}",
+            posicao=token.posicao
         )
 
 if __name__ == '__main__':
     # teste do parser
     from src.lexer import parse_expressao as tokenizar
-    from src.grammar import construir_gramatica
+    from src.grammar import obter_gramatica
     
     try:
         # construir gramática
-        gramatica_info = construir_gramatica()
+        gramatica_info = obter_gramatica()
         tabela = gramatica_info['tabela']
         
         # testar expressões
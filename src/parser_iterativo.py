@@ -0,0 +1,715 @@
+# analisador sintático LL(1) dirigido por tabela, com pilha explícita
+# não usa recursão: a profundidade de aninhamento só é limitada pela memória.
+# a gramática abaixo é a forma fatorada à esquerda da linguagem aceita pelo
+# parser descendente recursivo (src/parser.py), com símbolos de ação ('#...')
+# que montam a mesma estrutura de derivação
+
+import sys
+import os
+from collections import deque
+from functools import lru_cache
+from itertools import chain
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.token_types import *
+from src.parser import ParserError
+from src.lexer import LexerError
+from src.arvore_atribuida import criar_no_atribuido
+from src.grammar import (
+    calcular_all_first, calcular_all_follow, construir_tabela_ll1,
+    TabelaLL1Densa, SEM_PRODUCAO
+)
+
+# produções da derivação; símbolos iniciados por '#' são ações semânticas
+# (não participam de FIRST/FOLLOW). em conflito vale a primeira produção:
+# em BLOCO_RESTO, '(' abre sempre um bloco composto
+GRAMATICA_DERIVACAO = {
+    'PROGRAMA': [
+        ['EXPRESSAO']
+    ],
+    'EXPRESSAO': [
+        ['(', 'CONTEUDO', ')', '#expressao']
+    ],
+    'CONTEUDO': [
+        ['numero', 'RESTO_NUMERO'],
+        ['identificador', 'RESTO_IDENTIFICADOR'],
+        ['EXPRESSAO', 'RESTO_EXPRESSAO']
+    ],
+    'RESTO_NUMERO': [
+        ['RES', '#res'],                            # (N RES)
+        ['identificador', 'RESTO_NUMERO_ID'],
+        ['numero', 'CAUDA_OPERACAO'],
+        ['EXPRESSAO', 'CAUDA_OPERACAO']
+    ],
+    'RESTO_NUMERO_ID': [
+        ['#armazenar'],                             # (V MEM)
+        ['CAUDA_OPERACAO']
+    ],
+    'RESTO_IDENTIFICADOR': [
+        ['#recuperar'],                             # (MEM)
+        ['OPERANDO', 'CAUDA_OPERACAO']
+    ],
+    'RESTO_EXPRESSAO': [
+        ['identificador', 'RESTO_EXPRESSAO_ID'],
+        ['numero', 'CAUDA_OPERACAO_EXPRESSAO'],
+        ['EXPRESSAO', 'CAUDA_OPERACAO_EXPRESSAO']
+    ],
+    'RESTO_EXPRESSAO_ID': [
+        ['#armazenar_expressao'],                   # ((expr) MEM)
+        ['CAUDA_OPERACAO_EXPRESSAO']
+    ],
+    'OPERANDO': [
+        ['numero'],
+        ['identificador'],
+        ['EXPRESSAO']
+    ],
+    'CAUDA_OPERACAO': [
+        ['operador', '#operacao'],
+        ['relacional', 'APOS_RELACIONAL']
+    ],
+    'CAUDA_OPERACAO_EXPRESSAO': [
+        ['operador', '#operacao'],
+        ['relacional', 'APOS_RELACIONAL']
+    ],
+    'APOS_RELACIONAL': [
+        ['#comparacao'],
+        ['BLOCO', 'APOS_BLOCO']
+    ],
+    'APOS_BLOCO': [
+        ['BLOCO', 'FIM_IF', '#decisao'],
+        ['WHILE', '#laco']
+    ],
+    'FIM_IF': [
+        ['IF']
+    ],
+    'BLOCO': [
+        ['(', 'BLOCO_RESTO']
+    ],
+    'BLOCO_RESTO': [
+        ['#lista', 'EXPRESSAO', '#anexar', 'LISTA_EXPRESSOES', ')', '#bloco_composto'],
+        ['CONTEUDO', ')', '#expressao']
+    ],
+    'LISTA_EXPRESSOES': [
+        ['EXPRESSAO', '#anexar', 'LISTA_EXPRESSOES'],
+        []
+    ]
+}
+
+# mensagem de erro usada quando não há produção para o lookahead; cada
+# contexto reproduz a mensagem da função correspondente em src/parser.py
+CONTEXTO_ERRO = {
+    'PROGRAMA': 'abre',
+    'EXPRESSAO': 'abre',
+    'CONTEUDO': 'conteudo',
+    'RESTO_NUMERO': 'operando',
+    'RESTO_NUMERO_ID': 'operador',
+    'RESTO_IDENTIFICADOR': 'operando',
+    'RESTO_EXPRESSAO': 'operando',
+    'RESTO_EXPRESSAO_ID': 'operador_aritmetico',
+    'OPERANDO': 'operando',
+    'CAUDA_OPERACAO': 'operador',
+    'CAUDA_OPERACAO_EXPRESSAO': 'operador_aritmetico',
+    'APOS_RELACIONAL': 'apos_relacional',
+    'APOS_BLOCO': 'apos_bloco',
+    'FIM_IF': 'if_apos_blocos',
+    'BLOCO': 'abre',
+    'BLOCO_RESTO': 'conteudo',
+    'LISTA_EXPRESSOES': 'bloco_composto'
+}
+
+# terminal correspondente a cada código de token (palavras reservadas
+# usam o próprio valor)
+TERMINAL_POR_CODIGO = {
+    COD_NUMERO: 'numero',
+    COD_IDENTIFICADOR: 'identificador',
+    COD_OPERADOR: 'operador',
+    COD_OPERADOR_RELACIONAL: 'relacional',
+    COD_PARENTESE_ABRE: '(',
+    COD_PARENTESE_FECHA: ')'
+}
+CODIGO_POR_TERMINAL = {terminal: codigo for codigo, terminal in TERMINAL_POR_CODIGO.items()}
+
+# terminais cujo token vai para a pilha de valores
+TERMINAIS_COM_VALOR = {'numero', 'identificador', 'operador', 'relacional'}
+
+# tipos das entradas da pilha de análise
+SIMBOLO_TERMINAL = 0
+SIMBOLO_TERMINAL_VALOR = 1
+SIMBOLO_NAO_TERMINAL = 2
+SIMBOLO_ACAO = 3
+
+def como_operando(valor):
+    """converte um token de número/identificador em nó de operando"""
+    if isinstance(valor, Token):
+        tipo = 'NUMERO' if valor.codigo == COD_NUMERO else 'IDENTIFICADOR'
+        return {
+            'tipo': tipo,
+            'valor': valor.valor
+        }
+    return valor
+
+def criar_condicao(operando1, operando2, operador):
+    """nó de condição de DECISAO/LACO"""
+    return {
+        'tipo': 'CONDICAO',
+        'operando1': como_operando(operando1),
+        'operando2': como_operando(operando2),
+        'operador': operador.valor
+    }
+
+# ações da derivação: recebem a pilha de valores e o número da linha (só
+# as ações da árvore usam a linha)
+def acao_expressao(valores, linha):
+    valores.append({
+        'tipo': 'EXPRESSAO',
+        'conteudo': valores.pop()
+    })
+
+def acao_res(valores, linha):
+    numero = valores.pop()
+    valores.append({
+        'tipo': 'COMANDO_RES',
+        'n': numero.valor
+    })
+
+def acao_armazenar(valores, linha):
+    identificador = valores.pop()
+    numero = valores.pop()
+    valores.append({
+        'tipo': 'COMANDO_ARMAZENAR',
+        'valor': numero.valor,
+        'identificador': identificador.valor
+    })
+
+def acao_recuperar(valores, linha):
+    identificador = valores.pop()
+    valores.append({
+        'tipo': 'COMANDO_RECUPERAR',
+        'identificador': identificador.valor
+    })
+
+def acao_armazenar_expressao(valores, linha):
+    identificador = valores.pop()
+    expressao = valores.pop()
+    valores.append({
+        'tipo': 'COMANDO_ARMAZENAR_EXPRESSAO',
+        'expressao': expressao,
+        'identificador': identificador.valor
+    })
+
+def acao_operacao(valores, linha):
+    operador = valores.pop()
+    operando2 = valores.pop()
+    operando1 = valores.pop()
+    valores.append({
+        'tipo': 'OPERACAO',
+        'operador': operador.valor,
+        'operando1': como_operando(operando1),
+        'operando2': como_operando(operando2)
+    })
+
+def acao_comparacao(valores, linha):
+    operador = valores.pop()
+    operando2 = valores.pop()
+    operando1 = valores.pop()
+    valores.append({
+        'tipo': 'COMPARACAO',
+        'operador': operador.valor,
+        'operando1': como_operando(operando1),
+        'operando2': como_operando(operando2)
+    })
+
+def acao_decisao(valores, linha):
+    bloco_falso = valores.pop()
+    bloco_verdadeiro = valores.pop()
+    operador = valores.pop()
+    operando2 = valores.pop()
+    operando1 = valores.pop()
+    valores.append({
+        'tipo': 'DECISAO',
+        'condicao': criar_condicao(operando1, operando2, operador),
+        'bloco_verdadeiro': bloco_verdadeiro,
+        'bloco_falso': bloco_falso
+    })
+
+def acao_laco(valores, linha):
+    bloco = valores.pop()
+    operador = valores.pop()
+    operando2 = valores.pop()
+    operando1 = valores.pop()
+    valores.append({
+        'tipo': 'LACO',
+        'condicao': criar_condicao(operando1, operando2, operador),
+        'bloco': bloco
+    })
+
+def acao_lista(valores, linha):
+    valores.append([])
+
+def acao_anexar(valores, linha):
+    expressao = valores.pop()
+    valores[-1].append(expressao)
+
+def acao_bloco_composto(valores, linha):
+    valores.append({
+        'tipo': 'BLOCO_COMPOSTO',
+        'expressoes': valores.pop()
+    })
+
+ACOES = {
+    '#expressao': acao_expressao,
+    '#res': acao_res,
+    '#armazenar': acao_armazenar,
+    '#recuperar': acao_recuperar,
+    '#armazenar_expressao': acao_armazenar_expressao,
+    '#operacao': acao_operacao,
+    '#comparacao': acao_comparacao,
+    '#decisao': acao_decisao,
+    '#laco': acao_laco,
+    '#lista': acao_lista,
+    '#anexar': acao_anexar,
+    '#bloco_composto': acao_bloco_composto
+}
+
+def folha_atribuida(valor, linha):
+    """converte um token de número/identificador em folha da árvore atribuída"""
+    if isinstance(valor, Token):
+        tipo = 'NUMERO' if valor.codigo == COD_NUMERO else 'IDENTIFICADOR'
+        return criar_no_atribuido(tipo, valor.valor, linha=linha)
+    return valor
+
+def condicao_atribuida(operando1, operando2, operador, linha):
+    """nó CONDICAO da árvore atribuída"""
+    return criar_no_atribuido('CONDICAO', operador.valor, [
+        folha_atribuida(operando1, linha),
+        folha_atribuida(operando2, linha)
+    ], linha)
+
+# ações da árvore: montam direto os nós finais (formato de limpar_arvore
+# aplicado a converter_derivacao_para_arvore), sem derivação intermediária
+def no_expressao(valores, linha):
+    valores.append(criar_no_atribuido('EXPRESSAO', None, [valores.pop()], linha))
+
+def no_res(valores, linha):
+    numero = valores.pop()
+    valores.append(criar_no_atribuido('COMANDO_RES', None, [folha_atribuida(numero, linha)], linha))
+
+def no_armazenar(valores, linha):
+    identificador = valores.pop()
+    numero = valores.pop()
+    valores.append(criar_no_atribuido('COMANDO_ARMAZENAR', None, [
+        folha_atribuida(numero, linha),
+        folha_atribuida(identificador, linha)
+    ], linha))
+
+def no_recuperar(valores, linha):
+    identificador = valores.pop()
+    valores.append(criar_no_atribuido('COMANDO_RECUPERAR', None, [folha_atribuida(identificador, linha)], linha))
+
+def no_armazenar_expressao(valores, linha):
+    identificador = valores.pop()
+    expressao = valores.pop()
+    valores.append(criar_no_atribuido('COMANDO_ARMAZENAR', None, [
+        expressao,
+        folha_atribuida(identificador, linha)
+    ], linha))
+
+def no_operacao(valores, linha):
+    operador = valores.pop()
+    operando2 = valores.pop()
+    operando1 = valores.pop()
+    valores.append(criar_no_atribuido('OPERACAO', operador.valor, [
+        folha_atribuida(operando1, linha),
+        folha_atribuida(operando2, linha)
+    ], linha))
+
+def no_comparacao(valores, linha):
+    operador = valores.pop()
+    operando2 = valores.pop()
+    operando1 = valores.pop()
+    valores.append(criar_no_atribuido('COMPARACAO', operador.valor, [
+        folha_atribuida(operando1, linha),
+        folha_atribuida(operando2, linha)
+    ], linha))
+
+def no_decisao(valores, linha):
+    bloco_falso = valores.pop()
+    bloco_verdadeiro = valores.pop()
+    operador = valores.pop()
+    operando2 = valores.pop()
+    operando1 = valores.pop()
+    valores.append(criar_no_atribuido('DECISAO', 'IF', [
+        condicao_atribuida(operando1, operando2, operador, linha),
+        bloco_verdadeiro,
+        bloco_falso
+    ], linha))
+
+def no_laco(valores, linha):
+    bloco = valores.pop()
+    operador = valores.pop()
+    operando2 = valores.pop()
+    operando1 = valores.pop()
+    valores.append(criar_no_atribuido('LACO', 'WHILE', [
+        condicao_atribuida(operando1, operando2, operador, linha),
+        bloco
+    ], linha))
+
+def no_bloco_composto(valores, linha):
+    valores.append(criar_no_atribuido('BLOCO_COMPOSTO', None, valores.pop(), linha))
+
+ACOES_ARVORE = {
+    '#expressao': no_expressao,
+    '#res': no_res,
+    '#armazenar': no_armazenar,
+    '#recuperar': no_recuperar,
+    '#armazenar_expressao': no_armazenar_expressao,
+    '#operacao': no_operacao,
+    '#comparacao': no_comparacao,
+    '#decisao': no_decisao,
+    '#laco': no_laco,
+    '#lista': acao_lista,
+    '#anexar': acao_anexar,
+    '#bloco_composto': no_bloco_composto
+}
+
+def erro_match(terminal, token):
+    """
+    erro de terminal inesperado, com a mensagem de match/match_valor
+    
+    Args:
+        terminal (str): terminal esperado
+        token (Token): token encontrado (None no fim)
+    
+    Returns:
+        ParserError: erro a levantar
+    """
+    if terminal not in CODIGO_POR_TERMINAL:
+        if token is None:
+            return ParserError(f"Esperado '{terminal}', encontrado fim de arquivo")
+        return ParserError(f"Esperado '{terminal}', encontrado '{token.valor}'", posicao=token.posicao)
+    
+    esperado = NOMES_TIPOS[CODIGO_POR_TERMINAL[terminal]]
+    if token is None:
+        return ParserError(f"Esperado {esperado}, encontrado fim de arquivo")
+    return ParserError(f"Esperado {esperado}, encontrado {token.tipo} ('{token.valor}')", posicao=token.posicao)
+
+def erro_sem_producao(contexto_erro, token):
+    """
+    erro de lookahead sem produção na tabela
+    
+    Args:
+        contexto_erro (str): contexto do não-terminal (CONTEXTO_ERRO)
+        token (Token): token encontrado (None no fim)
+    
+    Returns:
+        ParserError: erro a levantar
+    """
+    posicao = token.posicao if token is not None else None
+    
+    if contexto_erro == 'abre':
+        return erro_match('(', token)
+    
+    if contexto_erro == 'conteudo':
+        if token is None:
+            return ParserError("Token esperado, encontrado fim de arquivo")
+        return ParserError(f"Token inesperado no início de conteúdo: {token.tipo} ('{token.valor}')", posicao=posicao)
+    
+    if contexto_erro == 'operando':
+        if token is None:
+            return ParserError("Esperado operando, encontrado fim de arquivo")
+        return ParserError(f"Esperado operando, encontrado {token.tipo} ('{token.valor}')", posicao=posicao)
+    
+    if contexto_erro == 'operador':
+        return ParserError(f"Esperado operador, encontrado {token.tipo if token else 'EOF'}")
+    
+    if contexto_erro == 'operador_aritmetico':
+        if token is None:
+            return ParserError("Esperado operador, encontrado fim de arquivo")
+        return ParserError(f"Esperado operador aritmético, encontrado {token.tipo}", posicao=posicao)
+    
+    if contexto_erro == 'apos_relacional':
+        return ParserError(f"Token inesperado após operador relacional: {token}", posicao=posicao)
+    
+    if contexto_erro == 'apos_bloco':
+        return ParserError(f"Esperado IF ou WHILE após bloco, encontrado {token}", posicao=posicao)
+    
+    if contexto_erro == 'if_apos_blocos':
+        return ParserError(f"Esperado IF após dois blocos, encontrado {token}", posicao=posicao)
+    
+    return ParserError(f"Esperado '(' ou ')' em bloco composto, encontrado {token}", posicao=posicao)
+
+@lru_cache(maxsize=None)
+def obter_analisador_derivacao():
+    """
+    monta (uma vez por processo) a tabela densa e os corpos das produções
+    da gramática de derivação
+    
+    Returns:
+        dict: 'tabela' (TabelaLL1Densa), 'corpos' e 'corpos_arvore'
+              (símbolos de cada produção em ordem inversa, prontos para a
+              pilha, com as ações da derivação ou da árvore), 'inicio',
+              'erros', 'terminal_por_codigo' e 'terminal_por_palavra'
+    """
+    # ações não fazem parte da análise LL(1)
+    gramatica = {
+        nt: [[simbolo for simbolo in producao if not simbolo.startswith('#')] for producao in producoes]
+        for nt, producoes in GRAMATICA_DERIVACAO.items()
+    }
+    first = calcular_all_first(gramatica)
+    follow = calcular_all_follow(gramatica, first)
+    tabela = TabelaLL1Densa(gramatica, construir_tabela_ll1(gramatica, first, follow))
+    
+    def codificar(simbolo, acoes):
+        if simbolo in acoes:
+            return (SIMBOLO_ACAO, acoes[simbolo])
+        if simbolo in tabela.indice_nao_terminal:
+            return (SIMBOLO_NAO_TERMINAL, tabela.indice_nao_terminal[simbolo])
+        tipo = SIMBOLO_TERMINAL_VALOR if simbolo in TERMINAIS_COM_VALOR else SIMBOLO_TERMINAL
+        return (tipo, tabela.indice_terminal[simbolo])
+    
+    # tabela.producoes segue a ordem de GRAMATICA_DERIVACAO
+    def codificar_corpos(acoes):
+        return [
+            [codificar(simbolo, acoes) for simbolo in reversed(producao)]
+            for producoes in GRAMATICA_DERIVACAO.values()
+            for producao in producoes
+        ]
+    
+    terminal_por_codigo = [-1] * len(NOMES_TIPOS)
+    for codigo, terminal in TERMINAL_POR_CODIGO.items():
+        terminal_por_codigo[codigo] = tabela.indice_terminal[terminal]
+    
+    return {
+        'tabela': tabela,
+        'corpos': codificar_corpos(ACOES),
+        'corpos_arvore': codificar_corpos(ACOES_ARVORE),
+        'inicio': tabela.indice_nao_terminal['PROGRAMA'],
+        'erros': [CONTEXTO_ERRO[nt] for nt in tabela.nao_terminais],
+        'terminal_por_codigo': terminal_por_codigo,
+        'terminal_por_palavra': {
+            palavra: tabela.indice_terminal[palavra]
+            for palavra in ('RES', 'IF', 'WHILE')
+        },
+        'fim': tabela.indice_terminal['$']
+    }
+
+class BufferTokens:
+    """
+    janela de lookahead sobre uma fonte de tokens consumida sob demanda
+    
+    a fonte pode ser uma lista ou um iterador (por exemplo iterar_tokens,
+    que analisa a linha enquanto o parser avança); só os tokens espiados e
+    ainda não consumidos ficam guardados. se o primeiro token for um
+    dicionário, todos são convertidos para Token ao serem puxados
+    """
+    
+    __slots__ = ('iterador', 'janela')
+    
+    def __init__(self, tokens):
+        """
+        Args:
+            tokens: lista ou iterável de tokens (Token ou dicionários)
+        """
+        iterador = iter(tokens)
+        self.janela = deque()
+        
+        primeiro = next(iterador, None)
+        if primeiro is not None:
+            if not isinstance(primeiro, Token):
+                primeiro = como_token(primeiro)
+                iterador = map(como_token, iterador)
+            self.janela.append(primeiro)
+        
+        self.iterador = iterador
+    
+    def espiar(self, k=0):
+        """
+        devolve o k-ésimo token à frente sem consumi-lo
+        
+        Args:
+            k (int): distância a partir do token atual (0 = token atual)
+        
+        Returns:
+            Token: token na posição, ou None após o fim da fonte
+        """
+        janela = self.janela
+        while len(janela) <= k:
+            token = next(self.iterador, None)
+            if token is None:
+                return None
+            janela.append(token)
+        return janela[k]
+    
+    def consumir(self):
+        """
+        consome o token atual
+        
+        Returns:
+            Token: o novo token atual, ou None no fim da fonte
+        """
+        if self.janela:
+            self.janela.popleft()
+        else:
+            next(self.iterador, None)
+        return self.espiar()
+    
+    def restantes(self):
+        """
+        iterador com os tokens ainda não consumidos, a janela primeiro
+        
+        usado pelo laço do analisador, que só precisa do token atual (k=1)
+        e evita a chamada de consumir a cada token; o buffer não deve ser
+        usado enquanto o iterador estiver em uso
+        
+        Returns:
+            iterator: tokens restantes
+        """
+        return chain(self.janela, self.iterador)
+
+def parsear_iterativo(tokens):
+    """
+    análise sintática sem recursão, dirigida pela tabela LL(1) densa
+    
+    produz a mesma derivação e os mesmos erros de parsear, para qualquer
+    profundidade de aninhamento; a tabela é sempre a da gramática de
+    derivação fatorada deste módulo, por isso não há parâmetro de tabela
+    
+    Args:
+        tokens: lista de tokens (Token ou dicionários) ou iterável consumido
+                sob demanda, como iterar_tokens
+    
+    Returns:
+        dict: estrutura de derivação
+    
+    Raises:
+        ParserError: em caso de erro sintático
+    """
+    return {
+        'derivacao': executar_analise(tokens, 'corpos'),
+        'valido': True
+    }
+
+def parsear_arvore(tokens, linha=1, incluir_derivacao=False):
+    """
+    front-end fundido: análise sintática que monta direto a árvore atribuída
+    
+    o resultado é igual a gerar_arvore_atribuida(converter_derivacao_para_arvore(...))
+    sobre a derivação de parsear, mas sem derivação nem árvore intermediárias;
+    os atributos semânticos (tipo_inferido) são preenchidos depois no próprio nó
+    
+    Args:
+        tokens: lista de tokens (Token ou dicionários) ou iterável consumido
+                sob demanda, como iterar_tokens
+        linha (int): linha gravada nos nós
+        incluir_derivacao (bool): se True, também monta a derivação (para
+                                  despejo/depuração)
+    
+    Returns:
+        dict: {'arvore', 'derivacao' (None se não pedida), 'valido'}
+    
+    Raises:
+        ParserError: em caso de erro sintático
+        LexerError: erro léxico vindo de uma fonte sob demanda
+    """
+    if incluir_derivacao and not isinstance(tokens, list):
+        # duas passadas sobre os mesmos tokens
+        tokens = list(tokens)
+    
+    return {
+        'arvore': executar_analise(tokens, 'corpos_arvore', linha),
+        'derivacao': executar_analise(tokens, 'corpos') if incluir_derivacao else None,
+        'valido': True
+    }
+
+def executar_analise(tokens, chave_corpos, linha=1):
+    """
+    prepara os tokens e roda o analisador com o conjunto de ações escolhido
+    
+    Args:
+        tokens: lista ou iterável de tokens (Token ou dicionários)
+        chave_corpos (str): 'corpos' (derivação) ou 'corpos_arvore'
+        linha (int): linha repassada às ações
+    
+    Returns:
+        valor montado pelas ações para PROGRAMA
+    
+    Raises:
+        ParserError: em caso de erro sintático
+        LexerError: erro léxico vindo de uma fonte sob demanda
+    """
+    buffer = BufferTokens(tokens)
+    analisador = obter_analisador_derivacao()
+    
+    try:
+        if buffer.espiar() is None:
+            raise ParserError("Lista de tokens vazia")
+        return percorrer_tabela(buffer, analisador, analisador[chave_corpos], linha)
+    except (ParserError, LexerError):
+        raise
+    except Exception as e:
+        raise ParserError(f"Erro interno do parser: {str(e)}")
+
+def percorrer_tabela(buffer, analisador, corpos, linha):
+    """
+    laço do analisador: pilha de símbolos e pilha de valores
+    
+    Args:
+        buffer (BufferTokens): fonte de tokens, puxados um a um
+        analisador (dict): resultado de obter_analisador_derivacao
+        corpos (list): corpos das produções com as ações a executar
+        linha (int): linha repassada às ações
+    
+    Returns:
+        valor montado pelas ações para PROGRAMA
+    
+    Raises:
+        ParserError: em caso de erro sintático
+    """
+    tabela = analisador['tabela']
+    celulas = tabela.celulas
+    num_terminais = tabela.num_terminais
+    terminal_por_codigo = analisador['terminal_por_codigo']
+    terminal_por_palavra = analisador['terminal_por_palavra']
+    
+    def terminal_do_token(token):
+        if token is None:
+            return analisador['fim']
+        if token.codigo == COD_PALAVRA_RESERVADA:
+            return terminal_por_palavra.get(token.valor, -1)
+        return terminal_por_codigo[token.codigo]
+    
+    restantes = buffer.restantes()
+    token = next(restantes, None)
+    terminal = terminal_do_token(token)
+    
+    pilha = [(SIMBOLO_NAO_TERMINAL, analisador['inicio'])]
+    valores = []
+    
+    while pilha:
+        tipo, simbolo = pilha.pop()
+        
+        if tipo == SIMBOLO_NAO_TERMINAL:
+            producao = celulas[simbolo * num_terminais + terminal] if terminal >= 0 else SEM_PRODUCAO
+            if producao == SEM_PRODUCAO:
+                raise erro_sem_producao(analisador['erros'][simbolo], token)
+            pilha.extend(corpos[producao])
+        
+        elif tipo == SIMBOLO_ACAO:
+            simbolo(valores, linha)
+        
+        else:
+            if terminal != simbolo:
+                raise erro_match(tabela.terminais[simbolo], token)
+            if tipo == SIMBOLO_TERMINAL_VALOR:
+                valores.append(token)
+            
+            token = next(restantes, None)
+            terminal = terminal_do_token(token)
+    
+    if token is not None:
+        raise ParserError(
+            f"Tokens excedentes após expressão válida: '{token.valor}'",
+            posicao=token.posicao
+        )
+    
+    return valores.pop()
@@ -5,6 +5,9 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.visitantes import iterar_pre_ordem, iterar_pos_ordem, percorrer_com_visitantes, AlturaArvore
+from src.arvore_binaria import salvar_arvores_binario, eh_arquivo_arvore_binaria, carregar_arvore_binario
+
 class SyntaxTreeError(Exception):
     """exceção para erros na árvore sintática"""
     def __init__(self, mensagem):
@@ -51,12 +54,14 @@ def gerar_arvore(derivacao):
     except Exception as e:
         raise SyntaxTreeError(f"Erro ao gerar árvore: {str(e)}")
 
-def converter_derivacao_para_arvore(derivacao):
+def converter_derivacao_para_arvore(derivacao, criar=criar_no):
     """
     converte estrutura de derivação em árvore
     
     Args:
         derivacao (dict): estrutura da derivação
+        criar (callable): fábrica de nós com a assinatura de criar_no
+                          (ArenaArvore.criar_no monta a árvore compacta)
         
     Returns:
         dict: nó da árvore
@@ -66,68 +71,68 @@ def converter_derivacao_para_arvore(derivacao):
     if tipo == 'EXPRESSAO':
         # expressão tem conteúdo
         conteudo = derivacao.get('conteudo')
-        filho = converter_derivacao_para_arvore(conteudo) if conteudo else None
-        return criar_no('EXPRESSAO', None, [filho] if filho else [])
+        filho = converter_derivacao_para_arvore(conteudo, criar) if conteudo else None
+        return criar('EXPRESSAO', None, [filho] if filho else [])
     
     elif tipo == 'OPERACAO':
         # operação tem operador e dois operandos
         operador = derivacao.get('operador')
-        operando1 = converter_derivacao_para_arvore(derivacao.get('operando1'))
-        operando2 = converter_derivacao_para_arvore(derivacao.get('operando2'))
+        operando1 = converter_derivacao_para_arvore(derivacao.get('operando1'), criar)
+        operando2 = converter_derivacao_para_arvore(derivacao.get('operando2'), criar)
         
-        return criar_no('OPERACAO', operador, [operando1, operando2])
+        return criar('OPERACAO', operador, [operando1, operando2])
     
     elif tipo == 'COMPARACAO':
         # comparação relacional (sem IF/WHILE)
         operador = derivacao.get('operador')
-        operando1 = converter_derivacao_para_arvore(derivacao.get('operando1'))
-        operando2 = converter_derivacao_para_arvore(derivacao.get('operando2'))
+        operando1 = converter_derivacao_para_arvore(derivacao.get('operando1'), criar)
+        operando2 = converter_derivacao_para_arvore(derivacao.get('operando2'), criar)
         
-        return criar_no('COMPARACAO', operador, [operando1, operando2])
+        return criar('COMPARACAO', operador, [operando1, operando2])
     
     elif tipo == 'NUMERO':
         # número é folha
         valor = derivacao.get('valor')
-        return criar_no('NUMERO', valor, [])
+        return criar('NUMERO', valor, [])
     
     elif tipo == 'IDENTIFICADOR':
         # identificador é folha
         valor = derivacao.get('valor')
-        return criar_no('IDENTIFICADOR', valor, [])
+        return criar('IDENTIFICADOR', valor, [])
     
     elif tipo == 'COMANDO_ARMAZENAR':
         # comando de armazenar memória com número
         valor = derivacao.get('valor')
         identificador = derivacao.get('identificador')
         
-        filho_valor = criar_no('NUMERO', valor, [])
-        filho_id = criar_no('IDENTIFICADOR', identificador, [])
+        filho_valor = criar('NUMERO', valor, [])
+        filho_id = criar('IDENTIFICADOR', identificador, [])
         
-        return criar_no('COMANDO_ARMAZENAR', None, [filho_valor, filho_id])
+        return criar('COMANDO_ARMAZENAR', None, [filho_valor, filho_id])
     
     elif tipo == 'COMANDO_ARMAZENAR_EXPRESSAO':
         # comando de armazenar memória com expressão
         expressao = derivacao.get('expressao')
         identificador = derivacao.get('identificador')
         
-        filho_expressao = converter_derivacao_para_arvore(expressao)
-        filho_id = criar_no('IDENTIFICADOR', identificador, [])
+        filho_expressao = converter_derivacao_para_arvore(expressao, criar)
+        filho_id = criar('IDENTIFICADOR', identificador, [])
         
-        return criar_no('COMANDO_ARMAZENAR', None, [filho_expressao, filho_id])
+        return criar('COMANDO_ARMAZENAR', None, [filho_expressao, filho_id])
     
     elif tipo == 'COMANDO_RECUPERAR':
         # comando de recuperar memória
         identificador = derivacao.get('identificador')
-        filho_id = criar_no('IDENTIFICADOR', identificador, [])
+        filho_id = criar('IDENTIFICADOR', identificador, [])
         
-        return criar_no('COMANDO_RECUPERAR', None, [filho_id])
+        return criar('COMANDO_RECUPERAR', None, [filho_id])
     
     elif tipo == 'COMANDO_RES':
         # comando RES
         n = derivacao.get('n')
-        filho_n = criar_no('NUMERO', n, [])
+        filho_n = criar('NUMERO', n, [])
         
-        return criar_no('COMANDO_RES', None, [filho_n])
+        return criar('COMANDO_RES', None, [filho_n])
     
     elif tipo == 'DECISAO':
         # estrutura IF
@@ -135,21 +140,21 @@ def converter_derivacao_para_arvore(derivacao):
         bloco_v = derivacao.get('bloco_verdadeiro')
         bloco_f = derivacao.get('bloco_falso')
         
-        filho_cond = criar_no_condicao(condicao)
-        filho_v = converter_derivacao_para_arvore(bloco_v)
-        filho_f = converter_derivacao_para_arvore(bloco_f)
+        filho_cond = criar_no_condicao(condicao, criar)
+        filho_v = converter_derivacao_para_arvore(bloco_v, criar)
+        filho_f = converter_derivacao_para_arvore(bloco_f, criar)
         
-        return criar_no('DECISAO', 'IF', [filho_cond, filho_v, filho_f])
+        return criar('DECISAO', 'IF', [filho_cond, filho_v, filho_f])
     
     elif tipo == 'LACO':
         # estrutura WHILE
         condicao = derivacao.get('condicao')
         bloco = derivacao.get('bloco')
         
-        filho_cond = criar_no_condicao(condicao)
-        filho_bloco = converter_derivacao_para_arvore(bloco)
+        filho_cond = criar_no_condicao(condicao, criar)
+        filho_bloco = converter_derivacao_para_arvore(bloco, criar)
         
-        return criar_no('LACO', 'WHILE', [filho_cond, filho_bloco])
+        return criar('LACO', 'WHILE', [filho_cond, filho_bloco])
     
     elif tipo == 'BLOCO_COMPOSTO':
         # bloco com múltiplas expressões: ((expr1) (expr2) ...)
@@ -158,29 +163,30 @@ def converter_derivacao_para_arvore(derivacao):
         # converter cada expressão para árvore
         filhos = []
         for expr in expressoes:
-            filho = converter_derivacao_para_arvore(expr)
+            filho = converter_derivacao_para_arvore(expr, criar)
             filhos.append(filho)
         
-        return criar_no('BLOCO_COMPOSTO', None, filhos)
+        return criar('BLOCO_COMPOSTO', None, filhos)
     
     else:
         raise SyntaxTreeError(f"Tipo desconhecido: {tipo}")
 
-def criar_no_condicao(condicao):
+def criar_no_condicao(condicao, criar=criar_no):
     """
     cria nó para condição
     
     Args:
         condicao (dict): estrutura da condição
+        criar (callable): fábrica de nós com a assinatura de criar_no
         
     Returns:
         dict: nó da condição
     """
     operador = condicao.get('operador')
-    operando1 = converter_derivacao_para_arvore(condicao.get('operando1'))
-    operando2 = converter_derivacao_para_arvore(condicao.get('operando2'))
+    operando1 = converter_derivacao_para_arvore(condicao.get('operando1'), criar)
+    operando2 = converter_derivacao_para_arvore(condicao.get('operando2'), criar)
     
-    return criar_no('CONDICAO', operador, [operando1, operando2])
+    return criar('CONDICAO', operador, [operando1, operando2])
 
 def imprimir_arvore(raiz, nivel=0, prefixo=""):
     """
@@ -219,31 +225,45 @@ def imprimir_arvore(raiz, nivel=0, prefixo=""):
     
     return resultado
 
-def salvar_arvore(raiz, nome_arquivo="arvore.json"):
+def salvar_arvore(raiz, nome_arquivo="arvore.json", formato='json'):
     """
-    salva árvore em formato JSON
+    salva árvore em formato JSON ou no formato binário (arvore_binaria)
     
     Args:
         raiz (dict): nó raiz
         nome_arquivo (str): nome do arquivo
+        formato (str): 'json' (legível, com indentação) ou 'binario'
+                       (compacto; leitura sob demanda com carregar_arvores_binario)
     """
+    if formato not in ('json', 'binario'):
+        raise SyntaxTreeError(f"Formato desconhecido: {formato}")
+    
     try:
+        if formato == 'binario':
+            salvar_arvores_binario([raiz], nome_arquivo)
+            return
+        
         with open(nome_arquivo, 'w', encoding='utf-8') as arquivo:
-            json.dump(raiz, arquivo, indent=2, ensure_ascii=False)
+            # nós compactos (arvore_compacta) são gravados como dicionários
+            json.dump(raiz, arquivo, indent=2, ensure_ascii=False, default=lambda no: no.como_dicionario())
     except Exception as e:
         raise SyntaxTreeError(f"Erro ao salvar árvore: {str(e)}")
 
 def carregar_arvore(nome_arquivo):
     """
-    carrega árvore de arquivo JSON
+    carrega árvore de arquivo JSON ou binário (detectado pelo cabeçalho)
     
     Args:
         nome_arquivo (str): nome do arquivo
         
     Returns:
-        dict: nó raiz
+        dict: nó raiz (o formato binário é lido por inteiro e o arquivo
+              fechado; a leitura sob demanda fica em carregar_arvores_binario)
     """
     try:
+        if eh_arquivo_arvore_binaria(nome_arquivo):
+            return carregar_arvore_binario(nome_arquivo)
+        
         with open(nome_arquivo, 'r', encoding='utf-8') as arquivo:
             return json.load(arquivo)
     except Exception as e:
@@ -251,39 +271,25 @@ def carregar_arvore(nome_arquivo):
 
 def percorrer_pre_ordem(raiz, funcao):
     """
-    percorre árvore em pré-ordem aplicando função
+    percorre árvore em pré-ordem aplicando função (sem recursão)
     
     Args:
         raiz (dict): nó raiz
         funcao (callable): função a aplicar em cada nó
     """
-    if not raiz:
-        return
-    
-    # visitar nó atual
-    funcao(raiz)
-    
-    # visitar filhos
-    for filho in raiz.get('filhos', []):
-        percorrer_pre_ordem(filho, funcao)
+    for no, _ in iterar_pre_ordem(raiz):
+        funcao(no)
 
 def percorrer_pos_ordem(raiz, funcao):
     """
-    percorre árvore em pós-ordem aplicando função
+    percorre árvore em pós-ordem aplicando função (sem recursão)
     
     Args:
         raiz (dict): nó raiz
         funcao (callable): função a aplicar em cada nó
     """
-    if not raiz:
-        return
-    
-    # visitar filhos primeiro
-    for filho in raiz.get('filhos', []):
-        percorrer_pos_ordem(filho, funcao)
-    
-    # visitar nó atual
-    funcao(raiz)
+    for no, _ in iterar_pos_ordem(raiz):
+        funcao(no)
 
 def contar_nos(raiz):
     """
@@ -295,15 +301,7 @@ def contar_nos(raiz):
     Returns:
         int: número de nós
     """
-    if not raiz:
-        return 0
-    
-    contador = 1  # conta o nó atual
-    
-    for filho in raiz.get('filhos', []):
-        contador += contar_nos(filho)
-    
-    return contador
+    return sum(1 for _ in iterar_pre_ordem(raiz))
 
 def calcular_altura(raiz):
     """
@@ -315,12 +313,8 @@ def calcular_altura(raiz):
     Returns:
         int: altura da árvore
     """
-    if not raiz or not raiz.get('filhos'):
-        return 0
-    
-    alturas_filhos = [calcular_altura(filho) for filho in raiz['filhos']]
-    
-    return 1 + max(alturas_filhos) if alturas_filhos else 0
+    altura, = percorrer_com_visitantes(raiz, [AlturaArvore()])
+    return altura.resultado()
 
 if __name__ == '__main__':
     # teste da árvore sintática
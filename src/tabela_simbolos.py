@@ -1,4 +1,9 @@
 # tabela de símbolos para gerenciamento de memórias e variáveis
+# 'simbolos' guarda só o símbolo visível de cada nome; declarações em escopos
+# internos sombreiam as externas e ficam num registro de desfazer, então sair
+# de um escopo custa o número de símbolos declarados nele (e não o total da
+# tabela). cada símbolo novo recebe um id inteiro denso (0, 1, 2, ...) que as
+# fases seguintes podem usar como índice de lista
 
 class TabelaSimbolosError(Exception):
     """exceção para erros na tabela de símbolos"""
@@ -17,6 +22,12 @@ def inicializar_tabela_simbolos():
         'simbolos': {},
         'escopo_atual': 0,
         'contador_escopos': 0,
+        # (tamanho do registro de desfazer, escopo anterior) por escopo aberto
+        'pilha_escopos': [],
+        # (nome, símbolo sombreado ou None) das declarações em escopos internos
+        'desfazer': [],
+        # todos os símbolos já declarados, indexados pelo id
+        'simbolos_por_id': [],
         'historico_resultados': []
     }
 
@@ -47,15 +58,33 @@ def adicionar_simbolo(tabela, nome, tipo, valor=None, linha=None):
     if not nome.isupper() or not nome.isalpha():
         raise TabelaSimbolosError(f"Nome de símbolo inválido: {nome}")
     
+    escopo = tabela['escopo_atual']
+    anterior = tabela['simbolos'].get(nome)
+    
+    if anterior is not None and anterior['escopo'] == escopo:
+        # redeclaração no mesmo escopo: mesmo símbolo, mesmo id
+        id_simbolo = anterior['id']
+    else:
+        id_simbolo = len(tabela['simbolos_por_id'])
+        if tabela['pilha_escopos']:
+            # escopo interno: guardar o que for sombreado para sair_escopo
+            tabela['desfazer'].append((nome, anterior))
+    
     simbolo = {
         'nome': nome,
         'tipo': tipo,
         'inicializada': valor is not None,
         'valor': valor,
         'linha_declaracao': linha,
-        'escopo': tabela['escopo_atual']
+        'escopo': escopo,
+        'id': id_simbolo
     }
     
+    if id_simbolo == len(tabela['simbolos_por_id']):
+        tabela['simbolos_por_id'].append(simbolo)
+    else:
+        tabela['simbolos_por_id'][id_simbolo] = simbolo
+    
     tabela['simbolos'][nome] = simbolo
     return True
 
@@ -147,6 +176,56 @@ def obter_tipo_simbolo(tabela, nome):
     
     return tabela['simbolos'][nome]['tipo']
 
+def obter_id_simbolo(tabela, nome):
+    """
+    obtém o id denso do símbolo visível com esse nome
+    
+    Args:
+        tabela (dict): tabela de símbolos
+        nome (str): nome do símbolo
+        
+    Returns:
+        int: id do símbolo, de 0 a total_ids_simbolos(tabela) - 1
+        
+    Raises:
+        TabelaSimbolosError: se símbolo não existe
+    """
+    if not simbolo_existe(tabela, nome):
+        raise TabelaSimbolosError(f"Símbolo '{nome}' não existe na tabela")
+    
+    return tabela['simbolos'][nome]['id']
+
+def buscar_simbolo_por_id(tabela, id_simbolo):
+    """
+    busca símbolo pelo id, inclusive de escopos já encerrados
+    
+    Args:
+        tabela (dict): tabela de símbolos
+        id_simbolo (int): id do símbolo
+        
+    Returns:
+        dict: informações do símbolo
+        
+    Raises:
+        TabelaSimbolosError: se id inválido
+    """
+    if not 0 <= id_simbolo < len(tabela['simbolos_por_id']):
+        raise TabelaSimbolosError(f"Id de símbolo inválido: {id_simbolo}")
+    
+    return tabela['simbolos_por_id'][id_simbolo]
+
+def total_ids_simbolos(tabela):
+    """
+    quantidade de ids já distribuídos (tamanho de uma lista indexada por id)
+    
+    Args:
+        tabela (dict): tabela de símbolos
+        
+    Returns:
+        int: número de símbolos declarados
+    """
+    return len(tabela['simbolos_por_id'])
+
 def adicionar_resultado_historico(tabela, tipo, valor=None):
     """
     adiciona resultado ao histórico
@@ -195,27 +274,34 @@ def entrar_escopo(tabela):
     Args:
         tabela (dict): tabela de símbolos
     """
+    tabela['pilha_escopos'].append((len(tabela['desfazer']), tabela['escopo_atual']))
     tabela['contador_escopos'] += 1
     tabela['escopo_atual'] = tabela['contador_escopos']
 
 def sair_escopo(tabela):
     """
-    sai do escopo atual
+    sai do escopo atual, voltando ao escopo que o abriu
+    
+    os símbolos declarados no escopo são removidos e os que eles sombreavam
+    voltam a ser visíveis; os ids continuam válidos em buscar_simbolo_por_id
     
     Args:
         tabela (dict): tabela de símbolos
     """
-    if tabela['escopo_atual'] > 0:
-        # remove símbolos do escopo atual
-        simbolos_remover = [
-            nome for nome, info in tabela['simbolos'].items()
-            if info['escopo'] == tabela['escopo_atual']
-        ]
+    if tabela['pilha_escopos']:
+        tamanho, escopo_anterior = tabela['pilha_escopos'].pop()
+        simbolos = tabela['simbolos']
+        desfazer = tabela['desfazer']
         
-        for nome in simbolos_remover:
-            del tabela['simbolos'][nome]
+        # desfaz as declarações do escopo, da mais recente para a mais antiga
+        while len(desfazer) > tamanho:
+            nome, anterior = desfazer.pop()
+            if anterior is None:
+                del simbolos[nome]
+            else:
+                simbolos[nome] = anterior
         
-        tabela['escopo_atual'] -= 1
+        tabela['escopo_atual'] = escopo_anterior
 
 def listar_simbolos(tabela):
     """
@@ -324,6 +410,9 @@ def validar_tabela(tabela):
         
         if 'escopo' not in info:
             erros.append(f"Símbolo '{nome}' sem escopo")
+        
+        if 'id' not in info:
+            erros.append(f"Símbolo '{nome}' sem id")
     
     return len(erros) == 0, erros
 
@@ -2,11 +2,27 @@
 
 import sys
 import os
+import mmap
+import struct
+from bisect import bisect_left
+from itertools import islice
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.token_types import *
 from src.lexer import parse_expressao
 
+# formato binário de tokens (little-endian):
+#   cabeçalho: magic, versão, reservado, nº de strings, nº de expressões, nº de tokens
+#   tabela de strings: (nº de strings + 1) deslocamentos uint32 + textos utf-8,
+#                      alinhada em 4 bytes
+#   expressões: (nº de expressões + 1) índices uint32 do primeiro token de cada uma
+#   tokens: registros de tamanho fixo (código, índice da string, posição ou -1)
+MAGICO_TOKENS = b'RPNT'
+VERSAO_FORMATO_BINARIO = 1
+CABECALHO_BINARIO = struct.Struct('<4sHHIII')
+REGISTRO_TOKEN = struct.Struct('<BxxxIi')
+SEM_POSICAO = -1
+
 class TokenReaderError(Exception):
     """exceção para erros na leitura de tokens"""
     def __init__(self, mensagem, linha=None):
@@ -15,12 +31,13 @@ class TokenReaderError(Exception):
         contexto = f" [linha {linha}]" if linha else ""
         super().__init__(f"Erro ao ler tokens{contexto}: {mensagem}")
 
-def ler_tokens(nome_arquivo):
+def ler_tokens(nome_arquivo, trabalhadores=1):
     """
     lê arquivo de tokens salvos ou expressões RPN
     
     Args:
         nome_arquivo (str): nome do arquivo
+        trabalhadores (int): processos usados para tokenizar expressões
         
     Returns:
         list: lista de listas de tokens (uma lista por linha/expressão)
@@ -32,6 +49,9 @@ def ler_tokens(nome_arquivo):
         raise TokenReaderError(f"Arquivo não encontrado: {nome_arquivo}")
     
     try:
+        if eh_arquivo_tokens_binario(nome_arquivo):
+            return ler_arquivo_binario(nome_arquivo)
+        
         with open(nome_arquivo, 'r') as arquivo:
             linhas = arquivo.readlines()
         
@@ -39,11 +59,24 @@ def ler_tokens(nome_arquivo):
         if eh_arquivo_tokens_salvos(linhas):
             return ler_formato_tokens(linhas)
         else:
-            return ler_formato_expressoes(linhas)
+            return ler_formato_expressoes(linhas, trabalhadores)
             
     except Exception as e:
         raise TokenReaderError(f"Erro ao ler arquivo: {str(e)}")
 
+def eh_arquivo_tokens_binario(nome_arquivo):
+    """
+    verifica pelo magic do cabeçalho se o arquivo está no formato binário
+    
+    Args:
+        nome_arquivo (str): nome do arquivo
+    
+    Returns:
+        bool: True se o arquivo começa com MAGICO_TOKENS
+    """
+    with open(nome_arquivo, 'rb') as arquivo:
+        return arquivo.read(len(MAGICO_TOKENS)) == MAGICO_TOKENS
+
 def eh_arquivo_tokens_salvos(linhas):
     """
     verifica se arquivo está no formato de tokens salvos
@@ -83,7 +116,7 @@ def ler_formato_tokens(linhas):
         if linha.startswith("Token"):
             # novo token
             if token_atual:
-                tokens_expressao_atual.append(token_atual)
+                tokens_expressao_atual.append(como_token(token_atual))
                 token_atual = {}
             continue
         
@@ -101,7 +134,7 @@ def ler_formato_tokens(linhas):
     
     # adicionar último token
     if token_atual:
-        tokens_expressao_atual.append(token_atual)
+        tokens_expressao_atual.append(como_token(token_atual))
     
     # adicionar expressão
     if tokens_expressao_atual:
@@ -109,18 +142,32 @@ def ler_formato_tokens(linhas):
     
     return tokens_por_expressao
 
-def ler_formato_expressoes(linhas):
+def ler_formato_expressoes(linhas, trabalhadores=1, tamanho_lote=None):
     """
     lê arquivo com expressões RPN (uma por linha)
     
     Args:
         linhas (list): linhas do arquivo
+        trabalhadores (int): processos usados na tokenização (None = número
+                             de núcleos); com 1 tudo roda no processo atual
+        tamanho_lote (int): linhas por tarefa na tokenização paralela
         
     Returns:
         list: lista de listas de tokens
     """
     tokens_por_expressao = []
     
+    if trabalhadores is None or trabalhadores > 1:
+        # import local: tokenizacao_paralela depende deste módulo
+        from src.tokenizacao_paralela import tokenizar_paralelo, TAMANHO_LOTE_PADRAO
+        
+        for lote in tokenizar_paralelo(linhas, trabalhadores, tamanho_lote or TAMANHO_LOTE_PADRAO):
+            if lote['erro'] is not None:
+                raise TokenReaderError(f"Erro ao tokenizar expressão: {str(lote['erro'])}", linha=lote['linha'])
+            tokens_por_expressao.append(lote['tokens'])
+        
+        return tokens_por_expressao
+    
     for i, linha in enumerate(linhas, 1):
         linha = linha.strip()
         
@@ -138,6 +185,402 @@ def ler_formato_expressoes(linhas):
     
     return tokens_por_expressao
 
+def alinhar(deslocamento):
+    """arredonda o deslocamento para o próximo múltiplo de 4"""
+    return (deslocamento + 3) & ~3
+
+def serializar_tokens_binario(tokens_lista):
+    """
+    serializa listas de tokens no formato binário
+    
+    cada valor distinto aparece uma única vez na tabela de strings; os
+    registros de token só guardam o índice
+    
+    Args:
+        tokens_lista (list): lista de listas de tokens (Token ou dicionário)
+    
+    Returns:
+        bytes: conteúdo do arquivo binário
+    """
+    indices_strings = {}
+    textos = []
+    inicios = [0]
+    registros = bytearray()
+    
+    for tokens in tokens_lista:
+        for token in tokens:
+            token = como_token(token)
+            texto = str(token.valor)
+            indice = indices_strings.get(texto)
+            if indice is None:
+                indice = indices_strings[texto] = len(textos)
+                textos.append(texto.encode('utf-8'))
+            
+            posicao = SEM_POSICAO if token.posicao is None else token.posicao
+            registros += REGISTRO_TOKEN.pack(token.codigo, indice, posicao)
+        inicios.append(len(registros) // REGISTRO_TOKEN.size)
+    
+    deslocamentos = [0]
+    for texto in textos:
+        deslocamentos.append(deslocamentos[-1] + len(texto))
+    
+    conteudo = bytearray(CABECALHO_BINARIO.pack(
+        MAGICO_TOKENS, VERSAO_FORMATO_BINARIO, 0,
+        len(textos), len(tokens_lista), inicios[-1]
+    ))
+    conteudo += struct.pack(f'<{len(deslocamentos)}I', *deslocamentos)
+    conteudo += b''.join(textos)
+    conteudo += bytes(alinhar(len(conteudo)) - len(conteudo))
+    conteudo += struct.pack(f'<{len(inicios)}I', *inicios)
+    conteudo += registros
+    
+    return bytes(conteudo)
+
+def salvar_tokens_binario(tokens_lista, nome_arquivo="tokens.bin"):
+    """
+    salva tokens no formato binário
+    
+    Args:
+        tokens_lista (list): lista de listas de tokens
+        nome_arquivo (str): nome do arquivo de saída
+    """
+    try:
+        conteudo = serializar_tokens_binario(tokens_lista)
+        with open(nome_arquivo, 'wb') as arquivo:
+            arquivo.write(conteudo)
+    except Exception as e:
+        raise TokenReaderError(f"Erro ao salvar tokens: {str(e)}")
+
+def ler_indice_binario(visao):
+    """
+    lê cabeçalho, tabela de strings e índice de expressões do formato binário
+    
+    Args:
+        visao (memoryview): conteúdo do arquivo
+    
+    Returns:
+        dict: 'textos', 'inicios' (primeiro token de cada expressão, com o
+              total no fim) e 'inicio_registros' (byte do primeiro registro)
+    
+    Raises:
+        TokenReaderError: se o cabeçalho ou o conteúdo for inválido
+    """
+    try:
+        magico, versao, _, num_strings, num_expressoes, num_tokens = CABECALHO_BINARIO.unpack_from(visao, 0)
+    except struct.error:
+        raise TokenReaderError("Arquivo binário truncado: cabeçalho incompleto")
+    
+    if magico != MAGICO_TOKENS:
+        raise TokenReaderError("Arquivo binário sem o cabeçalho de tokens")
+    if versao != VERSAO_FORMATO_BINARIO:
+        raise TokenReaderError(f"Versão do formato binário não suportada: {versao}")
+    
+    try:
+        inicio = CABECALHO_BINARIO.size
+        deslocamentos = struct.unpack_from(f'<{num_strings + 1}I', visao, inicio)
+        inicio_textos = inicio + 4 * (num_strings + 1)
+        
+        textos = [
+            str(visao[inicio_textos + deslocamentos[i]:inicio_textos + deslocamentos[i + 1]], 'utf-8')
+            for i in range(num_strings)
+        ]
+        
+        inicio = alinhar(inicio_textos + deslocamentos[-1])
+        inicios = struct.unpack_from(f'<{num_expressoes + 1}I', visao, inicio)
+        inicio += 4 * (num_expressoes + 1)
+    except (struct.error, UnicodeDecodeError) as e:
+        raise TokenReaderError(f"Arquivo binário corrompido: {str(e)}")
+    
+    if inicio + num_tokens * REGISTRO_TOKEN.size > len(visao) or inicios[-1] != num_tokens:
+        raise TokenReaderError("Arquivo binário truncado: registros de tokens incompletos")
+    
+    return {
+        'textos': textos,
+        'inicios': inicios,
+        'inicio_registros': inicio
+    }
+
+def criar_conversor_valores(textos):
+    """
+    cria a função que converte (código, índice da string) no valor do token
+    
+    cada string é convertida uma vez: números decodificados, demais internados.
+    o código do tipo vem do arquivo e é validado aqui, na carga, para que um
+    arquivo corrompido não gere tokens sem tipo
+    
+    Args:
+        textos (list): tabela de strings do arquivo
+    
+    Returns:
+        function: valor_token(codigo, indice), que levanta TokenReaderError
+                  para código de tipo desconhecido
+    """
+    internados = [sys.intern(texto) for texto in textos]
+    numeros = {}
+    num_tipos = len(NOMES_TIPOS)
+    
+    def valor_token(codigo, indice):
+        if codigo >= num_tipos:
+            raise TokenReaderError(f"Arquivo binário corrompido: código de tipo inválido {codigo}")
+        if codigo != COD_NUMERO:
+            return internados[indice]
+        numero = numeros.get(indice)
+        if numero is None:
+            numero = numeros[indice] = decodificar_numero(textos[indice])
+        return numero
+    
+    return valor_token
+
+def ler_formato_binario(dados):
+    """
+    lê tokens do formato binário
+    
+    Args:
+        dados: bytes, memoryview ou mmap com o conteúdo do arquivo
+    
+    Returns:
+        list: lista de listas de tokens
+    
+    Raises:
+        TokenReaderError: se o cabeçalho ou o conteúdo for inválido
+    """
+    with memoryview(dados) as visao:
+        cabecalho = ler_indice_binario(visao)
+        inicios = cabecalho['inicios']
+        valor_token = criar_conversor_valores(cabecalho['textos'])
+        
+        # os registros são lidos sob demanda, sem materializar a lista de tuplas
+        inicio = cabecalho['inicio_registros']
+        registros = REGISTRO_TOKEN.iter_unpack(visao[inicio:inicio + inicios[-1] * REGISTRO_TOKEN.size])
+        tokens_por_expressao = []
+        try:
+            for i in range(len(inicios) - 1):
+                tokens_por_expressao.append([
+                    Token(codigo, valor_token(codigo, indice), None if posicao == SEM_POSICAO else posicao)
+                    for codigo, indice, posicao in islice(registros, inicios[i + 1] - inicios[i])
+                ])
+        except IndexError:
+            raise TokenReaderError("Arquivo binário corrompido: índice de string inválido")
+        finally:
+            del registros
+    
+    return tokens_por_expressao
+
+def ler_arquivo_binario(nome_arquivo):
+    """
+    lê um arquivo de tokens binário mapeado em memória (mmap)
+    
+    Args:
+        nome_arquivo (str): nome do arquivo
+    
+    Returns:
+        list: lista de listas de tokens
+    """
+    with open(nome_arquivo, 'rb') as arquivo:
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            return ler_formato_binario(mapa)
+
+class LeitorTokens:
+    """
+    leitor preguiçoso de arquivos de tokens ou expressões
+    
+    cada iteração devolve (numero_linha, tokens) ou, se a linha tem erro,
+    (numero_linha, TokenReaderError); o erro de uma linha não interrompe as
+    seguintes. o arquivo é lido sob demanda, então parar a iteração no meio
+    não lê o resto do arquivo.
+    
+    o atributo deslocamento guarda o byte onde começa a próxima linha (ou a
+    próxima expressão no formato binário) e pode ser usado para retomar a
+    leitura em outro LeitorTokens. no formato binário, numero_linha é o
+    número da expressão
+    """
+    
+    def __init__(self, nome_arquivo, deslocamento=0, linha_inicial=1):
+        """
+        Args:
+            nome_arquivo (str): nome do arquivo
+            deslocamento (int): byte onde a leitura começa (início de uma linha)
+            linha_inicial (int): número da linha que começa em deslocamento
+                                 (ignorado no formato binário)
+        
+        Raises:
+            TokenReaderError: se o arquivo não existe ou o cabeçalho binário é inválido
+        """
+        if not os.path.exists(nome_arquivo):
+            raise TokenReaderError(f"Arquivo não encontrado: {nome_arquivo}")
+        
+        self.nome_arquivo = nome_arquivo
+        self.deslocamento = deslocamento
+        self.numero_linha = linha_inicial - 1
+        self.binario = eh_arquivo_tokens_binario(nome_arquivo)
+        self.arquivo = open(nome_arquivo, 'rb')
+        self.mapa = None
+        self.visao = None
+        
+        # erro na abertura (cabeçalho inválido, mmap, decodificação) não
+        # pode deixar o arquivo nem o mapa abertos
+        try:
+            if self.binario:
+                self.abrir_binario()
+            else:
+                self.abrir_texto()
+        except Exception:
+            self.fechar()
+            raise
+    
+    def abrir_binario(self):
+        """mapeia o arquivo binário e posiciona na expressão do deslocamento"""
+        self.mapa = mmap.mmap(self.arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self.visao = memoryview(self.mapa)
+        cabecalho = ler_indice_binario(self.visao)
+        
+        self.inicios = cabecalho['inicios']
+        self.inicio_registros = cabecalho['inicio_registros']
+        self.valor_token = criar_conversor_valores(cabecalho['textos'])
+        
+        # deslocamento 0 ou dentro do cabeçalho: começa na primeira expressão
+        indice_token = max(0, (self.deslocamento - self.inicio_registros) // REGISTRO_TOKEN.size)
+        self.numero_linha = bisect_left(self.inicios, indice_token, 0, len(self.inicios) - 1)
+        self.deslocamento = self.inicio_registros + self.inicios[self.numero_linha] * REGISTRO_TOKEN.size
+    
+    def abrir_texto(self):
+        """posiciona o arquivo de texto e detecta o formato de tokens salvos"""
+        self.tokens_salvos = None
+        if self.deslocamento == 0:
+            linhas = [self.arquivo.readline().decode('utf-8', 'replace') for _ in range(10)]
+            if eh_arquivo_tokens_salvos(linhas):
+                # formato verboso: o arquivo inteiro é uma única expressão
+                self.arquivo.seek(0)
+                self.tokens_salvos = ler_formato_tokens(self.arquivo.read().decode('utf-8').splitlines())
+        self.arquivo.seek(self.deslocamento)
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        if self.binario:
+            return self.proxima_expressao_binaria()
+        if self.tokens_salvos is not None:
+            return self.proxima_expressao_salva()
+        
+        while True:
+            linha = self.ler_linha()
+            if linha is None:
+                raise StopIteration
+            
+            try:
+                linha = linha.decode('utf-8').strip()
+            except UnicodeDecodeError as e:
+                return self.numero_linha, TokenReaderError(f"Erro ao decodificar linha: {str(e)}", linha=self.numero_linha)
+            
+            # pular linhas vazias ou comentários
+            if not linha or linha.startswith('#'):
+                continue
+            
+            try:
+                return self.numero_linha, parse_expressao(linha)
+            except Exception as e:
+                return self.numero_linha, TokenReaderError(f"Erro ao tokenizar expressão: {str(e)}", linha=self.numero_linha)
+    
+    def ler_linha(self):
+        """
+        lê a próxima linha crua do arquivo de texto, avançando contadores
+        
+        Returns:
+            bytes: linha lida, ou None no fim do arquivo (o arquivo é fechado)
+        """
+        linha = self.arquivo.readline() if not self.arquivo.closed else b''
+        if not linha:
+            self.fechar()
+            return None
+        
+        self.deslocamento += len(linha)
+        self.numero_linha += 1
+        return linha
+    
+    def proxima_expressao_binaria(self):
+        """lê os registros da próxima expressão do arquivo binário"""
+        if self.visao is None or self.numero_linha >= len(self.inicios) - 1:
+            self.fechar()
+            raise StopIteration
+        
+        fim = self.inicio_registros + self.inicios[self.numero_linha + 1] * REGISTRO_TOKEN.size
+        self.numero_linha += 1
+        try:
+            tokens = [
+                Token(codigo, self.valor_token(codigo, indice), None if posicao == SEM_POSICAO else posicao)
+                for codigo, indice, posicao in REGISTRO_TOKEN.iter_unpack(self.visao[self.deslocamento:fim])
+            ]
+        except IndexError:
+            tokens = TokenReaderError("Arquivo binário corrompido: índice de string inválido", linha=self.numero_linha)
+        except TokenReaderError as e:
+            tokens = TokenReaderError(e.mensagem, linha=self.numero_linha)
+        
+        self.deslocamento = fim
+        return self.numero_linha, tokens
+    
+    def proxima_expressao_salva(self):
+        """devolve a expressão do formato de tokens salvos uma única vez"""
+        if self.numero_linha > 0 or not self.tokens_salvos:
+            self.fechar()
+            raise StopIteration
+        
+        self.numero_linha = 1
+        return 1, self.tokens_salvos[0]
+    
+    def pular(self, quantidade):
+        """
+        avança sobre expressões sem tokenizá-las
+        
+        Args:
+            quantidade (int): número de expressões a pular
+        
+        Returns:
+            int: número de expressões efetivamente puladas
+        """
+        puladas = 0
+        
+        if self.binario:
+            if self.visao is not None:
+                puladas = min(quantidade, len(self.inicios) - 1 - self.numero_linha)
+                self.numero_linha += puladas
+                self.deslocamento = self.inicio_registros + self.inicios[self.numero_linha] * REGISTRO_TOKEN.size
+            return puladas
+        
+        if self.tokens_salvos is not None:
+            for _ in range(quantidade):
+                if next(self, None) is None:
+                    break
+                puladas += 1
+            return puladas
+        
+        while puladas < quantidade:
+            linha = self.ler_linha()
+            if linha is None:
+                break
+            linha = linha.strip()
+            if linha and not linha.startswith(b'#'):
+                puladas += 1
+        
+        return puladas
+    
+    def fechar(self):
+        """libera o arquivo (e o mmap no formato binário)"""
+        if self.visao is not None:
+            self.visao.release()
+            self.visao = None
+        if self.mapa is not None:
+            self.mapa.close()
+            self.mapa = None
+        self.arquivo.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *excecao):
+        self.fechar()
+        return False
+
 def validar_tokens(tokens_lista):
     """
     validação básica da lista de tokens
@@ -164,15 +607,19 @@ def validar_tokens(tokens_lista):
         # verificar balanceamento de parênteses
         contador = 0
         for token in tokens:
-            if not isinstance(token, dict):
-                raise TokenReaderError("Token inválido: deve ser dicionário")
-            
-            if 'tipo' not in token or 'valor' not in token:
-                raise TokenReaderError("Token sem tipo ou valor")
+            if isinstance(token, dict):
+                if 'tipo' not in token or 'valor' not in token:
+                    raise TokenReaderError("Token sem tipo ou valor")
+                # tipos desconhecidos são aceitos, como antes dos códigos
+                codigo = CODIGOS_TIPOS.get(token['tipo'])
+            elif isinstance(token, Token):
+                codigo = token.codigo
+            else:
+                raise TokenReaderError("Token inválido: deve ser Token ou dicionário")
             
-            if token['tipo'] == PARENTESE_ABRE:
+            if codigo == COD_PARENTESE_ABRE:
                 contador += 1
-            elif token['tipo'] == PARENTESE_FECHA:
+            elif codigo == COD_PARENTESE_FECHA:
                 contador -= 1
         
         if contador != 0:
@@ -1,5 +1,7 @@
 # definições de tipos de tokens e funções auxiliares para o analisador léxico
 
+from functools import lru_cache
+
 # constantes para tipos de tokens
 NUMERO = "NUMERO"
 OPERADOR = "OPERADOR"
@@ -14,25 +16,195 @@ OPERADORES_VALIDOS = {'+', '-', '*', '/', '%', '^', '|'}  # '|' é divisão real
 OPERADORES_RELACIONAIS = {'>', '<', '=', '!'}
 PALAVRAS_RESERVADAS = {'RES', 'IF', 'WHILE', 'THEN', 'ELSE', 'PRINT'}
 
+# códigos inteiros dos tipos de token, na mesma ordem de NOMES_TIPOS
+COD_NUMERO = 0
+COD_OPERADOR = 1
+COD_OPERADOR_RELACIONAL = 2
+COD_PARENTESE_ABRE = 3
+COD_PARENTESE_FECHA = 4
+COD_PALAVRA_RESERVADA = 5
+COD_IDENTIFICADOR = 6
+
+NOMES_TIPOS = (
+    NUMERO,
+    OPERADOR,
+    OPERADOR_RELACIONAL,
+    PARENTESE_ABRE,
+    PARENTESE_FECHA,
+    PALAVRA_RESERVADA,
+    IDENTIFICADOR
+)
+
+CODIGOS_TIPOS = {nome: codigo for codigo, nome in enumerate(NOMES_TIPOS)}
+
+class Token:
+    """
+    token compacto: código inteiro do tipo, valor e posição em slots
+    
+    comparações de tipo usam token.codigo contra as constantes COD_*. o acesso
+    por chave (token['tipo'], token.get('posicao'), 'posicao' in token) continua
+    disponível para o código que trata tokens como dicionários
+    """
+    __slots__ = ('codigo', 'valor', 'posicao')
+    
+    def __init__(self, codigo, valor, posicao=None):
+        self.codigo = codigo
+        self.valor = valor
+        self.posicao = posicao
+    
+    @property
+    def tipo(self):
+        """nome do tipo do token (NUMERO, OPERADOR, ...)"""
+        return NOMES_TIPOS[self.codigo]
+    
+    def __getitem__(self, chave):
+        if chave == 'tipo':
+            return NOMES_TIPOS[self.codigo]
+        if chave == 'valor':
+            return self.valor
+        if chave == 'posicao' and self.posicao is not None:
+            return self.posicao
+        raise KeyError(chave)
+    
+    def __contains__(self, chave):
+        return chave == 'tipo' or chave == 'valor' or (chave == 'posicao' and self.posicao is not None)
+    
+    def get(self, chave, padrao=None):
+        """equivalente a dict.get"""
+        try:
+            return self[chave]
+        except KeyError:
+            return padrao
+    
+    def como_dicionario(self):
+        """
+        converte o token para o formato de dicionário
+        
+        Returns:
+            dict: {'tipo', 'valor'} e 'posicao' quando definida
+        """
+        token = {
+            'tipo': NOMES_TIPOS[self.codigo],
+            'valor': self.valor
+        }
+        if self.posicao is not None:
+            token['posicao'] = self.posicao
+        return token
+    
+    def __eq__(self, outro):
+        if isinstance(outro, Token):
+            return (self.codigo, self.valor, self.posicao) == (outro.codigo, outro.valor, outro.posicao)
+        if isinstance(outro, dict):
+            return self.como_dicionario() == outro
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        # mesma representação do formato em dicionário (usada em mensagens)
+        return repr(self.como_dicionario())
+
 def criar_token(tipo, valor, posicao=None):
     """
     cria um novo token
     
     Args:
-        tipo (str): tipo do token
+        tipo (str | int): nome do tipo do token ou código COD_*
         valor (str): valor do token
         posicao (int, optional): posição do token no texto
         
     Returns:
-        dict: dicionário representando o token
+        Token: token compacto (aceita acesso por chave como dicionário)
+    """
+    codigo = tipo if isinstance(tipo, int) else CODIGOS_TIPOS[tipo]
+    return Token(codigo, valor, posicao)
+
+def como_token(token):
+    """
+    converte um token em formato de dicionário para Token
+    
+    Args:
+        token (Token | dict): token em qualquer dos dois formatos
+        
+    Returns:
+        Token: o próprio token, se já for Token, ou uma cópia compacta
+    """
+    if isinstance(token, Token):
+        return token
+    return criar_token(token['tipo'], token['valor'], token.get('posicao'))
+
+class NumeroLiteral(str):
+    """
+    literal numérico decodificado uma única vez pelo analisador léxico
+    
+    continua sendo o texto original (comparações, json e '.' in valor seguem
+    funcionando), e carrega o valor já convertido em .numero (int ou float)
+    """
+    
+    __slots__ = ('numero',)
+    
+    def __new__(cls, texto, numero):
+        literal = super().__new__(cls, texto)
+        literal.numero = numero
+        return literal
+    
+    def __getnewargs__(self):
+        # necessário para copy/pickle recriarem o literal com o valor
+        return (str(self), self.numero)
+
+@lru_cache(maxsize=4096)
+def decodificar_numero(texto):
+    """
+    converte o texto de um número em NumeroLiteral (int ou float)
+    
+    literais repetidos devolvem o mesmo objeto
+    
+    Args:
+        texto (str): texto do número reconhecido pelo léxico
+        
+    Returns:
+        NumeroLiteral: literal decodificado, ou o próprio texto se não for
+                       conversível (dígitos unicode sem valor decimal)
+    """
+    try:
+        numero = float(texto) if '.' in texto else int(texto)
+    except ValueError:
+        return texto
+    return NumeroLiteral(texto, numero)
+
+@lru_cache(maxsize=4096)
+def interpretar_texto_numerico(texto):
+    """
+    converte uma string comum em número, memorizando o resultado
+    
+    Args:
+        texto (str): operando em texto (ex.: '2', 't0', 'X')
+        
+    Returns:
+        float: valor numérico ou None se o texto não for número
+    """
+    try:
+        return float(texto)
+    except ValueError:
+        return None
+
+def valor_numerico(operando):
+    """
+    obtém o valor numérico de um operando sem reinterpretar literais
+    
+    Args:
+        operando: NumeroLiteral, número, string ou None
+        
+    Returns:
+        int | float: valor numérico ou None se o operando não for constante
     """
-    token = {
-        'tipo': tipo,
-        'valor': valor
-    }
-    if posicao is not None:
-        token['posicao'] = posicao
-    return token
+    if isinstance(operando, NumeroLiteral):
+        return operando.numero
+    if isinstance(operando, str):
+        return interpretar_texto_numerico(operando)
+    if isinstance(operando, (int, float)) and not isinstance(operando, bool):
+        return operando
+    return None
 
 def eh_operador_valido(char):
     """verifica se o caractere é um operador válido"""
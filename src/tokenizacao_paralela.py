@@ -0,0 +1,231 @@
+# tokenização paralela de arquivos grandes de expressões
+# cada linha é analisada de forma independente, então a entrada é dividida em
+# faixas de linhas (ou de bytes, alinhadas em quebras de linha) tokenizadas em
+# processos separados. os tokens voltam no formato binário do token_reader,
+# bem mais barato de transferir entre processos que objetos Token via pickle
+
+import sys
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.lexer import parse_expressao, tokenizar_bytes, iterar_linhas_bytes, LexerError
+from src.token_reader import serializar_tokens_binario, ler_formato_binario
+
+# linhas por tarefa no modo de faixas de linhas
+TAMANHO_LOTE_PADRAO = 4096
+# bytes por tarefa no modo de faixas de bytes
+TAMANHO_FAIXA_PADRAO = 1 << 20
+
+def empacotar_lotes(lotes):
+    """
+    prepara lotes de tokens para a volta ao processo principal
+    
+    Args:
+        lotes (list): lotes com 'linha', 'expressao', 'tokens' e 'erro'
+    
+    Returns:
+        tuple: (tokens das linhas sem erro no formato binário,
+                lista de (linha, expressao, erro))
+    """
+    tokens = [lote['tokens'] for lote in lotes if lote['erro'] is None]
+    metadados = [(lote['linha'], lote['expressao'], lote['erro']) for lote in lotes]
+    return serializar_tokens_binario(tokens), metadados
+
+def desempacotar_lotes(pacote, linhas_anteriores=0):
+    """
+    reconstrói os lotes de um pacote criado por empacotar_lotes
+    
+    Args:
+        pacote (tuple): (tokens binários, metadados)
+        linhas_anteriores (int): somado ao número de linha de cada lote
+    
+    Yields:
+        dict: lote com 'linha', 'expressao', 'tokens' e 'erro'
+    """
+    binario, metadados = pacote
+    tokens = iter(ler_formato_binario(binario))
+    
+    for linha, expressao, erro in metadados:
+        yield {
+            'linha': linha + linhas_anteriores,
+            'expressao': expressao,
+            'tokens': next(tokens) if erro is None else None,
+            'erro': erro
+        }
+
+def tokenizar_faixa_linhas(primeira_linha, linhas):
+    """
+    tokeniza uma faixa de linhas (executada nos processos de trabalho)
+    
+    as linhas são tratadas como em ler_formato_expressoes: espaços das pontas
+    removidos, linhas vazias e comentários ignorados
+    
+    Args:
+        primeira_linha (int): número da primeira linha da faixa
+        linhas (list): linhas da faixa
+    
+    Returns:
+        tuple: pacote criado por empacotar_lotes
+    """
+    lotes = []
+    
+    for numero_linha, linha in enumerate(linhas, primeira_linha):
+        linha = linha.strip()
+        if not linha or linha.startswith('#'):
+            continue
+        
+        try:
+            tokens = parse_expressao(linha)
+            erro = None
+        except LexerError as e:
+            tokens = None
+            erro = e
+        
+        lotes.append({
+            'linha': numero_linha,
+            'expressao': linha,
+            'tokens': tokens,
+            'erro': erro
+        })
+    
+    return empacotar_lotes(lotes)
+
+def tokenizar_faixa_bytes(nome_arquivo, inicio, fim):
+    """
+    tokeniza uma faixa de bytes do arquivo (executada nos processos de trabalho)
+    
+    Args:
+        nome_arquivo (str): arquivo de expressões
+        inicio (int): primeiro byte da faixa (início de linha)
+        fim (int): byte seguinte ao fim da faixa (início de linha ou fim do arquivo)
+    
+    Returns:
+        tuple: (pacote criado por empacotar_lotes, número de linhas da faixa)
+    """
+    with open(nome_arquivo, 'rb') as arquivo:
+        arquivo.seek(inicio)
+        dados = arquivo.read(fim - inicio)
+    
+    num_linhas = sum(1 for _ in iterar_linhas_bytes(dados))
+    return empacotar_lotes(list(tokenizar_bytes(dados))), num_linhas
+
+def calcular_faixas_bytes(nome_arquivo, tamanho_faixa=TAMANHO_FAIXA_PADRAO):
+    """
+    divide o arquivo em faixas de aproximadamente tamanho_faixa bytes,
+    terminando sempre depois de uma quebra de linha
+    
+    Args:
+        nome_arquivo (str): arquivo de expressões
+        tamanho_faixa (int): tamanho aproximado de cada faixa
+    
+    Yields:
+        tuple: (inicio, fim) de cada faixa
+    """
+    tamanho = os.path.getsize(nome_arquivo)
+    
+    with open(nome_arquivo, 'rb') as arquivo:
+        inicio = 0
+        while inicio < tamanho:
+            arquivo.seek(min(inicio + tamanho_faixa, tamanho))
+            arquivo.readline()
+            fim = arquivo.tell()
+            yield inicio, fim
+            inicio = fim
+
+def executar_em_ordem(funcao, tarefas, trabalhadores):
+    """
+    executa tarefas em processos e devolve os resultados na ordem de envio
+    
+    no máximo 2 * trabalhadores tarefas ficam pendentes, então a entrada é
+    consumida sob demanda. com um único trabalhador tudo roda no processo atual
+    
+    Args:
+        funcao (function): função de nível de módulo executada em cada tarefa
+        tarefas (iterable): tuplas de argumentos para funcao
+        trabalhadores (int): número de processos
+    
+    Yields:
+        resultado de cada tarefa, na ordem das tarefas
+    """
+    if trabalhadores <= 1:
+        for argumentos in tarefas:
+            yield funcao(*argumentos)
+        return
+    
+    executor = ProcessPoolExecutor(max_workers=trabalhadores)
+    pendentes = deque()
+    try:
+        for argumentos in tarefas:
+            pendentes.append(executor.submit(funcao, *argumentos))
+            if len(pendentes) >= 2 * trabalhadores:
+                yield pendentes.popleft().result()
+        
+        while pendentes:
+            yield pendentes.popleft().result()
+    finally:
+        # parada antecipada do consumidor cancela o que não começou
+        executor.shutdown(wait=True, cancel_futures=True)
+
+def normalizar_trabalhadores(trabalhadores):
+    """None usa um processo por núcleo; valores menores que 1 viram 1"""
+    if trabalhadores is None:
+        return os.cpu_count() or 1
+    return max(1, trabalhadores)
+
+def tokenizar_paralelo(linhas, trabalhadores=None, tamanho_lote=TAMANHO_LOTE_PADRAO):
+    """
+    tokeniza linhas de expressões em paralelo, dividindo-as em faixas de linhas
+    
+    Args:
+        linhas (iterable): linhas de texto (pode ser um gerador)
+        trabalhadores (int): número de processos (None = número de núcleos)
+        tamanho_lote (int): linhas por tarefa
+    
+    Yields:
+        dict: lote com 'linha', 'expressao', 'tokens' e 'erro', na ordem
+              original; linhas vazias e comentários não geram lote
+    """
+    if tamanho_lote < 1:
+        raise ValueError("Tamanho do lote deve ser pelo menos 1")
+    
+    def faixas():
+        iterador = iter(linhas)
+        primeira_linha = 1
+        while True:
+            faixa = list(islice(iterador, tamanho_lote))
+            if not faixa:
+                return
+            yield primeira_linha, faixa
+            primeira_linha += len(faixa)
+    
+    for pacote in executar_em_ordem(tokenizar_faixa_linhas, faixas(), normalizar_trabalhadores(trabalhadores)):
+        yield from desempacotar_lotes(pacote)
+
+def tokenizar_arquivo_paralelo(nome_arquivo, trabalhadores=None, tamanho_faixa=TAMANHO_FAIXA_PADRAO):
+    """
+    tokeniza um arquivo em paralelo, dividindo-o em faixas de bytes
+    
+    cada processo lê só a sua faixa do disco e a analisa em modo de bytes,
+    então o resultado é igual ao de tokenizar_bytes sobre o arquivo inteiro
+    (posições são colunas dentro da linha)
+    
+    Args:
+        nome_arquivo (str): arquivo de expressões
+        trabalhadores (int): número de processos (None = número de núcleos)
+        tamanho_faixa (int): bytes por tarefa
+    
+    Yields:
+        dict: lote com 'linha', 'expressao', 'tokens' e 'erro', na ordem original
+    """
+    if tamanho_faixa < 1:
+        raise ValueError("Tamanho da faixa deve ser pelo menos 1")
+    
+    tarefas = ((nome_arquivo, inicio, fim) for inicio, fim in calcular_faixas_bytes(nome_arquivo, tamanho_faixa))
+    linhas_anteriores = 0
+    
+    for pacote, num_linhas in executar_em_ordem(tokenizar_faixa_bytes, tarefas, normalizar_trabalhadores(trabalhadores)):
+        yield from desempacotar_lotes(pacote, linhas_anteriores)
+        linhas_anteriores += num_linhas
@@ -0,0 +1,74 @@
+# visão somente leitura de nó com a interface de dicionário de criar_no
+# base comum de NoCompacto, NoCompartilhado, NoBinario e NoAtribuido: cada
+# uma implementa só __getitem__ e como_dicionario (e keys, se as chaves
+# variam de nó para nó)
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# chaves dos nós de criar_no, na ordem em que são criadas
+CHAVES_NO = ('tipo', 'valor', 'filhos')
+
+class VisaoNo:
+    """
+    base das visões de nó que se comportam como o dicionário de criar_no
+    
+    no['tipo'], no.get('valor'), no['filhos'], 'filhos' in no, iteração e
+    comparação com dicionários funcionam como no dicionário, então
+    imprimir_arvore, salvar_arvore e os percursos funcionam sem mudança. não
+    há atribuição: quem precisa alterar os nós usa como_dicionario
+    
+    as subclasses implementam __getitem__ (KeyError para chave ausente) e
+    como_dicionario, e sobrescrevem keys quando as chaves não são CHAVES_NO
+    """
+    
+    __slots__ = ()
+    
+    def __getitem__(self, chave):
+        raise NotImplementedError
+    
+    def como_dicionario(self):
+        """
+        Returns:
+            dict: a subárvore como dicionários novos
+        """
+        raise NotImplementedError
+    
+    def keys(self):
+        """chaves do nó, na ordem do dicionário equivalente"""
+        return CHAVES_NO
+    
+    def __contains__(self, chave):
+        return chave in self.keys()
+    
+    def __iter__(self):
+        return iter(self.keys())
+    
+    def __len__(self):
+        return len(self.keys())
+    
+    def items(self):
+        """pares (chave, valor) do nó"""
+        return [(chave, self[chave]) for chave in self.keys()]
+    
+    def get(self, chave, padrao=None):
+        """equivalente a dict.get"""
+        try:
+            return self[chave]
+        except KeyError:
+            return padrao
+    
+    def __eq__(self, outro):
+        if self is outro:
+            return True
+        if isinstance(outro, VisaoNo):
+            return self.como_dicionario() == outro.como_dicionario()
+        if isinstance(outro, dict):
+            return self.como_dicionario() == outro
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self):
+        return repr(self.como_dicionario())
@@ -0,0 +1,201 @@
+# percursos iterativos e visitantes para árvores sintáticas
+# os percursos usam pilha (ou fila) explícita, então a profundidade da árvore
+# não esbarra no limite de recursão; vários visitantes podem compartilhar
+# uma única passada pela árvore
+
+import sys
+import os
+from collections import deque
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+class Visitante:
+    """
+    visitante de nós da árvore; as subclasses sobrescrevem entrar e/ou sair
+    
+    entrar é chamado antes dos filhos (pré-ordem) e sair depois deles
+    (pós-ordem). os nós são os dicionários da árvore (ou visões compatíveis)
+    e nivel é a profundidade do nó, 0 na raiz
+    """
+    
+    def entrar(self, no, nivel):
+        """chamado ao chegar no nó, antes dos filhos"""
+    
+    def sair(self, no, nivel):
+        """chamado depois de todos os filhos do nó"""
+    
+    def resultado(self):
+        """valor calculado pelo visitante ao fim do percurso"""
+        return None
+
+def percorrer_com_visitantes(raiz, visitantes):
+    """
+    percorre a árvore uma única vez chamando todos os visitantes
+    
+    em cada nó os visitantes são chamados na ordem da lista; nós falsos
+    (None) na lista de filhos são ignorados, como nos percursos recursivos
+    
+    Args:
+        raiz (dict): nó raiz
+        visitantes (list): instâncias de Visitante
+    
+    Returns:
+        list: os próprios visitantes, para leitura dos resultados
+    """
+    # só entram no laço os métodos sobrescritos (na classe ou na instância)
+    entradas = [v.entrar for v in visitantes if getattr(v.entrar, '__func__', None) is not Visitante.entrar]
+    saidas = [v.sair for v in visitantes if getattr(v.sair, '__func__', None) is not Visitante.sair]
+    
+    # a pilha guarda um iterador por lista de filhos em andamento (não um
+    # item por nó) e pais o dono de cada lista; o nível é len(pilha) - 1
+    pais = [None]
+    pilha = [iter((raiz,))]
+    while pilha:
+        for no in pilha[-1]:
+            if not no:
+                continue
+            
+            nivel = len(pilha) - 1
+            for entrar in entradas:
+                entrar(no, nivel)
+            
+            filhos = no.get('filhos')
+            if filhos:
+                pais.append(no)
+                pilha.append(iter(filhos))
+                break
+            
+            for sair in saidas:
+                sair(no, nivel)
+        else:
+            # lista de filhos terminada: sai do pai
+            pilha.pop()
+            pai = pais.pop()
+            if pai is not None:
+                nivel = len(pilha) - 1
+                for sair in saidas:
+                    sair(pai, nivel)
+    
+    return visitantes
+
+def iterar_pre_ordem(raiz):
+    """
+    percorre a árvore em pré-ordem sem recursão
+    
+    Args:
+        raiz (dict): nó raiz
+    
+    Yields:
+        tuple: (no, nivel)
+    """
+    pilha = [iter((raiz,))]
+    while pilha:
+        for no in pilha[-1]:
+            if not no:
+                continue
+            
+            yield no, len(pilha) - 1
+            
+            filhos = no.get('filhos')
+            if filhos:
+                pilha.append(iter(filhos))
+                break
+        else:
+            pilha.pop()
+
+def iterar_pos_ordem(raiz):
+    """
+    percorre a árvore em pós-ordem sem recursão
+    
+    Args:
+        raiz (dict): nó raiz
+    
+    Yields:
+        tuple: (no, nivel)
+    """
+    pais = [None]
+    pilha = [iter((raiz,))]
+    while pilha:
+        for no in pilha[-1]:
+            if not no:
+                continue
+            
+            filhos = no.get('filhos')
+            if filhos:
+                pais.append(no)
+                pilha.append(iter(filhos))
+                break
+            
+            yield no, len(pilha) - 1
+        else:
+            pilha.pop()
+            pai = pais.pop()
+            if pai is not None:
+                yield pai, len(pilha) - 1
+
+def iterar_em_nivel(raiz):
+    """
+    percorre a árvore por níveis (largura), da esquerda para a direita
+    
+    Args:
+        raiz (dict): nó raiz
+    
+    Yields:
+        tuple: (no, nivel)
+    """
+    if not raiz:
+        return
+    
+    fila = deque([(raiz, 0)])
+    while fila:
+        no, nivel = fila.popleft()
+        yield no, nivel
+        
+        filhos = no.get('filhos')
+        if filhos:
+            fila.extend((filho, nivel + 1) for filho in filhos if filho)
+
+class ContadorNos(Visitante):
+    """conta os nós da árvore"""
+    
+    def __init__(self):
+        self.total = 0
+    
+    def entrar(self, no, nivel):
+        self.total += 1
+    
+    def resultado(self):
+        return self.total
+
+class AlturaArvore(Visitante):
+    """
+    altura da árvore: nível do nó mais profundo (0 para uma folha); um filho
+    None conta como folha, como em calcular_altura
+    """
+    
+    def __init__(self):
+        self.altura = 0
+    
+    def entrar(self, no, nivel):
+        filhos = no.get('filhos')
+        if filhos and not all(filhos):
+            nivel += 1
+        if nivel > self.altura:
+            self.altura = nivel
+    
+    def resultado(self):
+        return self.altura
+
+class AplicarFuncao(Visitante):
+    """
+    aplica uma função a cada nó, em pré-ordem ou em pós-ordem
+    
+    Args:
+        funcao (callable): função chamada com o nó
+        pos_ordem (bool): se True, chama a função na saída do nó
+    """
+    
+    def __init__(self, funcao, pos_ordem=False):
+        if pos_ordem:
+            self.sair = lambda no, nivel: funcao(no)
+        else:
+            self.entrar = lambda no, nivel: funcao(no)
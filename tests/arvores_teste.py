@@ -0,0 +1,86 @@
+"""
+base comum dos testes de árvores: expressões de teste, derivações e os
+testes que valem para toda visão de nó (VisaoNo)
+"""
+
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.syntax_tree import converter_derivacao_para_arvore, imprimir_arvore
+from src.parser import parsear
+from src.grammar import obter_gramatica
+from src.lexer import parse_expressao
+
+EXPRESSOES = [
+    "(3 5 +)",
+    "(10.5 X)",
+    "(X)",
+    "(2 RES)",
+    "((3 4 +) Y)",
+    "(A B >)",
+    "(A B > (1 X) (2 X) IF)",
+    "((A) 10 < ((1 X) ((X) 1 +)) WHILE)"
+]
+
+def derivar_expressoes(expressoes, tabela_ll1):
+    """
+    derivações das expressões, na ordem dada
+    
+    Args:
+        expressoes (list): expressões RPN em texto
+        tabela_ll1 (dict): tabela de obter_gramatica
+    
+    Returns:
+        list: derivação de cada expressão
+    """
+    return [parsear(parse_expressao(expressao), tabela_ll1)['derivacao'] for expressao in expressoes]
+
+class CasoArvores:
+    """
+    mixin de unittest.TestCase com as derivações de cls.expressoes
+    
+    a classe de teste pode trocar expressoes e estender setUpClass (chamando
+    super) para montar as árvores que usa
+    """
+    
+    expressoes = EXPRESSOES
+    
+    @classmethod
+    def setUpClass(cls):
+        """configuração inicial - derivações das expressões de teste"""
+        super().setUpClass()
+        cls.tabela_ll1 = obter_gramatica()['tabela']
+        cls.derivacoes = derivar_expressoes(cls.expressoes, cls.tabela_ll1)
+
+class CasoVisaoNo(CasoArvores):
+    """
+    mixin com os testes comuns das visões de nó
+    
+    a classe de teste implementa gerar_arvore(derivacao)
+    """
+    
+    def gerar_arvore(self, derivacao):
+        raise NotImplementedError
+    
+    def teste_mesma_arvore_de_criar_no(self):
+        """teste visão igual à árvore de dicionários"""
+        for expressao, derivacao in zip(self.expressoes, self.derivacoes):
+            with self.subTest(expressao=expressao):
+                esperado = converter_derivacao_para_arvore(derivacao)
+                arvore = self.gerar_arvore(derivacao)
+                
+                self.assertEqual(arvore, esperado)
+                self.assertEqual(arvore.como_dicionario(), esperado)
+                self.assertEqual(imprimir_arvore(arvore), imprimir_arvore(esperado))
+    
+    def teste_somente_leitura(self):
+        """teste visão não aceita atribuição"""
+        arvore = self.gerar_arvore(self.derivacoes[0])
+        
+        with self.assertRaises(TypeError):
+            arvore['tipo_inferido'] = 'int'
+        with self.assertRaises(KeyError):
+            arvore['tipo_inferido']
+        self.assertIsNone(arvore.get('tipo_inferido'))
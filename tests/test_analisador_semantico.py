@@ -0,0 +1,148 @@
+"""
+testes para o analisador semântico unificado (uma única passada)
+"""
+
+import unittest
+import sys
+import os
+import copy
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analisador_semantico import analisar_semantica_unificada, AnalisadorSemantico
+from src.analisador_tipos import analisar_semantica, gerar_relatorio_julgamento_tipos
+from src.analisador_memoria import analisar_semantica_memoria, validar_uso_identificadores
+from src.analisador_controle import analisar_semantica_controle, validar_aninhamento_controle
+from src.tabela_simbolos import inicializar_tabela_simbolos, simbolo_existe
+from src.syntax_tree import converter_derivacao_para_arvore, criar_no, contar_nos
+from src.visitantes import Visitante, percorrer_com_visitantes
+from tests.arvores_teste import CasoArvores, derivar_expressoes
+
+def analisar_separado(arvore, tabela_simbolos):
+    """as análises separadas, na ordem do pipeline"""
+    arvore_anotada, erros_tipos = analisar_semantica(arvore, None, tabela_simbolos)
+    regras = gerar_relatorio_julgamento_tipos(arvore_anotada)
+    _, erros_memoria = analisar_semantica_memoria(arvore_anotada, tabela_simbolos)
+    return {
+        'arvore_anotada': arvore_anotada,
+        'erros_tipos': erros_tipos,
+        'erros_memoria': erros_memoria,
+        'erros_controle': analisar_semantica_controle(arvore_anotada, tabela_simbolos),
+        'erros_identificadores': validar_uso_identificadores(arvore_anotada, tabela_simbolos),
+        'avisos_controle': validar_aninhamento_controle(arvore_anotada),
+        'regras_julgamento': regras
+    }
+
+class ContadorVisitas(Visitante):
+    """conta chamadas de entrar, para verificar a passada única"""
+    
+    def __init__(self, visitante):
+        self.visitante = visitante
+        self.visitas = 0
+    
+    def entrar(self, no, nivel):
+        self.visitas += 1
+        self.visitante.entrar(no, nivel)
+    
+    def sair(self, no, nivel):
+        self.visitante.sair(no, nivel)
+
+class TestAnalisadorSemantico(CasoArvores, unittest.TestCase):
+    """testes para analisar_semantica_unificada"""
+    
+    # símbolos usados antes e depois de declarados, RES fora do histórico e
+    # estruturas de controle aninhadas
+    expressoes = [
+        "(3 5 +)",
+        "(10.5 X)",
+        "(X)",
+        "(Y)",
+        "(2 RES)",
+        "(9 RES)",
+        "((3 4 +) Y)",
+        "((3 2.0 /) Z)",
+        "(X 0 > (1 X) (2 X) IF)",
+        "((Z 1 +) W)",
+        "((W) 10 < ((1 W) ((W) 1 +)) WHILE)",
+        "(A B > ((A 1 > (1 A) (2 A) IF)) (3 A) IF)"
+    ]
+    
+    @classmethod
+    def setUpClass(cls):
+        """configuração inicial - árvores sintáticas das expressões de teste"""
+        super().setUpClass()
+        cls.arvores = [converter_derivacao_para_arvore(derivacao) for derivacao in cls.derivacoes]
+    
+    def teste_mesmos_resultados_das_analises_separadas(self):
+        """teste erros, avisos, regras, árvore e tabela iguais linha a linha"""
+        tabela_separada = inicializar_tabela_simbolos()
+        tabela_unificada = inicializar_tabela_simbolos()
+        
+        for linha, (expressao, arvore) in enumerate(zip(self.expressoes, self.arvores), 1):
+            with self.subTest(expressao=expressao):
+                separada = copy.deepcopy(arvore)
+                unificada = copy.deepcopy(arvore)
+                separada['linha'] = unificada['linha'] = linha
+                
+                esperado = analisar_separado(separada, tabela_separada)
+                obtido = analisar_semantica_unificada(unificada, tabela_unificada)
+                
+                self.assertIs(obtido['arvore_anotada'], unificada)
+                for chave, valor in esperado.items():
+                    self.assertEqual(obtido[chave], valor, chave)
+                self.assertEqual(tabela_unificada, tabela_separada)
+    
+    def teste_armazenamento_vale_para_a_arvore_inteira(self):
+        """teste identificadores validados depois de todo armazenamento da árvore"""
+        derivacao = derivar_expressoes(["((1 Y) Y)"], self.tabela_ll1)[0]
+        arvore = converter_derivacao_para_arvore(derivacao)
+        
+        esperado = analisar_separado(copy.deepcopy(arvore), inicializar_tabela_simbolos())
+        tabela_simbolos = inicializar_tabela_simbolos()
+        obtido = analisar_semantica_unificada(arvore, tabela_simbolos)
+        
+        self.assertTrue(simbolo_existe(tabela_simbolos, 'Y'))
+        self.assertEqual(obtido['erros_memoria'], esperado['erros_memoria'])
+        self.assertEqual(obtido['erros_identificadores'], esperado['erros_identificadores'])
+        self.assertEqual(obtido['erros_identificadores'], [])
+    
+    def teste_aninhamento_profundo(self):
+        """teste aviso de aninhamento e profundidade máxima"""
+        arvore = criar_no('NUMERO', '1')
+        for _ in range(5):
+            arvore = criar_no('LACO', None, [criar_no('CONDICAO', '>'), arvore])
+        
+        resultado = analisar_semantica_unificada(arvore, inicializar_tabela_simbolos())
+        
+        self.assertEqual(resultado['profundidade_controle'], 5)
+        self.assertEqual(resultado['avisos_controle'], validar_aninhamento_controle(arvore))
+        self.assertEqual(len(resultado['avisos_controle']), 2)
+    
+    def teste_resultado_sem_efeitos(self):
+        """teste validação feita uma vez: resultado e finalizar repetidos não mudam nada"""
+        arvore = copy.deepcopy(self.arvores[-1])
+        tabela_simbolos = inicializar_tabela_simbolos()
+        analisador, = percorrer_com_visitantes(arvore, [AnalisadorSemantico(tabela_simbolos)])
+        
+        analisador.finalizar()
+        primeiro = copy.deepcopy(analisador.resultado())
+        tabela = copy.deepcopy(tabela_simbolos)
+        analisador.finalizar()
+        
+        self.assertEqual(analisador.resultado(), primeiro)
+        self.assertEqual(tabela_simbolos, tabela)
+        self.assertTrue(primeiro['erros_identificadores'])
+    
+    def teste_uma_unica_passada(self):
+        """teste cada nó visitado uma vez"""
+        arvore = copy.deepcopy(self.arvores[-1])
+        analisador = AnalisadorSemantico(inicializar_tabela_simbolos())
+        contador, = percorrer_com_visitantes(arvore, [ContadorVisitas(analisador)])
+        
+        self.assertEqual(contador.visitas, contar_nos(arvore))
+        # A e B da condição externa, A da interna e os três armazenamentos
+        self.assertEqual(len(contador.visitante.identificadores), 6)
+        self.assertEqual(len(contador.visitante.estruturas_controle), 2)
+
+if __name__ == '__main__':
+    unittest.main()
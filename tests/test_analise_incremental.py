@@ -0,0 +1,78 @@
+"""
+testes para a análise incremental
+"""
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.analise_incremental import criar_estado, aplicar_edicao, obter_erros, analisar_linha
+from src.grammar import obter_gramatica
+
+class TestAnaliseIncremental(unittest.TestCase):
+    """testes para a reanálise de linhas editadas"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """configuração inicial - constrói gramática uma vez"""
+        cls.tabela = obter_gramatica()['tabela']
+    
+    def setUp(self):
+        self.texto = "# exemplo\n(3 5 +)\n(10 X)\n\n(X 2 *)\n"
+        self.estado = criar_estado(self.texto, self.tabela)
+    
+    def teste_estado_inicial(self):
+        """teste análise completa do arquivo"""
+        self.assertEqual(len(self.estado['linhas']), 5)
+        self.assertIsNone(self.estado['resultados'][0])
+        self.assertIsNone(self.estado['resultados'][3])
+        self.assertEqual(self.estado['resultados'][1]['arvore']['tipo'], 'EXPRESSAO')
+    
+    def teste_edicao_uma_linha(self):
+        """teste edição de uma linha reaproveita as demais por identidade"""
+        novo = aplicar_edicao(self.estado, 3, 3, "(20 X)", self.tabela)
+        
+        self.assertEqual(novo['linhas_reanalisadas'], 1)
+        self.assertIs(novo['resultados'][1], self.estado['resultados'][1])
+        self.assertIs(novo['resultados'][4], self.estado['resultados'][4])
+        self.assertIsNot(novo['resultados'][2], self.estado['resultados'][2])
+        self.assertEqual(novo['resultados'][2]['derivacao']['conteudo']['valor'], '20')
+        # estado anterior continua válido
+        self.assertEqual(self.estado['linhas'][2], "(10 X)")
+    
+    def teste_insercao_e_remocao(self):
+        """teste inserção e remoção de linhas deslocam os resultados"""
+        inserido = aplicar_edicao(self.estado, 2, 1, "(1 2 +)\n(3 4 -)\n", self.tabela)
+        self.assertEqual(len(inserido['linhas']), 7)
+        self.assertEqual(inserido['linhas_reanalisadas'], 2)
+        self.assertIs(inserido['resultados'][3], self.estado['resultados'][1])
+        
+        removido = aplicar_edicao(inserido, 2, 3, "", self.tabela)
+        self.assertEqual(removido['linhas'], self.estado['linhas'])
+        self.assertEqual(removido['linhas_reanalisadas'], 0)
+    
+    def teste_linha_inalterada_no_intervalo(self):
+        """teste linha reescrita com o mesmo texto não é reanalisada"""
+        novo = aplicar_edicao(self.estado, 2, 3, "(3 5 +)\n(30 X)", self.tabela)
+        
+        self.assertEqual(novo['linhas_reanalisadas'], 1)
+        self.assertIs(novo['resultados'][1], self.estado['resultados'][1])
+    
+    def teste_erros(self):
+        """teste erros por linha"""
+        novo = aplicar_edicao(self.estado, 5, 5, "(X 2 $)", self.tabela)
+        
+        erros = obter_erros(novo)
+        self.assertEqual(len(erros), 1)
+        self.assertEqual(erros[0][0], 5)
+        self.assertIsNone(analisar_linha("   ", self.tabela))
+    
+    def teste_intervalo_invalido(self):
+        """teste intervalo fora do arquivo"""
+        with self.assertRaises(ValueError):
+            aplicar_edicao(self.estado, 7, 7, "(1 X)", self.tabela)
+
+if __name__ == '__main__':
+    unittest.main()
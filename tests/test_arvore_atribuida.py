@@ -0,0 +1,134 @@
+"""
+testes para a árvore atribuída: cópia em dicionários e visão sem cópia
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.arvore_atribuida import (NoAtribuido, gerar_arvore_atribuida, gerar_visao_atribuida, limpar_arvore,
+                                  salvar_arvore_json, ArvoreAtribuidaError)
+from utils.formatador_relatorios import gerar_relatorio_arvore_atribuida
+from src.arvore_compartilhada import gerar_arvore_compartilhada, TabelaNos
+from src.analisador_tipos import anotar_tipos_arvore
+from src.tabela_simbolos import inicializar_tabela_simbolos
+from src.syntax_tree import converter_derivacao_para_arvore, criar_no, contar_nos
+from src.gerador_tac import GeradorTAC
+from tests.arvores_teste import CasoArvores
+
+def gerar_tac(arvores):
+    """TAC das árvores atribuídas, em texto"""
+    gerador = GeradorTAC()
+    for arvore in arvores:
+        # histórico de resultados para RES, como na geração por linha
+        gerador.historico_resultados.append(gerador.processar_no(arvore))
+    return [str(instrucao) for instrucao in gerador.instrucoes]
+
+class TestArvoreAtribuida(CasoArvores, unittest.TestCase):
+    """testes para gerar_arvore_atribuida e a visão NoAtribuido"""
+    
+    def arvores_anotadas(self):
+        """árvores sintáticas com tipos e linhas anotados"""
+        tabela_simbolos = inicializar_tabela_simbolos()
+        arvores = []
+        for linha, derivacao in enumerate(self.derivacoes, 1):
+            arvore = converter_derivacao_para_arvore(derivacao)
+            arvore['linha'] = linha
+            anotar_tipos_arvore(arvore, tabela_simbolos, [])
+            arvores.append(arvore)
+        return arvores
+    
+    def teste_igual_a_limpar_arvore(self):
+        """teste visão com os mesmos campos, na mesma ordem, da cópia limpa"""
+        for expressao, arvore in zip(self.expressoes, self.arvores_anotadas()):
+            with self.subTest(expressao=expressao):
+                atribuida = gerar_visao_atribuida(arvore)
+                esperado = limpar_arvore(arvore)
+                
+                self.assertIsInstance(atribuida, NoAtribuido)
+                self.assertEqual(atribuida, esperado)
+                self.assertEqual(list(atribuida), list(esperado))
+                self.assertEqual(json.dumps(atribuida.como_dicionario()), json.dumps(esperado))
+    
+    def teste_arvore_atribuida_em_dicionarios(self):
+        """teste gerar_arvore_atribuida devolve cópia independente em dicionários"""
+        arvore = self.arvores_anotadas()[-1]
+        atribuida = gerar_arvore_atribuida(arvore)
+        
+        self.assertIsInstance(atribuida, dict)
+        self.assertIsInstance(atribuida['filhos'][0], dict)
+        self.assertEqual(atribuida, limpar_arvore(arvore))
+        self.assertEqual(json.loads(json.dumps(atribuida)), atribuida)
+        
+        # mudanças posteriores na árvore anotada não aparecem na cópia
+        arvore['filhos'][0]['tipo_inferido'] = 'alterado'
+        self.assertNotEqual(atribuida['filhos'][0]['tipo_inferido'], 'alterado')
+        self.assertEqual(gerar_visao_atribuida(arvore)['filhos'][0]['tipo_inferido'], 'alterado')
+        
+        atribuida['tipo_inferido'] = 'int'
+        with tempfile.TemporaryDirectory() as diretorio:
+            arquivo = os.path.join(diretorio, "ARVORE_ATRIBUIDA.md")
+            gerar_relatorio_arvore_atribuida(atribuida, arquivo)
+            self.assertTrue(os.path.exists(arquivo))
+    
+    def teste_sem_copia(self):
+        """teste nós da visão apontam para os nós anotados, que não mudam"""
+        arvore = self.arvores_anotadas()[-1]
+        antes = json.dumps(arvore)
+        atribuida = gerar_visao_atribuida(arvore)
+        
+        self.assertIs(atribuida.no, arvore)
+        self.assertIs(atribuida['filhos'][0].no, arvore['filhos'][0])
+        self.assertIs(atribuida['filhos'], atribuida['filhos'])
+        self.assertEqual(gerar_tac([atribuida]), gerar_tac([limpar_arvore(arvore)]))
+        self.assertEqual(json.dumps(arvore), antes)
+    
+    def teste_campos_limpos(self):
+        """teste campos extras omitidos, linha padrão e filhos None descartados"""
+        arvore = criar_no('OPERACAO', '+', [criar_no('NUMERO', '1'), None, criar_no('IDENTIFICADOR', 'X')])
+        arvore['operando1'] = 'descartado'
+        atribuida = gerar_visao_atribuida(arvore)
+        
+        self.assertEqual(list(atribuida), ['tipo', 'tipo_inferido', 'linha', 'valor', 'filhos'])
+        self.assertEqual(atribuida['linha'], 1)
+        self.assertEqual(len(atribuida['filhos']), 2)
+        self.assertNotIn('operando1', atribuida)
+        with self.assertRaises(KeyError):
+            atribuida['filhos'][0]['operador']
+        with self.assertRaises(TypeError):
+            atribuida['tipo_inferido'] = 'int'
+        with self.assertRaises(ArvoreAtribuidaError):
+            gerar_visao_atribuida(None)
+    
+    def teste_sobre_nos_compartilhados(self):
+        """teste projeção sobre nós imutáveis e TAC igual ao da cópia"""
+        tabela = TabelaNos()
+        compartilhadas = [gerar_arvore_compartilhada(derivacao, tabela) for derivacao in self.derivacoes]
+        dicionarios = [converter_derivacao_para_arvore(derivacao) for derivacao in self.derivacoes]
+        
+        self.assertEqual([gerar_visao_atribuida(arvore) for arvore in compartilhadas],
+                         [limpar_arvore(arvore) for arvore in dicionarios])
+        self.assertEqual(gerar_tac(gerar_visao_atribuida(arvore) for arvore in compartilhadas),
+                         gerar_tac(limpar_arvore(arvore) for arvore in dicionarios))
+    
+    def teste_salvar_e_arvore_profunda(self):
+        """teste JSON da visão e cópia além do limite de recursão"""
+        arvore = self.arvores_anotadas()[-1]
+        with tempfile.TemporaryDirectory() as diretorio:
+            arquivo = os.path.join(diretorio, "arvore_atribuida.json")
+            salvar_arvore_json(gerar_visao_atribuida(arvore), arquivo)
+            with open(arquivo, encoding='utf-8') as entrada:
+                self.assertEqual(json.load(entrada), limpar_arvore(arvore))
+        
+        profunda = criar_no('NUMERO', '1')
+        for _ in range(sys.getrecursionlimit() * 2):
+            profunda = criar_no('EXPRESSAO', None, [profunda])
+        self.assertEqual(contar_nos(limpar_arvore(profunda)), contar_nos(profunda))
+        self.assertEqual(contar_nos(gerar_visao_atribuida(profunda).como_dicionario()), contar_nos(profunda))
+
+if __name__ == '__main__':
+    unittest.main()
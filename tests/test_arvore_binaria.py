@@ -0,0 +1,150 @@
+"""
+testes para o formato binário de árvores com leitura preguiçosa
+"""
+
+import unittest
+import sys
+import os
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.arvore_binaria import (ArvoreBinaria, NoBinario, ArvoreBinariaError, serializar_arvores_binario,
+                                salvar_arvores_binario, carregar_arvores_binario, MAGICO_ARVORE)
+from src.syntax_tree import (converter_derivacao_para_arvore, salvar_arvore, carregar_arvore,
+                             imprimir_arvore, contar_nos, SyntaxTreeError)
+from src.arvore_atribuida import gerar_arvore_atribuida, salvar_arvore_json, carregar_arvore_json, ArvoreAtribuidaError
+from src.arvore_compartilhada import gerar_arvore_compartilhada, TabelaNos
+from src.token_types import NumeroLiteral
+from tests.arvores_teste import CasoArvores
+
+class TestArvoreBinaria(CasoArvores, unittest.TestCase):
+    """testes para serialização e leitura do formato binário"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """configuração inicial - árvores sintáticas e atribuídas"""
+        super().setUpClass()
+        cls.arvores = [converter_derivacao_para_arvore(derivacao) for derivacao in cls.derivacoes]
+        cls.atribuidas = [gerar_arvore_atribuida(arvore) for arvore in cls.arvores]
+    
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.diretorio.cleanup)
+    
+    def caminho(self, nome):
+        return os.path.join(self.diretorio.name, nome)
+    
+    def teste_ida_e_volta(self):
+        """teste árvores sintáticas e atribuídas iguais após gravar e ler"""
+        for arvores in (self.arvores, self.atribuidas):
+            arquivo = self.caminho("arvores.bin")
+            salvar_arvores_binario(arvores, arquivo)
+            
+            with ArvoreBinaria(arquivo) as lidas:
+                self.assertEqual(len(lidas), len(arvores))
+                self.assertEqual(lidas.carregar_todas(), arvores)
+                for lida, arvore in zip(lidas, arvores):
+                    self.assertIsInstance(lida, NoBinario)
+                    self.assertEqual(lida, arvore)
+                    self.assertEqual(imprimir_arvore(lida), imprimir_arvore(arvore))
+                    self.assertEqual(list(lida.keys()), list(arvore.keys()))
+    
+    def teste_literais_e_valores(self):
+        """teste NumeroLiteral, float, bool, int e filhos None preservados"""
+        arvore = {'tipo': 'RAIZ', 'real': 2.5, 'logico': True, 'inteiro': -7, 'nulo': None,
+                  'filhos': [None, {'tipo': 'FOLHA', 'valor': ''}]}
+        lida = ArvoreBinaria(serializar_arvores_binario([self.atribuidas[1], arvore]))
+        
+        self.assertEqual(lida[1], arvore)
+        self.assertIsNone(lida[1]['filhos'][0])
+        self.assertIs(lida[1]['logico'], True)
+        
+        numero = lida[0]['filhos'][0]['filhos'][0]['valor']
+        self.assertIsInstance(numero, NumeroLiteral)
+        self.assertEqual(numero.numero, 10.5)
+        
+        with self.assertRaises(ArvoreBinariaError):
+            serializar_arvores_binario([{'tipo': 'X', 'valor': [1, 2]}])
+    
+    def teste_leitura_preguicosa(self):
+        """teste só os nós acessados são decodificados"""
+        arquivo = self.caminho("arvores.bin")
+        salvar_arvores_binario(self.arvores, arquivo)
+        
+        with ArvoreBinaria(arquivo) as lidas:
+            raiz = lidas[len(lidas) - 1]
+            filho = raiz['filhos'][0]
+            
+            self.assertEqual(filho['tipo'], 'LACO')
+            self.assertIsNone(filho['filhos'][0].dados)
+            # chaves, EXPRESSAO, LACO e WHILE; os textos das outras árvores não
+            self.assertEqual(sum(texto is not None for texto in lidas.textos), 6)
+            self.assertLess(6, len(lidas.textos))
+            self.assertEqual(raiz.como_dicionario(), self.arvores[-1])
+    
+    def teste_arvore_profunda(self):
+        """teste gravação e leitura além do limite de recursão"""
+        arvore = {'tipo': 'NUMERO', 'valor': '1', 'filhos': []}
+        for _ in range(sys.getrecursionlimit() * 2):
+            arvore = {'tipo': 'EXPRESSAO', 'valor': None, 'filhos': [arvore]}
+        
+        lida = ArvoreBinaria(serializar_arvores_binario([arvore]))[0].como_dicionario()
+        self.assertEqual(contar_nos(lida), contar_nos(arvore))
+    
+    def teste_salvar_e_carregar_com_formato(self):
+        """teste formato 'binario' de salvar_arvore e salvar_arvore_json, JSON como padrão"""
+        arquivo = self.caminho("arvore.bin")
+        salvar_arvore(self.arvores[-1], arquivo, formato='binario')
+        with open(arquivo, 'rb') as entrada:
+            self.assertEqual(entrada.read(len(MAGICO_ARVORE)), MAGICO_ARVORE)
+        self.assertEqual(carregar_arvore(arquivo), self.arvores[-1])
+        
+        salvar_arvore_json(self.atribuidas[-1], arquivo, formato='binario')
+        self.assertEqual(carregar_arvore_json(arquivo), self.atribuidas[-1])
+        
+        # nós compartilhados também são gravados
+        compartilhada = gerar_arvore_compartilhada(self.derivacoes[-1], TabelaNos())
+        salvar_arvore(compartilhada, arquivo, formato='binario')
+        self.assertEqual(carregar_arvore(arquivo), self.arvores[-1])
+        
+        arquivo_json = self.caminho("arvore.json")
+        salvar_arvore(self.arvores[-1], arquivo_json)
+        self.assertEqual(carregar_arvore(arquivo_json), self.arvores[-1])
+    
+    def teste_carregar_arvore_le_por_inteiro(self):
+        """teste carregar_arvore devolve dicionários mutáveis e não deixa o arquivo mapeado"""
+        arquivo = self.caminho("arvore.bin")
+        salvar_arvore(self.arvores[-1], arquivo, formato='binario')
+        
+        arvore = carregar_arvore(arquivo)
+        self.assertIs(type(arvore), dict)
+        self.assertIs(type(arvore['filhos'][0]), dict)
+        arvore['filhos'][0]['tipo_inferido'] = 'int'
+        
+        if os.path.exists('/proc/self/maps'):
+            with open('/proc/self/maps', encoding='utf-8') as mapas:
+                self.assertNotIn(os.path.realpath(arquivo), mapas.read())
+        
+        # várias árvores só pelo leitor preguiçoso
+        salvar_arvores_binario(self.arvores, arquivo)
+        with self.assertRaises(SyntaxTreeError):
+            carregar_arvore(arquivo)
+        with self.assertRaises(ArvoreAtribuidaError):
+            carregar_arvore_json(arquivo)
+        with carregar_arvores_binario(arquivo) as arvores:
+            self.assertEqual(len(arvores), len(self.arvores))
+    
+    def teste_arquivo_invalido(self):
+        """teste cabeçalho errado e conteúdo truncado"""
+        conteudo = serializar_arvores_binario(self.arvores)
+        
+        with self.assertRaises(ArvoreBinariaError):
+            ArvoreBinaria(b'XXXX' + conteudo[4:])
+        with self.assertRaises(ArvoreBinariaError):
+            ArvoreBinaria(conteudo[:len(conteudo) // 2])
+        with self.assertRaises(ArvoreBinariaError):
+            ArvoreBinaria(self.caminho("inexistente.bin"))
+
+if __name__ == '__main__':
+    unittest.main()
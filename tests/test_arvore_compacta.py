@@ -0,0 +1,129 @@
+"""
+testes para a árvore sintática compacta (arena)
+"""
+
+import unittest
+import sys
+import os
+import json
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.arvore_compacta import ArenaArvore, gerar_arvore_compacta, compactar_arvore, SEM_INDICE
+from src.syntax_tree import (converter_derivacao_para_arvore, salvar_arvore, percorrer_pre_ordem,
+                             contar_nos, criar_no, SyntaxTreeError)
+from src.arvore_compartilhada import gerar_arvore_compartilhada, TabelaNos
+from src.token_types import NumeroLiteral
+from tests.arvores_teste import CasoVisaoNo, derivar_expressoes
+
+class TestArvoreCompacta(CasoVisaoNo, unittest.TestCase):
+    """testes para a arena de nós e a visão de dicionário"""
+    
+    def gerar_arvore(self, derivacao):
+        return gerar_arvore_compacta(derivacao)
+    
+    def teste_compactar_arvore(self):
+        """teste compactar a árvore de dicionários dá a mesma árvore"""
+        for expressao, derivacao in zip(self.expressoes, self.derivacoes):
+            with self.subTest(expressao=expressao):
+                esperado = converter_derivacao_para_arvore(derivacao)
+                self.assertEqual(compactar_arvore(esperado), esperado)
+    
+    def teste_salvar_arvore(self):
+        """teste JSON igual ao da árvore de dicionários"""
+        derivacao = self.derivacoes[-1]
+        
+        with tempfile.TemporaryDirectory() as diretorio:
+            arquivo = os.path.join(diretorio, "arvore.json")
+            salvar_arvore(gerar_arvore_compacta(derivacao), arquivo)
+            with open(arquivo, encoding='utf-8') as entrada:
+                salvo = json.load(entrada)
+        
+        self.assertEqual(salvo, converter_derivacao_para_arvore(derivacao))
+    
+    def teste_arena_compartilhada(self):
+        """teste várias árvores numa arena, com percursos por intervalo"""
+        arena = ArenaArvore()
+        arvores = [gerar_arvore_compacta(derivacao, arena) for derivacao in self.derivacoes]
+        
+        self.assertEqual(len(arena), sum(contar_nos(arvore) for arvore in arvores))
+        
+        for arvore, derivacao in zip(arvores, self.derivacoes):
+            esperado = converter_derivacao_para_arvore(derivacao)
+            tipos = []
+            percorrer_pre_ordem(esperado, lambda no: tipos.append(no['tipo']))
+            
+            self.assertEqual(arena.contar_nos(arvore.indice), contar_nos(esperado))
+            self.assertEqual([arena.tipo(indice) for indice in arena.iterar_pre_ordem(arvore.indice)], tipos)
+            self.assertEqual(arena.iterar_pos_ordem(arvore.indice)[-1], arvore.indice)
+        
+        # valores repetidos guardados uma vez
+        self.assertEqual(len(arena.tabela_valores), len(set(arena.tabela_valores)))
+    
+    def teste_compactar_subarvores_compartilhadas(self):
+        """teste cópia de árvores com o mesmo filho em vários pais e de visões"""
+        folha = criar_no('NUMERO', '1')
+        repetida = criar_no('OPERACAO', '+', [folha, folha])
+        
+        derivacao = derivar_expressoes(["((X 1 +) (X 1 +) *)"], self.tabela_ll1)[0]
+        compartilhada = gerar_arvore_compartilhada(derivacao, TabelaNos())
+        
+        esperado = converter_derivacao_para_arvore(derivacao)
+        casos = [(repetida, repetida), (compartilhada, esperado), (gerar_arvore_compacta(derivacao), esperado)]
+        
+        for arvore, dicionario in casos:
+            with self.subTest(arvore=dicionario):
+                compacta = compactar_arvore(arvore)
+                self.assertEqual(compacta, dicionario)
+                self.assertEqual(compacta.arena.contar_nos(compacta.indice), contar_nos(dicionario))
+    
+    def teste_valores_de_classes_diferentes(self):
+        """teste literal e texto de mesmo conteúdo guardados separadamente"""
+        arena = ArenaArvore()
+        texto = arena.adicionar_no('IDENTIFICADOR', '1')
+        literal = arena.adicionar_no('NUMERO', NumeroLiteral('1', 1))
+        inteiro = arena.adicionar_no('NUMERO', 1)
+        
+        self.assertIs(type(arena.valor(texto)), str)
+        self.assertIsInstance(arena.valor(literal), NumeroLiteral)
+        self.assertIs(type(arena.valor(inteiro)), int)
+        self.assertEqual(len(arena.tabela_valores), 3)
+    
+    def teste_tipo_desconhecido(self):
+        """teste nó de tipo fora de TIPOS_NO"""
+        with self.assertRaises(SyntaxTreeError):
+            ArenaArvore().adicionar_no('INEXISTENTE')
+    
+    def teste_filhos_fora_de_pos_ordem(self):
+        """teste filhos recusados quando a subárvore deixaria de ser contínua"""
+        arena = ArenaArvore()
+        um = arena.adicionar_no('NUMERO', '1')
+        dois = arena.adicionar_no('NUMERO', '2')
+        tres = arena.adicionar_no('NUMERO', '3')
+        
+        # filho que não é o último nó criado
+        with self.assertRaises(SyntaxTreeError):
+            arena.adicionar_no('EXPRESSAO', None, [dois])
+        # filhos fora de ordem ou com buraco entre eles
+        with self.assertRaises(SyntaxTreeError):
+            arena.adicionar_no('OPERACAO', '+', [tres, dois])
+        with self.assertRaises(SyntaxTreeError):
+            arena.adicionar_no('OPERACAO', '+', [um, tres])
+        with self.assertRaises(SyntaxTreeError):
+            arena.adicionar_no('OPERACAO', '+', [SEM_INDICE, um, dois, tres])
+        # nada foi ligado pelas tentativas recusadas
+        self.assertEqual(len(arena), 3)
+        self.assertEqual(list(arena.proximo_irmao), [SEM_INDICE] * 3)
+        
+        soma = arena.criar_no('OPERACAO', '+', [arena.no(dois), arena.no(tres)])
+        # nó que já tem pai não pode ser filho de novo
+        with self.assertRaises(SyntaxTreeError):
+            arena.adicionar_no('EXPRESSAO', None, [tres])
+        raiz = arena.adicionar_no('OPERACAO', '*', [um, soma.indice])
+        
+        self.assertEqual(list(arena.iterar_pos_ordem(raiz)), [um, dois, tres, soma.indice, raiz])
+        self.assertEqual(arena.contar_nos(raiz), 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+"""
+testes para a árvore sintática com nós compartilhados (hash-consing)
+"""
+
+import unittest
+import sys
+import os
+import gc
+import weakref
+import json
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.arvore_compartilhada import (NoCompartilhado, TabelaNos, gerar_arvore_compartilhada,
+                                      compartilhar_arvore)
+from src.syntax_tree import converter_derivacao_para_arvore, salvar_arvore, contar_nos, SyntaxTreeError
+from src.arvore_atribuida import gerar_arvore_atribuida
+from src.cache_expressoes import CacheExpressoes
+from src.lexer import parse_expressao
+from tests.arvores_teste import CasoVisaoNo, EXPRESSOES
+
+class TestArvoreCompartilhada(CasoVisaoNo, unittest.TestCase):
+    """testes para a tabela de internação e os nós compartilhados"""
+    
+    # o laço de fatorial.txt e sua primeira linha, que também aparece isolada
+    expressoes = EXPRESSOES + [
+        "(CONT NUM <= (((FAT CONT *) FAT) ((CONT 1 +) CONT)) WHILE)",
+        "((FAT CONT *) FAT)"
+    ]
+    
+    def gerar_arvore(self, derivacao):
+        return gerar_arvore_compartilhada(derivacao, TabelaNos())
+    
+    def teste_reaproveitados_na_mesma_tabela(self):
+        """teste a mesma TabelaNos devolve os mesmos objetos para todas as linhas"""
+        tabela = TabelaNos()
+        arvores = [gerar_arvore_compartilhada(derivacao, tabela) for derivacao in self.derivacoes]
+        criados = tabela.obter_estatisticas()['criados']
+        
+        for expressao, derivacao, arvore in zip(self.expressoes, self.derivacoes, arvores):
+            with self.subTest(expressao=expressao):
+                esperado = converter_derivacao_para_arvore(derivacao)
+                
+                self.assertIs(gerar_arvore_compartilhada(derivacao, tabela), arvore)
+                self.assertIs(compartilhar_arvore(esperado, tabela), arvore)
+                self.assertEqual(gerar_arvore_atribuida(arvore), gerar_arvore_atribuida(esperado))
+        
+        self.assertEqual(tabela.obter_estatisticas()['criados'], criados)
+    
+    def teste_subarvores_repetidas_compartilhadas(self):
+        """teste ((FAT CONT *) FAT) do laço e da linha isolada é o mesmo objeto"""
+        tabela = TabelaNos()
+        laco = gerar_arvore_compartilhada(self.derivacoes[-2], tabela)
+        comando = gerar_arvore_compartilhada(self.derivacoes[-1], tabela)
+        
+        # EXPRESSAO -> LACO -> BLOCO_COMPOSTO -> primeira EXPRESSAO
+        self.assertIs(laco['filhos'][0]['filhos'][1]['filhos'][0], comando)
+        self.assertIs(gerar_arvore_compartilhada(self.derivacoes[-1], tabela), comando)
+        
+        # a linha isolada não cria nós novos; FAT e CONT repetidos viram um nó
+        self.assertEqual(len(tabela), len(self.nos_de(laco)))
+        self.assertLess(len(tabela), contar_nos(laco))
+        self.assertGreater(tabela.obter_estatisticas()['reaproveitados'], 0)
+    
+    def nos_de(self, raiz):
+        """lista os objetos de nós distintos da subárvore"""
+        vistos = {}
+        pilha = [raiz]
+        while pilha:
+            no = pilha.pop()
+            vistos[id(no)] = no
+            pilha.extend(filho for filho in no.filhos if filho)
+        return vistos.values()
+    
+    def teste_hash_estrutural_e_memoizacao(self):
+        """teste nós de tabelas diferentes iguais, com o mesmo hash, servem de chave"""
+        derivacao = self.derivacoes[self.expressoes.index("((3 4 +) Y)")]
+        primeira = gerar_arvore_compartilhada(derivacao, TabelaNos())
+        segunda = gerar_arvore_compartilhada(derivacao, TabelaNos())
+        
+        self.assertIsNot(primeira, segunda)
+        self.assertEqual(primeira, segunda)
+        self.assertEqual(hash(primeira), hash(segunda))
+        
+        memo = {primeira: 'int'}
+        self.assertEqual(memo[segunda], 'int')
+        self.assertNotEqual(primeira, gerar_arvore_compartilhada(self.derivacoes[0], TabelaNos()))
+    
+    def teste_literal_e_texto_nao_misturados(self):
+        """teste NumeroLiteral e str de mesmo texto viram nós distintos"""
+        tabela = TabelaNos()
+        literal = parse_expressao("(3 5 +)")[1]['valor']
+        texto = str(literal)
+        
+        self.assertIsNot(tabela.criar_no('NUMERO', literal), tabela.criar_no('NUMERO', texto))
+        self.assertEqual(tabela.criar_no('NUMERO', literal).valor.numero, 3)
+    
+    def teste_referencias_fracas(self):
+        """teste entrada da tabela some com o del e as compartilhadas ficam"""
+        tabela = TabelaNos()
+        laco = gerar_arvore_compartilhada(self.derivacoes[-2], tabela)
+        comando = gerar_arvore_compartilhada(self.derivacoes[-1], tabela)
+        referencia = weakref.ref(laco)
+        self.assertIn(laco, tabela.nos.values())
+        
+        del laco
+        gc.collect()
+        self.assertIsNone(referencia())
+        self.assertEqual(len(tabela), len(self.nos_de(comando)))
+        
+        del comando
+        gc.collect()
+        self.assertEqual(len(tabela), 0)
+    
+    def teste_filho_precisa_ser_compartilhado(self):
+        """teste criar_no recusa filho que não veio de uma TabelaNos"""
+        with self.assertRaises(SyntaxTreeError):
+            TabelaNos().criar_no('EXPRESSAO', None, [{'tipo': 'NUMERO', 'valor': '1', 'filhos': []}])
+    
+    def teste_salvar_e_cache(self):
+        """teste JSON igual e cache com tabela de nós compartilhando entre linhas"""
+        derivacao = self.derivacoes[-2]
+        with tempfile.TemporaryDirectory() as diretorio:
+            arquivo = os.path.join(diretorio, "arvore.json")
+            salvar_arvore(gerar_arvore_compartilhada(derivacao, TabelaNos()), arquivo)
+            with open(arquivo, encoding='utf-8') as entrada:
+                salvo = json.load(entrada)
+        self.assertEqual(salvo, converter_derivacao_para_arvore(derivacao))
+        
+        cache = CacheExpressoes(8, TabelaNos())
+        laco = cache.analisar_expressao(self.expressoes[-2], self.tabela_ll1)['arvore']
+        comando = cache.analisar_expressao(self.expressoes[-1], self.tabela_ll1)['arvore']
+        self.assertIsInstance(laco, NoCompartilhado)
+        self.assertIs(laco['filhos'][0]['filhos'][1]['filhos'][0], comando)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,150 @@
+"""
+testes para o cache LRU do front-end
+"""
+
+import unittest
+import sys
+import os
+import io
+from contextlib import redirect_stdout
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cache_expressoes import CacheExpressoes, normalizar_expressao
+from src.grammar import obter_gramatica
+from src.lexer import parse_expressao, LexerError
+from src.parser import parsear
+from src.syntax_tree import converter_derivacao_para_arvore
+from src.arvore_atribuida import gerar_arvore_atribuida
+from src.tokenizacao_paralela import tokenizar_paralelo
+import src.cache_expressoes as modulo_cache
+from main_assembly import compilar_para_assembly
+
+class TestCacheExpressoes(unittest.TestCase):
+    """testes para o cache de expressões"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """configuração inicial - constrói gramática uma vez"""
+        cls.tabela = obter_gramatica()['tabela']
+    
+    def teste_normalizar_expressao(self):
+        """teste normalização de espaços"""
+        self.assertEqual(normalizar_expressao("  (3   5\t+) "), "(3 5 +)")
+    
+    def teste_resultado_igual_sem_cache(self):
+        """teste resultado idêntico ao pipeline sem cache"""
+        cache = CacheExpressoes()
+        expressao = "((2 3 *) (4 2 /) /)"
+        
+        resultado = cache.analisar_expressao(expressao, self.tabela)
+        derivacao = parsear(parse_expressao(expressao), self.tabela)['derivacao']
+        
+        self.assertEqual(resultado['tokens'], parse_expressao(expressao))
+        self.assertEqual(resultado['derivacao'], derivacao)
+        self.assertEqual(resultado['arvore'], converter_derivacao_para_arvore(derivacao))
+    
+    def teste_modo_fundido(self):
+        """teste árvore atribuída do front-end fundido guardada sem derivação"""
+        cache = CacheExpressoes()
+        expressao = "(A B > (1 X) (2 X) IF)"
+        derivacao = parsear(parse_expressao(expressao), self.tabela)['derivacao']
+        
+        resultado = cache.analisar_expressao(expressao, self.tabela, copiar=False, fundido=True)
+        repetido = cache.analisar_expressao(expressao, self.tabela, copiar=False, fundido=True)
+        
+        self.assertEqual(resultado['arvore_atribuida'],
+                         gerar_arvore_atribuida(converter_derivacao_para_arvore(derivacao)))
+        self.assertIsNone(resultado['derivacao'])
+        self.assertIs(repetido['arvore_atribuida'], resultado['arvore_atribuida'])
+    
+    def teste_acertos_e_falhas(self):
+        """teste contadores de acerto e falha"""
+        cache = CacheExpressoes()
+        cache.analisar_expressao("(3 5 +)", self.tabela)
+        cache.analisar_expressao("(3 5 +)", self.tabela)
+        cache.analisar_expressao("(3  5 +)", self.tabela)
+        
+        estatisticas = cache.obter_estatisticas()
+        self.assertEqual(estatisticas['falhas'], 1)
+        self.assertEqual(estatisticas['acertos'], 2)
+        self.assertEqual(estatisticas['tamanho'], 1)
+    
+    def teste_posicoes_com_espacamento_diferente(self):
+        """teste tokens refeitos quando o espaçamento muda"""
+        cache = CacheExpressoes()
+        cache.tokenizar("(3 5 +)")
+        tokens = cache.tokenizar("(3  5 +)")
+        
+        self.assertEqual(tokens, parse_expressao("(3  5 +)"))
+    
+    def teste_remocao_lru(self):
+        """teste remoção da entrada menos usada recentemente"""
+        cache = CacheExpressoes(tamanho_maximo=2)
+        cache.tokenizar("(1 2 +)")
+        cache.tokenizar("(3 4 +)")
+        cache.tokenizar("(1 2 +)")
+        cache.tokenizar("(5 6 +)")
+        
+        self.assertEqual(cache.obter_estatisticas()['remocoes'], 1)
+        self.assertIn("(1 2 +)", cache.entradas)
+        self.assertNotIn("(3 4 +)", cache.entradas)
+    
+    def teste_copias_independentes(self):
+        """teste que modificar o resultado não altera o cache"""
+        cache = CacheExpressoes()
+        resultado = cache.analisar_expressao("(3 5 +)", self.tabela)
+        resultado['arvore']['filhos'][0]['tipo_inferido'] = 'int'
+        
+        novo = cache.analisar_expressao("(3 5 +)", self.tabela)
+        self.assertNotIn('tipo_inferido', novo['arvore']['filhos'][0])
+    
+    def teste_tokens_independentes(self):
+        """teste que alterar os tokens devolvidos não altera o cache"""
+        cache = CacheExpressoes()
+        cache.tokenizar("(3 5 +)")[1].valor = '9'
+        cache.analisar_expressao("(3 5 +)", self.tabela)['tokens'][2].posicao = 0
+        
+        self.assertEqual(cache.tokenizar("(3 5 +)"), parse_expressao("(3 5 +)"))
+        self.assertEqual(cache.analisar_expressao("(3 5 +)", self.tabela)['tokens'], parse_expressao("(3 5 +)"))
+    
+    def teste_erro_lexico_nao_guardado(self):
+        """teste que erros léxicos não entram no cache"""
+        cache = CacheExpressoes()
+        
+        with self.assertRaises(LexerError):
+            cache.tokenizar("(3 $)")
+        self.assertEqual(len(cache), 0)
+
+    def teste_tokens_prontos(self):
+        """teste lotes já tokenizados entram no cache sem nova análise léxica"""
+        cache = CacheExpressoes()
+        lotes = list(tokenizar_paralelo(["(3 5 +)", "(3 5 +)", "(3  5 +)"], trabalhadores=1))
+        
+        with mock.patch.object(modulo_cache, 'parse_expressao', side_effect=AssertionError):
+            resultados = [cache.analisar_expressao(lote['expressao'], self.tabela, copiar=False,
+                                                   tokens=lote['tokens'])
+                          for lote in lotes]
+        
+        self.assertIs(resultados[0]['tokens'], lotes[0]['tokens'])
+        self.assertIs(resultados[1]['arvore'], resultados[0]['arvore'])
+        self.assertEqual(resultados[2]['tokens'], parse_expressao("(3  5 +)"))
+        self.assertEqual(cache.obter_estatisticas()['acertos'], 2)
+    
+    def teste_cache_com_tokenizacao_paralela(self):
+        """teste compilador usa o cache também com --trabalhadores"""
+        expressoes = ["(3 5 +)", "(2 X)", "(3 5 +)", "(3 $)", "(3 5 +)"]
+        
+        with redirect_stdout(io.StringIO()):
+            sequencial, stats_sequencial = compilar_para_assembly(expressoes, trabalhadores=1)
+            paralelo, stats_paralelo = compilar_para_assembly(expressoes, trabalhadores=2, tamanho_lote=2)
+        
+        self.assertEqual(paralelo, sequencial)
+        self.assertEqual(stats_paralelo['cache']['acertos'], 2)
+        self.assertEqual(stats_paralelo['cache']['acertos'], stats_sequencial['cache']['acertos'])
+        self.assertEqual(stats_paralelo['cache']['tamanho'], stats_sequencial['cache']['tamanho'])
+        self.assertEqual(stats_paralelo['expressoes_falhas'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
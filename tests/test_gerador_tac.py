@@ -43,7 +43,7 @@ try:
     # Imports das fases anteriores
     from src.lexer import parse_expressao
     from src.parser import parsear
-    from src.grammar import construir_gramatica
+    from src.grammar import obter_gramatica
     from src.syntax_tree import gerar_arvore
     from src.analisador_tipos import analisar_semantica
     from src.tabela_simbolos import inicializar_tabela_simbolos
@@ -129,7 +129,7 @@ def processar_arquivo_teste(nome_arquivo: str):
         print("FASES 2 e 3: Análise Sintática e Semântica")
         print("─" * 70)
         
-        gramatica_info = construir_gramatica()
+        gramatica_info = obter_gramatica()
         tabela = gramatica_info['tabela']
         tabela_simbolos = inicializar_tabela_simbolos()
         
@@ -3,6 +3,9 @@ testes para a gramática LL(1)
 """
 
 import unittest
+import tempfile
+import json
+from unittest import mock
 import sys
 import os
 
@@ -12,11 +15,22 @@ from src.grammar import (
     construir_gramatica,
     calcular_first,
     calcular_follow,
+    calcular_all_first,
+    calcular_all_follow,
     construir_tabela_ll1,
     validar_gramatica_ll1,
     obter_producao,
+    obter_gramatica,
+    TabelaLL1Densa,
+    SEM_PRODUCAO,
+    carregar_gramatica,
+    definir_producoes,
+    hash_producoes,
+    caminho_cache_gramatica,
+    analisar_gramatica,
     GramaticaError
 )
+import src.grammar as modulo_gramatica
 
 class TestGrammar(unittest.TestCase):
     """testes para a gramática"""
@@ -137,6 +151,194 @@ class TestGrammar(unittest.TestCase):
         for op in operadores_rel:
             self.assertIn(op, operadores_na_gramatica)
 
+class TestConjuntosPontoFixo(unittest.TestCase):
+    """testes para FIRST/FOLLOW em gramáticas com recursão e ε"""
+    
+    def teste_recursao_a_esquerda(self):
+        """teste recursão à esquerda não causa recursão infinita"""
+        gramatica = {
+            'PROGRAMA': [['LISTA']],
+            'LISTA': [['LISTA', '+', 'numero'], ['numero']]
+        }
+        first = calcular_all_first(gramatica)
+        follow = calcular_all_follow(gramatica, first)
+        
+        self.assertEqual(first['LISTA'], {'numero'})
+        self.assertEqual(follow['LISTA'], {'+', '$'})
+    
+    def teste_cadeia_epsilon(self):
+        """teste cadeia de não-terminais anuláveis"""
+        gramatica = {
+            'PROGRAMA': [['A', 'B', 'C', ')']],
+            'A': [['B'], []],
+            'B': [['C'], []],
+            'C': [['numero'], []]
+        }
+        first = calcular_all_first(gramatica)
+        follow = calcular_all_follow(gramatica, first)
+        
+        self.assertEqual(first['A'], {'numero', 'ε'})
+        self.assertEqual(first['PROGRAMA'], {'numero', ')'})
+        self.assertEqual(follow['A'], {'numero', ')'})
+        self.assertEqual(follow['C'], {'numero', ')'})
+    
+    def teste_recursao_mutua_follow(self):
+        """teste FOLLOW com ciclo entre não-terminais"""
+        gramatica = {
+            'PROGRAMA': [['X', 'identificador']],
+            'X': [['numero', 'Y']],
+            'Y': [['X'], []]
+        }
+        first = calcular_all_first(gramatica)
+        follow = calcular_all_follow(gramatica, first)
+        
+        self.assertEqual(follow['X'], {'identificador'})
+        self.assertEqual(follow['Y'], {'identificador'})
+
+class TestTabelaDensa(unittest.TestCase):
+    """testes para a tabela LL(1) densa"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """configuração inicial"""
+        cls.gramatica_info = obter_gramatica()
+        cls.densa = cls.gramatica_info['tabela_densa']
+    
+    def teste_mesmas_entradas(self):
+        """teste todas as células equivalem à tabela em dicionários"""
+        tabela = self.gramatica_info['tabela']
+        
+        for nt in self.densa.nao_terminais:
+            for terminal in self.densa.terminais:
+                esperado = obter_producao(tabela, nt, terminal)
+                obtido = obter_producao(self.densa, nt, terminal)
+                self.assertEqual(obtido, tuple(esperado) if esperado is not None else None)
+    
+    def teste_indice_unico(self):
+        """teste consulta por índices devolve índice de produção"""
+        id_nt = self.densa.indice_nao_terminal['EXPRESSAO']
+        id_terminal = self.densa.indice_terminal['(']
+        indice = self.densa.producao(id_nt, id_terminal)
+        
+        self.assertEqual(self.densa.producoes[indice], ('EXPRESSAO', ('(', 'CONTEUDO', ')')))
+        self.assertEqual(self.densa.producao(id_nt, self.densa.indice_terminal[')']), SEM_PRODUCAO)
+    
+    def teste_producoes_guardadas_uma_vez(self):
+        """teste vetor de produções e células compactas"""
+        total = sum(len(producoes) for producoes in self.gramatica_info['producoes'].values())
+        
+        self.assertEqual(len(self.densa.producoes), total)
+        self.assertEqual(len(self.densa.celulas), len(self.densa.nao_terminais) * len(self.densa.terminais))
+        self.assertEqual(self.densa.celulas.itemsize, 2)
+    
+    def teste_terminal_desconhecido(self):
+        """teste terminal fora da gramática"""
+        self.assertIsNone(obter_producao(self.densa, 'EXPRESSAO', 'invalido'))
+        self.assertIsNone(obter_producao(self.densa, 'INEXISTENTE', '('))
+    
+    def teste_gramatica_congelada(self):
+        """teste tabela densa somente leitura na gramática congelada"""
+        densa = obter_gramatica()['tabela_densa']
+        
+        self.assertIsInstance(densa, TabelaLL1Densa)
+        with self.assertRaises(TypeError):
+            densa.celulas[0] = 0
+
+class TestGramaticaCongelada(unittest.TestCase):
+    """testes para a análise congelada e o cache em disco"""
+    
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.diretorio.cleanup()
+    
+    def teste_singleton(self):
+        """teste análise construída uma vez por processo"""
+        self.assertIs(obter_gramatica(), obter_gramatica())
+    
+    def teste_mesma_analise(self):
+        """teste estruturas congeladas equivalem às de construir_gramatica"""
+        congelada = carregar_gramatica(diretorio_cache=None)
+        original = construir_gramatica()
+        
+        for nt in original['producoes']:
+            self.assertEqual(congelada['first'][nt], original['first'][nt])
+            self.assertEqual(congelada['follow'][nt], original['follow'][nt])
+            for terminal, producoes in original['tabela'][nt].items():
+                self.assertEqual([list(p) for p in congelada['tabela'][nt][terminal]], producoes)
+    
+    def teste_imutavel(self):
+        """teste estruturas não podem ser modificadas"""
+        congelada = carregar_gramatica(diretorio_cache=None)
+        
+        with self.assertRaises(TypeError):
+            congelada['tabela']['EXPRESSAO'] = {}
+        with self.assertRaises(AttributeError):
+            congelada['first']['EXPRESSAO'].add('x')
+    
+    def teste_cache_em_disco(self):
+        """teste análise salva e relida pelo hash das produções"""
+        primeira = carregar_gramatica(diretorio_cache=self.diretorio.name)
+        caminho = caminho_cache_gramatica(hash_producoes(definir_producoes()), self.diretorio.name)
+        self.assertTrue(os.path.exists(caminho))
+        
+        segunda = carregar_gramatica(diretorio_cache=self.diretorio.name)
+        self.assertEqual(segunda['tabela'], primeira['tabela'])
+        self.assertEqual(segunda['first'], primeira['first'])
+    
+    def teste_hash_muda_com_producoes(self):
+        """teste gramática alterada usa outra chave de cache"""
+        producoes = definir_producoes()
+        producoes['OPERADOR_ARIT'].append(['potencia'])
+        
+        self.assertNotEqual(hash_producoes(producoes), hash_producoes(definir_producoes()))
+        alterada = carregar_gramatica(producoes, self.diretorio.name)
+        self.assertIn('potencia', alterada['tabela']['OPERADOR_ARIT'])
+    
+    def teste_cache_corrompido(self):
+        """teste arquivo de cache inválido é ignorado"""
+        caminho = caminho_cache_gramatica(hash_producoes(definir_producoes()), self.diretorio.name)
+        with open(caminho, 'w') as arquivo:
+            arquivo.write("{corrompido")
+        
+        gramatica = carregar_gramatica(diretorio_cache=self.diretorio.name)
+        self.assertIn('(', gramatica['tabela']['EXPRESSAO'])
+    
+    def teste_cache_incompleto_recalculado(self):
+        """teste arquivo com o hash certo mas sem chaves ou com tabela inválida é refeito"""
+        producoes = definir_producoes()
+        caminho = caminho_cache_gramatica(hash_producoes(producoes), self.diretorio.name)
+        completo = analisar_gramatica(producoes)
+        
+        for dados in ({'hash': completo['hash'], 'producoes': producoes},
+                      {**completo, 'tabela': {'EXPRESSAO': {'(': 'x'}}}):
+            with open(caminho, 'w', encoding='utf-8') as arquivo:
+                json.dump(dados, arquivo)
+            
+            gramatica = carregar_gramatica(diretorio_cache=self.diretorio.name)
+            self.assertEqual(gramatica['tabela'], carregar_gramatica(diretorio_cache=None)['tabela'])
+            with open(caminho, encoding='utf-8') as arquivo:
+                self.assertEqual(json.load(arquivo)['tabela'], completo['tabela'])
+    
+    def teste_caminho_inclui_codigo_da_analise(self):
+        """teste mudança no código da análise muda o arquivo de cache"""
+        chave = hash_producoes(definir_producoes())
+        caminho = caminho_cache_gramatica(chave, self.diretorio.name)
+        with mock.patch.object(modulo_gramatica, 'calcular_impressao_codigo', return_value='outro codigo'):
+            self.assertNotEqual(caminho_cache_gramatica(chave, self.diretorio.name), caminho)
+    
+    def teste_codigo_so_lido_com_disco(self):
+        """teste sem cache em disco o código da análise não é lido"""
+        with mock.patch.object(modulo_gramatica, 'calcular_impressao_codigo',
+                               side_effect=AssertionError("código lido sem cache em disco")):
+            gramatica = carregar_gramatica(diretorio_cache=None)
+        self.assertIn('(', gramatica['tabela']['EXPRESSAO'])
+    
+    def teste_disco_opcional(self):
+        """teste sem RPN_CACHE_DIR o cache fica só em memória"""
+        self.assertEqual(modulo_gramatica.DIRETORIO_CACHE_GRAMATICA, os.environ.get('RPN_CACHE_DIR') or None)
+
 def teste_construir_gramatica():
     """função de teste standalone"""
     gramatica_info = construir_gramatica()
@@ -151,7 +353,7 @@ def teste_construir_gramatica():
 
 def teste_calcular_first():
     """função de teste standalone"""
-    gramatica_info = construir_gramatica()
+    gramatica_info = obter_gramatica()
     
     first = gramatica_info['first']
     
@@ -162,7 +364,7 @@ def teste_calcular_first():
 
 def teste_calcular_follow():
     """função de teste standalone"""
-    gramatica_info = construir_gramatica()
+    gramatica_info = obter_gramatica()
     
     follow = gramatica_info['follow']
     
@@ -173,7 +375,7 @@ def teste_calcular_follow():
 
 def teste_validar_ll1():
     """função de teste standalone"""
-    gramatica_info = construir_gramatica()
+    gramatica_info = obter_gramatica()
     tabela = gramatica_info['tabela']
     
     valida = validar_gramatica_ll1(tabela)
@@ -5,11 +5,15 @@ testes para o executador de expressões RPN
 import unittest
 import sys
 import os
+import copy
+import pickle
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.executor import executar_expressao, ExecutorError
-from src.lexer import parse_expressao
+from src.lexer import parse_expressao, LexerError, iterar_linhas, tokenizar_fluxo, tokenizar_bytes, iterar_tokens
+from src.token_types import Token, COD_NUMERO, COD_PARENTESE_ABRE, criar_token, como_token, NumeroLiteral
+from src.otimizador_tac import OtimizadorTAC, InstrucaoTAC
 
 def teste_operacao_simples():
     """teste operação básica de adição"""
@@ -128,6 +132,177 @@ def teste_erro_operandos_insuficientes():
     except ExecutorError:
         pass
 
+def teste_posicoes_tokens():
+    """teste posições atribuídas pelo analisador léxico"""
+    tokens = parse_expressao("(3.5 AB >=)")
+    assert [t['valor'] for t in tokens] == ['(', '3.5', 'AB', '>=', ')']
+    assert [t['posicao'] for t in tokens] == [0, 2, 6, 8, 10]
+
+def teste_tokens_adjacentes():
+    """teste separação de número e identificador sem espaço"""
+    tokens = parse_expressao("(3A 2 +)")
+    assert [t['tipo'] for t in tokens][1:3] == ['NUMERO', 'IDENTIFICADOR']
+
+def teste_erros_lexicos():
+    """teste mensagens e posições de erros léxicos"""
+    casos = [
+        ("(3..4 +)", "Número malformado: múltiplos pontos decimais em '3..'", 2),
+        ("(3. 4 +)", "Número malformado: ponto decimal sem dígitos subsequentes em '3.'", 2),
+        ("(3 4 =)", "Operador relacional inválido: '=)'", 6),
+        ("(3 4 $)", "Caractere inválido: '$'", 6),
+        ("(3))", "Parêntese de fechamento sem abertura correspondente", 4),
+        ("(3 4 =", "Operador relacional incompleto: '='", None),
+    ]
+    
+    for expressao, mensagem, posicao in casos:
+        try:
+            parse_expressao(expressao)
+            assert False, "deveria ter dado erro"
+        except LexerError as e:
+            assert e.mensagem == mensagem
+            assert e.posicao == posicao
+
+def teste_fluxo_blocos_cortados():
+    """teste análise em fluxo com linhas cortadas entre blocos"""
+    texto = "# comentario\n(3 4 +)\n\n  (A B ==)\n(3 4 $)\n(5 X)"
+    blocos = [texto[i:i + 3] for i in range(0, len(texto), 3)]
+    
+    lotes = list(tokenizar_fluxo(iter(blocos)))
+    
+    assert [lote['linha'] for lote in lotes] == [2, 4, 5, 6]
+    assert lotes[0]['expressao'] == "(3 4 +)"
+    assert [t['valor'] for t in lotes[0]['tokens']] == ['(', '3', '4', '+', ')']
+    # colunas contam o recuo da linha original
+    assert lotes[1]['tokens'][0]['posicao'] == 2
+    assert lotes[2]['tokens'] is None
+    assert isinstance(lotes[2]['erro'], LexerError)
+    assert lotes[3]['erro'] is None
+
+def teste_fluxo_arquivo():
+    """teste leitura em fluxo de objeto de arquivo"""
+    import io
+    arquivo = io.StringIO("(1 2 +)\n(3 4 *)\n")
+    
+    linhas = list(iterar_linhas(arquivo, tamanho_bloco=4))
+    assert linhas == [(1, "(1 2 +)"), (2, "(3 4 *)")]
+
+def teste_tokens_sob_demanda():
+    """teste análise token a token igual a parse_expressao, com a linha aos pedaços"""
+    import io
+    expressao = "  ((A 10.5 >=) (3 X) (12 RES) IF)"
+    esperado = [t.como_dicionario() for t in parse_expressao(expressao)]
+    
+    for tamanho in (1, 2, 5, len(expressao)):
+        blocos = [expressao[i:i + tamanho] for i in range(0, len(expressao), tamanho)]
+        assert [t.como_dicionario() for t in iterar_tokens(iter(blocos))] == esperado
+    
+    arquivo = io.StringIO(expressao)
+    assert [t.como_dicionario() for t in iterar_tokens(arquivo, tamanho_bloco=3)] == esperado
+    
+    for expressao in ["(3..4 +)", "(3 4 =)", "(3))", "(3 4 =", "(3 4 +", "3 4 +)", "   "]:
+        try:
+            parse_expressao(expressao)
+            assert False, "deveria ter dado erro"
+        except LexerError as e:
+            esperado = (e.mensagem, e.posicao)
+        try:
+            list(iterar_tokens(list(expressao)))
+            assert False, "deveria ter dado erro"
+        except LexerError as e:
+            assert (e.mensagem, e.posicao) == esperado
+
+def teste_token_compacto():
+    """teste token com código inteiro e acesso compatível por chave"""
+    tokens = parse_expressao("(42 MEM)")
+    
+    assert isinstance(tokens[1], Token)
+    assert tokens[0].codigo == COD_PARENTESE_ABRE
+    assert tokens[1].codigo == COD_NUMERO
+    assert tokens[1]['tipo'] == 'NUMERO'
+    assert tokens[1]['valor'] == '42'
+    assert tokens[1].get('posicao') == 2
+    assert 'posicao' in tokens[1]
+    assert tokens[1] == {'tipo': 'NUMERO', 'valor': '42', 'posicao': 2}
+
+def teste_token_sem_posicao():
+    """teste token sem posição se comporta como dicionário sem a chave"""
+    token = criar_token('IDENTIFICADOR', 'X')
+    
+    assert 'posicao' not in token
+    assert token.get('posicao') is None
+    assert como_token({'tipo': 'IDENTIFICADOR', 'valor': 'X'}) == token
+
+def teste_literais_decodificados():
+    """teste números decodificados uma vez pelo léxico"""
+    tokens = parse_expressao("(3.5 007 +)")
+    
+    assert isinstance(tokens[1]['valor'], NumeroLiteral)
+    assert tokens[1]['valor'] == '3.5' and tokens[1]['valor'].numero == 3.5
+    assert tokens[2]['valor'] == '007' and tokens[2]['valor'].numero == 7
+    # literais repetidos são o mesmo objeto
+    assert parse_expressao("(3.5 1 +)")[1]['valor'] is tokens[1]['valor']
+    # valor em slot, sem __dict__ por literal; cópias mantêm o número
+    assert not hasattr(tokens[1]['valor'], '__dict__')
+    for copia in (copy.deepcopy(tokens[1]['valor']), pickle.loads(pickle.dumps(tokens[1]['valor']))):
+        assert isinstance(copia, NumeroLiteral) and copia == '3.5' and copia.numero == 3.5
+
+def teste_folding_literais_tipados():
+    """teste otimizador com operandos vindos do léxico"""
+    a = parse_expressao("(2 X)")[1]['valor']
+    b = parse_expressao("(3 X)")[1]['valor']
+    
+    otimizador = OtimizadorTAC()
+    resultado = otimizador.constant_folding([InstrucaoTAC('OPERACAO', 't0', a, '*', b)])
+    
+    assert resultado[0].tipo == 'ATRIBUICAO'
+    assert resultado[0].operando1 == '6'
+    assert resultado[0].operando1.numero == 6
+
+def teste_folding_inteiro_grande_demais_para_float():
+    """teste literal inteiro acima do alcance de float fica sem dobramento"""
+    grande = parse_expressao("(1" + "0" * 400 + " X)")[1]['valor']
+    dois = parse_expressao("(2 X)")[1]['valor']
+    
+    otimizador = OtimizadorTAC()
+    assert otimizador.obter_valor_numerico(grande) is None
+    
+    instrucoes = [
+        InstrucaoTAC('ATRIBUICAO', 't0', grande),
+        InstrucaoTAC('OPERACAO', 't1', grande, '*', dois),
+        InstrucaoTAC('OPERACAO', 't2', 't0', '+', dois)
+    ]
+    resultado = otimizador.constant_folding(instrucoes)
+    assert [instrucao.tipo for instrucao in resultado] == ['ATRIBUICAO', 'OPERACAO', 'OPERACAO']
+    
+    resultado = otimizador.constant_propagation(instrucoes)
+    assert resultado[2].tipo == 'OPERACAO'
+    assert resultado[2].operando1 is grande
+
+def teste_modo_bytes():
+    """teste análise léxica sobre bytes, memoryview e mmap"""
+    import mmap
+    import tempfile
+    
+    dados = b"# programa\n(3 5 +)\r\n  (A 2.5 *)\n(3 $)\n(\xc3\x89 1 +)"
+    esperado = list(tokenizar_fluxo(iter([dados.decode('utf-8').replace('\r', '')])))
+    
+    with tempfile.TemporaryFile() as arquivo:
+        arquivo.write(dados)
+        arquivo.flush()
+        mapa = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        for fonte in (dados, memoryview(dados), mapa):
+            lotes = list(tokenizar_bytes(fonte))
+            assert [lote['linha'] for lote in lotes] == [2, 3, 4, 5]
+            assert [lote['expressao'] for lote in lotes] == [lote['expressao'] for lote in esperado]
+            assert lotes[1]['tokens'] == esperado[1]['tokens']
+            assert lotes[1]['tokens'][2]['valor'].numero == 2.5
+            # erro com linha e coluna corretas
+            assert lotes[2]['erro'].posicao == 4
+            assert lotes[3]['tokens'] == esperado[3]['tokens']
+        
+        mapa.close()
+
 class TestExecutor(unittest.TestCase):
     """testes para o executador de expressões"""
     
@@ -169,6 +344,39 @@ class TestExecutor(unittest.TestCase):
     
     def teste_erro_operandos_insuficientes(self):
         teste_erro_operandos_insuficientes()
+    
+    def teste_posicoes_tokens(self):
+        teste_posicoes_tokens()
+    
+    def teste_tokens_adjacentes(self):
+        teste_tokens_adjacentes()
+    
+    def teste_erros_lexicos(self):
+        teste_erros_lexicos()
+    
+    def teste_fluxo_blocos_cortados(self):
+        teste_fluxo_blocos_cortados()
+    
+    def teste_fluxo_arquivo(self):
+        teste_fluxo_arquivo()
+    
+    def teste_tokens_sob_demanda(self):
+        teste_tokens_sob_demanda()
+    
+    def teste_token_compacto(self):
+        teste_token_compacto()
+    
+    def teste_token_sem_posicao(self):
+        teste_token_sem_posicao()
+    
+    def teste_literais_decodificados(self):
+        teste_literais_decodificados()
+    
+    def teste_folding_literais_tipados(self):
+        teste_folding_literais_tipados()
+    
+    def teste_modo_bytes(self):
+        teste_modo_bytes()
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -9,7 +9,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from src.parser import parsear, ParserError
-from src.grammar import construir_gramatica
+from src.grammar import obter_gramatica
 from src.lexer import parse_expressao
 
 class TestParser(unittest.TestCase):
@@ -18,7 +18,7 @@ class TestParser(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
         """configuração inicial - constrói gramática uma vez"""
-        gramatica_info = construir_gramatica()
+        gramatica_info = obter_gramatica()
         cls.tabela = gramatica_info['tabela']
     
     def teste_expressao_simples(self):
@@ -112,6 +112,25 @@ class TestParser(unittest.TestCase):
         
         self.assertTrue(resultado['valido'])
     
+    def teste_aninhamento_a_esquerda_linear(self):
+        """teste sub-expressão inicial aninhada analisada uma única vez"""
+        expressao = "(1 X)"
+        for _ in range(60):
+            expressao = f"(({expressao} 2 +) Y)"
+        
+        resultado = parsear(parse_expressao(expressao), self.tabela)
+        
+        self.assertEqual(resultado['derivacao']['conteudo']['tipo'], 'COMANDO_ARMAZENAR_EXPRESSAO')
+    
+    def teste_erro_interno_nao_mascarado(self):
+        """teste erro dentro de estrutura aninhada reportado no ponto onde ocorre"""
+        tokens = parse_expressao("((X) 1 < (1 1) WHILE)")
+        
+        with self.assertRaises(ParserError) as contexto:
+            parsear(tokens, self.tabela)
+        
+        self.assertIn("Esperado operador, encontrado PARENTESE_FECHA", str(contexto.exception))
+    
     def teste_numero_decimal(self):
         """teste operação com números decimais"""
         tokens = parse_expressao("(3.14 2.71 +)")
@@ -123,7 +142,7 @@ class TestParser(unittest.TestCase):
 
 def teste_expressao_simples():
     """função de teste standalone"""
-    gramatica_info = construir_gramatica()
+    gramatica_info = obter_gramatica()
     tabela = gramatica_info['tabela']
     
     tokens = parse_expressao("(3 5 +)")
@@ -134,7 +153,7 @@ def teste_expressao_simples():
 
 def teste_expressao_aninhada():
     """função de teste standalone"""
-    gramatica_info = construir_gramatica()
+    gramatica_info = obter_gramatica()
     tabela = gramatica_info['tabela']
     
     tokens = parse_expressao("((2 3 *) (4 2 /) /)")
@@ -145,7 +164,7 @@ def teste_expressao_aninhada():
 
 def teste_comando_memoria():
     """função de teste standalone"""
-    gramatica_info = construir_gramatica()
+    gramatica_info = obter_gramatica()
     tabela = gramatica_info['tabela']
     
     tokens = parse_expressao("(42 MEM)")
@@ -157,7 +176,7 @@ def teste_comando_memoria():
 
 def teste_comando_res():
     """função de teste standalone"""
-    gramatica_info = construir_gramatica()
+    gramatica_info = obter_gramatica()
     tabela = gramatica_info['tabela']
     
     tokens = parse_expressao("(1 RES)")
@@ -0,0 +1,199 @@
+"""
+testes para o analisador sintático iterativo (pilha explícita)
+"""
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.parser import parsear, ParserError
+from src.parser_iterativo import parsear_iterativo, parsear_arvore, BufferTokens
+from src.syntax_tree import converter_derivacao_para_arvore
+from src.arvore_atribuida import gerar_arvore_atribuida
+from src.grammar import obter_gramatica
+from src.lexer import parse_expressao, iterar_tokens, LexerError
+
+class TestParserIterativo(unittest.TestCase):
+    """testes para o driver LL(1) sem recursão"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """configuração inicial - tabela da gramática do parser recursivo"""
+        cls.tabela = obter_gramatica()['tabela']
+    
+    def teste_mesma_derivacao_do_parser_recursivo(self):
+        """teste derivação idêntica à de parsear"""
+        expressoes = [
+            "(3 5 +)",
+            "((2 3 *) (4 2 /) /)",
+            "(10.5 X)",
+            "(X)",
+            "(5 RES)",
+            "((3 4 +) Y)",
+            "(X (2 RES) *)",
+            "(A B >)",
+            "(A B > (1 X) (2 X) IF)",
+            "((A) 10 < ((1 X) ((X) 1 +)) WHILE)",
+            "(A B == (((A) (B) > (1 Y) WHILE)) (0 Y) IF)"
+        ]
+        
+        for expressao in expressoes:
+            with self.subTest(expressao=expressao):
+                tokens = parse_expressao(expressao)
+                self.assertEqual(parsear_iterativo(tokens), parsear(tokens, self.tabela))
+    
+    def teste_tokens_em_dicionario(self):
+        """teste tokens no formato de dicionário"""
+        tokens = [token.como_dicionario() for token in parse_expressao("(3 5 +)")]
+        resultado = parsear_iterativo(tokens)
+        
+        self.assertTrue(resultado['valido'])
+        self.assertEqual(resultado['derivacao']['conteudo']['operador'], '+')
+    
+    def teste_erros(self):
+        """teste erros sintáticos com as mensagens do parser recursivo"""
+        expressoes = ["(3 +)", "(3 5)", "(3 5 + X)", "(X 3 IF)", "(A B > (1 X) (2 X))", "(1 2 > (1 X) (2 X) WHILE)", "()"]
+        
+        for expressao in expressoes:
+            with self.subTest(expressao=expressao):
+                tokens = parse_expressao(expressao)
+                
+                with self.assertRaises(ParserError) as esperado:
+                    parsear(tokens, self.tabela)
+                with self.assertRaises(ParserError) as obtido:
+                    parsear_iterativo(tokens)
+                
+                self.assertEqual(str(obtido.exception), str(esperado.exception))
+    
+    def teste_lista_vazia(self):
+        """teste lista de tokens vazia"""
+        with self.assertRaises(ParserError):
+            parsear_iterativo([])
+    
+    def teste_aninhamento_muito_profundo(self):
+        """teste aninhamento além do limite de recursão do python"""
+        profundidade = sys.getrecursionlimit() * 5
+        expressao = "(1 2 +)"
+        for _ in range(profundidade):
+            expressao = f"({expressao} 3 +)"
+        
+        derivacao = parsear_iterativo(parse_expressao(expressao))['derivacao']
+        
+        niveis = 0
+        while derivacao['conteudo']['tipo'] == 'OPERACAO' and derivacao['conteudo']['operando1']['tipo'] == 'EXPRESSAO':
+            derivacao = derivacao['conteudo']['operando1']
+            niveis += 1
+        
+        self.assertEqual(niveis, profundidade)
+
+class TestFrontEndFundido(unittest.TestCase):
+    """testes para o parser que monta direto a árvore atribuída"""
+    
+    @classmethod
+    def setUpClass(cls):
+        """configuração inicial - tabela da gramática do parser recursivo"""
+        cls.tabela = obter_gramatica()['tabela']
+    
+    def teste_mesma_arvore_do_pipeline(self):
+        """teste árvore igual a parsear + converter + gerar_arvore_atribuida"""
+        expressoes = [
+            "(3 5 +)",
+            "(10.5 X)",
+            "(X)",
+            "(5 RES)",
+            "((3 4 +) Y)",
+            "(A B >)",
+            "(A B > (1 X) (2 X) IF)",
+            "((A) 10 < ((1 X) ((X) 1 +)) WHILE)"
+        ]
+        
+        for expressao in expressoes:
+            with self.subTest(expressao=expressao):
+                tokens = parse_expressao(expressao)
+                derivacao = parsear(tokens, self.tabela)['derivacao']
+                esperado = gerar_arvore_atribuida(converter_derivacao_para_arvore(derivacao))
+                
+                arvore = parsear_arvore(tokens)['arvore']
+                
+                self.assertEqual(arvore, esperado)
+                self.assertEqual(list(arvore), list(esperado))
+    
+    def teste_derivacao_so_quando_pedida(self):
+        """teste derivação montada apenas com incluir_derivacao"""
+        tokens = parse_expressao("((2 3 *) Y)")
+        
+        self.assertIsNone(parsear_arvore(tokens)['derivacao'])
+        self.assertEqual(parsear_arvore(tokens, incluir_derivacao=True)['derivacao'],
+                         parsear(tokens, self.tabela)['derivacao'])
+    
+    def teste_linha_nos_nos(self):
+        """teste linha gravada em todos os nós"""
+        arvore = parsear_arvore(parse_expressao("(3 5 +)"), linha=7)['arvore']
+        
+        self.assertEqual(arvore['linha'], 7)
+        self.assertEqual(arvore['filhos'][0]['filhos'][1]['linha'], 7)
+        self.assertIsNone(arvore['tipo_inferido'])
+    
+    def teste_erro_sintatico(self):
+        """teste erro com a mesma mensagem do parser recursivo"""
+        tokens = parse_expressao("(3 5)")
+        
+        with self.assertRaises(ParserError) as esperado:
+            parsear(tokens, self.tabela)
+        with self.assertRaises(ParserError) as obtido:
+            parsear_arvore(tokens)
+        
+        self.assertEqual(str(obtido.exception), str(esperado.exception))
+
+class TestAnaliseSobDemanda(unittest.TestCase):
+    """testes para o parser puxando tokens direto do lexer"""
+    
+    def teste_mesmo_resultado_da_lista(self):
+        """teste árvore e derivação iguais às obtidas da lista de tokens"""
+        expressao = "(A B == (((A) (B) > (1 Y) WHILE)) (0 Y) IF)"
+        blocos = [expressao[i:i + 4] for i in range(0, len(expressao), 4)]
+        tokens = parse_expressao(expressao)
+        
+        self.assertEqual(parsear_arvore(iterar_tokens(iter(blocos))), parsear_arvore(tokens))
+        self.assertEqual(parsear_iterativo(iterar_tokens(expressao)), parsear_iterativo(tokens))
+        self.assertEqual(parsear_arvore(iter(tokens), incluir_derivacao=True),
+                         parsear_arvore(tokens, incluir_derivacao=True))
+    
+    def teste_analise_comeca_antes_do_fim_da_linha(self):
+        """teste erro sintático detectado sem ler o restante da linha"""
+        lidos = []
+        
+        def blocos():
+            for bloco in ["(3 ", "5)", " 1 2 3 4 5 6 +)"]:
+                lidos.append(bloco)
+                yield bloco
+        
+        with self.assertRaises(ParserError) as contexto:
+            parsear_arvore(iterar_tokens(blocos()))
+        
+        self.assertIn("Esperado operador", str(contexto.exception))
+        self.assertEqual(lidos, ["(3 ", "5)"])
+    
+    def teste_erro_lexico_propagado(self):
+        """teste erro léxico da fonte sob demanda chega como LexerError"""
+        with self.assertRaises(LexerError):
+            parsear_arvore(iterar_tokens("(3 4 $)"))
+    
+    def teste_fonte_vazia(self):
+        """teste iterador sem tokens"""
+        with self.assertRaises(ParserError):
+            parsear_iterativo(iter([]))
+    
+    def teste_buffer_lookahead(self):
+        """teste janela de lookahead com espiada de k tokens"""
+        buffer = BufferTokens(iter(parse_expressao("(3 5 +)")))
+        
+        self.assertEqual(buffer.espiar(2).valor, '5')
+        self.assertEqual(buffer.consumir().valor, '3')
+        self.assertEqual(buffer.espiar(3).valor, ')')
+        self.assertIsNone(buffer.espiar(4))
+
+if __name__ == '__main__':
+    unittest.main()
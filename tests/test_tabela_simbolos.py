@@ -0,0 +1,112 @@
+"""
+testes para a tabela de símbolos com pilha de escopos e ids densos
+"""
+
+import unittest
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tabela_simbolos import (inicializar_tabela_simbolos, adicionar_simbolo, buscar_simbolo, simbolo_existe,
+                                 atualizar_simbolo, obter_tipo_simbolo, entrar_escopo, sair_escopo,
+                                 listar_simbolos_escopo, obter_id_simbolo, buscar_simbolo_por_id,
+                                 total_ids_simbolos, validar_tabela, TabelaSimbolosError)
+
+class TestTabelaSimbolos(unittest.TestCase):
+    """testes para escopos, sombreamento e ids"""
+    
+    def setUp(self):
+        self.tabela = inicializar_tabela_simbolos()
+    
+    def teste_sombreamento_e_saida_de_escopo(self):
+        """teste símbolo interno sombreia o externo, que volta ao sair"""
+        adicionar_simbolo(self.tabela, 'X', 'int', 1, linha=1)
+        adicionar_simbolo(self.tabela, 'Y', 'int', 2, linha=1)
+        
+        entrar_escopo(self.tabela)
+        adicionar_simbolo(self.tabela, 'X', 'real', 1.5, linha=2)
+        adicionar_simbolo(self.tabela, 'Z', 'int', 3, linha=2)
+        atualizar_simbolo(self.tabela, 'Y', valor=20)
+        
+        self.assertEqual(obter_tipo_simbolo(self.tabela, 'X'), 'real')
+        self.assertEqual([nome for nome, _ in listar_simbolos_escopo(self.tabela)], ['X', 'Z'])
+        
+        sair_escopo(self.tabela)
+        
+        self.assertEqual(self.tabela['escopo_atual'], 0)
+        self.assertEqual(obter_tipo_simbolo(self.tabela, 'X'), 'int')
+        self.assertEqual(buscar_simbolo(self.tabela, 'X')['valor'], 1)
+        self.assertFalse(simbolo_existe(self.tabela, 'Z'))
+        # atualização de símbolo externo permanece
+        self.assertEqual(buscar_simbolo(self.tabela, 'Y')['valor'], 20)
+        self.assertEqual(self.tabela['desfazer'], [])
+    
+    def teste_escopos_irmaos_e_aninhados(self):
+        """teste saída volta ao escopo que abriu, não ao número anterior"""
+        entrar_escopo(self.tabela)
+        sair_escopo(self.tabela)
+        
+        entrar_escopo(self.tabela)
+        externo = self.tabela['escopo_atual']
+        adicionar_simbolo(self.tabela, 'A', 'int', 1)
+        entrar_escopo(self.tabela)
+        adicionar_simbolo(self.tabela, 'A', 'int', 2)
+        adicionar_simbolo(self.tabela, 'A', 'int', 3)
+        sair_escopo(self.tabela)
+        
+        self.assertEqual(self.tabela['escopo_atual'], externo)
+        self.assertEqual(buscar_simbolo(self.tabela, 'A')['valor'], 1)
+        
+        sair_escopo(self.tabela)
+        self.assertEqual(self.tabela['escopo_atual'], 0)
+        self.assertFalse(simbolo_existe(self.tabela, 'A'))
+        
+        # sair do escopo global não faz nada
+        sair_escopo(self.tabela)
+        self.assertEqual(self.tabela['escopo_atual'], 0)
+    
+    def teste_ids_densos(self):
+        """teste ids 0..n-1, mesmo id na redeclaração e ids válidos após sair"""
+        adicionar_simbolo(self.tabela, 'MEM', 'real', 1.0)
+        adicionar_simbolo(self.tabela, 'VAR', 'int')
+        adicionar_simbolo(self.tabela, 'MEM', 'int', 2)
+        
+        entrar_escopo(self.tabela)
+        adicionar_simbolo(self.tabela, 'MEM', 'int', 3)
+        id_interno = obter_id_simbolo(self.tabela, 'MEM')
+        sair_escopo(self.tabela)
+        
+        self.assertEqual(obter_id_simbolo(self.tabela, 'MEM'), 0)
+        self.assertEqual(obter_id_simbolo(self.tabela, 'VAR'), 1)
+        self.assertEqual(id_interno, 2)
+        self.assertEqual(total_ids_simbolos(self.tabela), 3)
+        self.assertEqual(buscar_simbolo_por_id(self.tabela, 0)['valor'], 2)
+        self.assertEqual(buscar_simbolo_por_id(self.tabela, id_interno)['valor'], 3)
+        
+        with self.assertRaises(TabelaSimbolosError):
+            buscar_simbolo_por_id(self.tabela, 3)
+        with self.assertRaises(TabelaSimbolosError):
+            obter_id_simbolo(self.tabela, 'NADA')
+        self.assertEqual(validar_tabela(self.tabela), (True, []))
+    
+    def teste_saida_nao_percorre_a_tabela(self):
+        """teste aninhamento profundo: registro de desfazer só com o escopo"""
+        for i in range(1000):
+            adicionar_simbolo(self.tabela, 'G' + chr(ord('A') + i % 26) * (i // 26 + 1), 'int', i)
+        
+        for nivel in range(500):
+            entrar_escopo(self.tabela)
+            adicionar_simbolo(self.tabela, 'L', 'int', nivel)
+        self.assertEqual(len(self.tabela['desfazer']), 500)
+        
+        for nivel in reversed(range(500)):
+            self.assertEqual(buscar_simbolo(self.tabela, 'L')['valor'], nivel)
+            sair_escopo(self.tabela)
+        
+        self.assertFalse(simbolo_existe(self.tabela, 'L'))
+        self.assertEqual(len(self.tabela['simbolos']), 1000)
+        self.assertEqual(total_ids_simbolos(self.tabela), 1500)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+"""
+testes para o leitor de tokens
+"""
+
+import unittest
+import tempfile
+import struct
+import sys
+import os
+from unittest import mock
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.token_reader import (
+    ler_tokens, salvar_tokens_binario, serializar_tokens_binario, ler_formato_binario,
+    eh_arquivo_tokens_binario, TokenReaderError, CABECALHO_BINARIO, MAGICO_TOKENS,
+    LeitorTokens, ler_indice_binario, validar_tokens
+)
+from src.token_types import NumeroLiteral, criar_token, NUMERO
+from src.lexer import parse_expressao
+
+EXPRESSOES = [
+    "(3 5 +)",
+    "((2 3 *) (4 2 /) /)",
+    "(42 MEM)",
+    "(MEM)",
+    "(1.5 RES)",
+    "((X 0 >) (1) (2) IF)"
+]
+
+def corromper_codigo_tipo(conteudo):
+    """troca o código de tipo do primeiro token por um código inexistente"""
+    conteudo = bytearray(conteudo)
+    conteudo[ler_indice_binario(conteudo)['inicio_registros']] = 200
+    return conteudo
+
+class TestFormatoBinario(unittest.TestCase):
+    """testes para o formato binário de tokens"""
+    
+    def setUp(self):
+        """cria diretório temporário para os arquivos"""
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "tokens.bin")
+        self.tokens_lista = [parse_expressao(expressao) for expressao in EXPRESSOES]
+    
+    def tearDown(self):
+        self.diretorio.cleanup()
+    
+    def teste_ida_e_volta(self):
+        """teste salvar e ler devolve os mesmos tokens"""
+        salvar_tokens_binario(self.tokens_lista, self.caminho)
+        
+        self.assertEqual(ler_tokens(self.caminho), self.tokens_lista)
+    
+    def teste_literais_decodificados(self):
+        """teste números voltam como NumeroLiteral e identificadores internados"""
+        salvar_tokens_binario(self.tokens_lista, self.caminho)
+        lidos = ler_tokens(self.caminho)
+        
+        numero = lidos[4][1].valor
+        self.assertIsInstance(numero, NumeroLiteral)
+        self.assertEqual(numero.numero, 1.5)
+        self.assertIs(lidos[2][2].valor, lidos[3][1].valor)
+    
+    def teste_tabela_de_strings(self):
+        """teste cada valor distinto é guardado uma única vez"""
+        repetidos = [parse_expressao("(3 5 +)")] * 100
+        conteudo = serializar_tokens_binario(repetidos)
+        num_strings = CABECALHO_BINARIO.unpack_from(conteudo)[3]
+        
+        self.assertEqual(num_strings, 5)
+        self.assertEqual(ler_formato_binario(conteudo), repetidos)
+    
+    def teste_posicao_ausente(self):
+        """teste tokens sem posição"""
+        tokens_lista = [[criar_token(NUMERO, "3")]]
+        lidos = ler_formato_binario(serializar_tokens_binario(tokens_lista))
+        
+        self.assertIsNone(lidos[0][0].posicao)
+    
+    def teste_deteccao_pelo_cabecalho(self):
+        """teste detecção do formato pelo magic"""
+        salvar_tokens_binario(self.tokens_lista, self.caminho)
+        texto = os.path.join(self.diretorio.name, "expressoes.txt")
+        with open(texto, 'w') as arquivo:
+            arquivo.write("\n".join(EXPRESSOES) + "\n")
+        
+        self.assertTrue(eh_arquivo_tokens_binario(self.caminho))
+        self.assertFalse(eh_arquivo_tokens_binario(texto))
+        self.assertEqual(ler_tokens(texto), self.tokens_lista)
+    
+    def teste_versao_nao_suportada(self):
+        """teste versão desconhecida é rejeitada"""
+        conteudo = bytearray(serializar_tokens_binario(self.tokens_lista))
+        struct.pack_into('<H', conteudo, len(MAGICO_TOKENS), 99)
+        
+        with self.assertRaises(TokenReaderError) as contexto:
+            ler_formato_binario(conteudo)
+        self.assertIn("Versão", contexto.exception.mensagem)
+    
+    def teste_arquivo_truncado(self):
+        """teste arquivo cortado no meio dos registros"""
+        conteudo = serializar_tokens_binario(self.tokens_lista)
+        
+        with self.assertRaises(TokenReaderError):
+            ler_formato_binario(conteudo[:-5])
+    
+    def teste_codigo_de_tipo_invalido(self):
+        """teste código de tipo fora de NOMES_TIPOS rejeitado na carga"""
+        conteudo = corromper_codigo_tipo(serializar_tokens_binario(self.tokens_lista))
+        
+        with self.assertRaises(TokenReaderError) as contexto:
+            ler_formato_binario(conteudo)
+        self.assertIn("código de tipo", contexto.exception.mensagem)
+
+class TestLeitorTokens(unittest.TestCase):
+    """testes para a leitura preguiçosa de tokens"""
+    
+    def setUp(self):
+        """cria arquivo de expressões com um comentário e uma linha inválida"""
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "expressoes.txt")
+        with open(self.caminho, 'w') as arquivo:
+            arquivo.write("# teste\n(3 5 +)\n\n(3 $)\n(42 MEM)\n(MEM)\n")
+    
+    def tearDown(self):
+        self.diretorio.cleanup()
+    
+    def teste_erro_isolado_por_linha(self):
+        """teste erro de uma linha não interrompe as seguintes"""
+        with LeitorTokens(self.caminho) as leitor:
+            resultados = list(leitor)
+        
+        self.assertEqual([numero for numero, _ in resultados], [2, 4, 5, 6])
+        self.assertIsInstance(resultados[1][1], TokenReaderError)
+        self.assertEqual(resultados[1][1].linha, 4)
+        self.assertEqual(resultados[2][1], parse_expressao("(42 MEM)"))
+    
+    def teste_retomar_pelo_deslocamento(self):
+        """teste retomada a partir do byte da próxima linha"""
+        leitor = LeitorTokens(self.caminho)
+        next(leitor)
+        deslocamento, linha = leitor.deslocamento, leitor.numero_linha + 1
+        leitor.fechar()
+        
+        numeros = [numero for numero, _ in LeitorTokens(self.caminho, deslocamento, linha)]
+        self.assertEqual(numeros, [4, 5, 6])
+    
+    def teste_pular(self):
+        """teste pular expressões sem tokenizar"""
+        with LeitorTokens(self.caminho) as leitor:
+            self.assertEqual(leitor.pular(2), 2)
+            self.assertEqual(next(leitor)[0], 5)
+            self.assertEqual(leitor.pular(10), 1)
+    
+    def teste_formato_binario(self):
+        """teste leitura preguiçosa e retomada no formato binário"""
+        binario = os.path.join(self.diretorio.name, "tokens.bin")
+        tokens_lista = [parse_expressao(expressao) for expressao in EXPRESSOES]
+        salvar_tokens_binario(tokens_lista, binario)
+        
+        with LeitorTokens(binario) as leitor:
+            self.assertEqual(next(leitor), (1, tokens_lista[0]))
+            deslocamento = leitor.deslocamento
+        
+        with LeitorTokens(binario, deslocamento) as leitor:
+            restantes = list(leitor)
+        self.assertEqual(restantes, list(enumerate(tokens_lista, 1))[1:])
+    
+    def teste_codigo_de_tipo_invalido_isolado(self):
+        """teste expressão com código de tipo inválido vira erro só na sua linha"""
+        binario = os.path.join(self.diretorio.name, "tokens.bin")
+        tokens_lista = [parse_expressao(expressao) for expressao in EXPRESSOES]
+        with open(binario, 'wb') as arquivo:
+            arquivo.write(corromper_codigo_tipo(serializar_tokens_binario(tokens_lista)))
+        
+        with LeitorTokens(binario) as leitor:
+            resultados = list(leitor)
+        
+        self.assertIsInstance(resultados[0][1], TokenReaderError)
+        self.assertEqual(resultados[0][1].linha, 1)
+        self.assertEqual(resultados[1:], list(enumerate(tokens_lista, 1))[1:])
+    
+    def teste_erro_na_abertura_fecha_arquivo(self):
+        """teste arquivo liberado quando a abertura falha (cabeçalho ou leitura)"""
+        binario = os.path.join(self.diretorio.name, "tokens.bin")
+        conteudo = bytearray(serializar_tokens_binario([parse_expressao("(3 5 +)")]))
+        struct.pack_into('<H', conteudo, len(MAGICO_TOKENS), 99)
+        with open(binario, 'wb') as arquivo:
+            arquivo.write(conteudo)
+        
+        abertos = []
+        abrir_binario = LeitorTokens.abrir_binario
+        
+        def abrir_binario_registrando(leitor):
+            abertos.append(leitor.arquivo)
+            abrir_binario(leitor)
+        
+        def abrir_texto_com_falha(leitor):
+            abertos.append(leitor.arquivo)
+            raise OSError("falha simulada")
+        
+        with mock.patch.object(LeitorTokens, 'abrir_binario', abrir_binario_registrando):
+            with self.assertRaises(TokenReaderError):
+                LeitorTokens(binario)
+        with mock.patch.object(LeitorTokens, 'abrir_texto', abrir_texto_com_falha):
+            with self.assertRaises(OSError):
+                LeitorTokens(self.caminho)
+        
+        self.assertEqual(len(abertos), 2)
+        self.assertTrue(all(arquivo.closed for arquivo in abertos))
+
+class TestValidarTokens(unittest.TestCase):
+    """testes para validar_tokens com Token e dicionários"""
+    
+    def teste_tipo_desconhecido_aceito(self):
+        """teste dicionário com tipo fora de NOMES_TIPOS continua aceito"""
+        tokens = [token.como_dicionario() for token in parse_expressao("(3 5 +)")]
+        tokens[1] = {'tipo': 'LITERAL_EXTERNO', 'valor': '3'}
+        
+        self.assertTrue(validar_tokens([tokens, parse_expressao("(X)")]))
+    
+    def teste_parenteses_nos_dois_formatos(self):
+        """teste balanceamento contado em Token e em dicionários"""
+        tokens = parse_expressao("(3 5 +)")
+        
+        with self.assertRaises(TokenReaderError):
+            validar_tokens([tokens[:-1] + [{'tipo': 'LITERAL_EXTERNO', 'valor': ')'}]])
+        with self.assertRaises(TokenReaderError):
+            validar_tokens([tokens + [{'tipo': 'PARENTESE_FECHA', 'valor': ')'}]])
+        with self.assertRaises(TokenReaderError):
+            validar_tokens([tokens[:2] + ['+', tokens[-1]]])
+
+if __name__ == '__main__':
+    unittest.main()
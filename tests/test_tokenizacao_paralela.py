@@ -0,0 +1,89 @@
+"""
+testes para a tokenização paralela
+"""
+
+import unittest
+import tempfile
+import sys
+import os
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tokenizacao_paralela import (
+    tokenizar_paralelo, tokenizar_arquivo_paralelo, calcular_faixas_bytes
+)
+from src.token_reader import ler_formato_expressoes, TokenReaderError
+from src.lexer import parse_expressao, tokenizar_bytes
+
+LINHAS = [
+    "(3 5 +)",
+    "  ((2 3 *) (4 2 /) /)",
+    "",
+    "# comentário",
+    "(3 $)",
+    "(1.5 RES)",
+    "\t(é 2 +)",
+    "((X 0 >) (1) (2) IF)"
+] * 25
+
+def resumir(lotes):
+    """lotes comparáveis (erros pela mensagem)"""
+    return [(lote['linha'], lote['expressao'], lote['tokens'], str(lote['erro'])) for lote in lotes]
+
+class TestTokenizacaoParalela(unittest.TestCase):
+    """testes para a tokenização em processos"""
+    
+    def setUp(self):
+        """cria arquivo de expressões"""
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.caminho = os.path.join(self.diretorio.name, "expressoes.txt")
+        with open(self.caminho, 'w', encoding='utf-8') as arquivo:
+            arquivo.write("\n".join(LINHAS))
+    
+    def tearDown(self):
+        self.diretorio.cleanup()
+    
+    def teste_faixas_de_linhas_em_ordem(self):
+        """teste resultado igual ao sequencial, na ordem original"""
+        lotes = list(tokenizar_paralelo(LINHAS, trabalhadores=2, tamanho_lote=7))
+        sequencial = list(tokenizar_paralelo(LINHAS, trabalhadores=1, tamanho_lote=len(LINHAS)))
+        
+        self.assertEqual(resumir(lotes), resumir(sequencial))
+        self.assertEqual(lotes[0]['tokens'], parse_expressao("(3 5 +)"))
+        self.assertEqual(lotes[1]['tokens'], parse_expressao("((2 3 *) (4 2 /) /)"))
+        self.assertEqual([lote['linha'] for lote in lotes[:3]], [1, 2, 5])
+        self.assertIn("'$'", str(lotes[2]['erro']))
+    
+    def teste_faixas_de_bytes(self):
+        """teste faixas de bytes equivalem a tokenizar_bytes no arquivo todo"""
+        with open(self.caminho, 'rb') as arquivo:
+            esperado = list(tokenizar_bytes(arquivo.read()))
+        
+        lotes = list(tokenizar_arquivo_paralelo(self.caminho, trabalhadores=2, tamanho_faixa=100))
+        self.assertEqual(resumir(lotes), resumir(esperado))
+    
+    def teste_faixas_terminam_em_quebra(self):
+        """teste limites das faixas caem no início de linhas"""
+        with open(self.caminho, 'rb') as arquivo:
+            dados = arquivo.read()
+        
+        faixas = list(calcular_faixas_bytes(self.caminho, 64))
+        self.assertEqual(faixas[0][0], 0)
+        self.assertEqual(faixas[-1][1], len(dados))
+        for inicio, fim in faixas[1:]:
+            self.assertEqual(dados[inicio - 1:inicio], b'\n')
+    
+    def teste_ler_formato_expressoes(self):
+        """teste leitura paralela igual à sequencial e erro na linha certa"""
+        validas = [linha for linha in LINHAS if '$' not in linha and 'é' not in linha]
+        self.assertEqual(
+            ler_formato_expressoes(validas, trabalhadores=2, tamanho_lote=5),
+            ler_formato_expressoes(validas)
+        )
+        
+        with self.assertRaises(TokenReaderError) as contexto:
+            ler_formato_expressoes(LINHAS, trabalhadores=2, tamanho_lote=5)
+        self.assertEqual(contexto.exception.linha, 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+testes para os percursos iterativos e visitantes de árvore
+"""
+
+import unittest
+import sys
+import os
+import copy
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.visitantes import (Visitante, percorrer_com_visitantes, iterar_pre_ordem, iterar_pos_ordem,
+                            iterar_em_nivel, ContadorNos, AlturaArvore, AplicarFuncao)
+from src.syntax_tree import criar_no, contar_nos, calcular_altura
+from src.analisador_tipos import AnotadorTipos, anotar_tipos_arvore
+from src.analisador_controle import AninhamentoControle
+from src.parser_iterativo import parsear_arvore
+from src.tabela_simbolos import inicializar_tabela_simbolos
+from src.lexer import parse_expressao
+
+def arvore_exemplo():
+    """A(B(D, E), C(F))"""
+    return criar_no('A', None, [
+        criar_no('B', None, [criar_no('D'), criar_no('E')]),
+        criar_no('C', None, [criar_no('F')])
+    ])
+
+class RegistroEventos(Visitante):
+    """visitante de teste que anota a sequência de entradas e saídas"""
+    
+    def __init__(self):
+        self.eventos = []
+    
+    def entrar(self, no, nivel):
+        self.eventos.append(('entrar', no['tipo'], nivel))
+    
+    def sair(self, no, nivel):
+        self.eventos.append(('sair', no['tipo'], nivel))
+
+class TestVisitantes(unittest.TestCase):
+    """testes para percursos e visitantes"""
+    
+    def teste_ordens_de_percurso(self):
+        """teste pré-ordem, pós-ordem e por níveis"""
+        arvore = arvore_exemplo()
+        
+        self.assertEqual([(no['tipo'], nivel) for no, nivel in iterar_pre_ordem(arvore)],
+                         [('A', 0), ('B', 1), ('D', 2), ('E', 2), ('C', 1), ('F', 2)])
+        self.assertEqual([no['tipo'] for no, _ in iterar_pos_ordem(arvore)], ['D', 'E', 'B', 'F', 'C', 'A'])
+        self.assertEqual([no['tipo'] for no, _ in iterar_em_nivel(arvore)], ['A', 'B', 'C', 'D', 'E', 'F'])
+        self.assertEqual(list(iterar_pre_ordem(None)), [])
+    
+    def teste_entrar_e_sair(self):
+        """teste eventos de entrada e saída com filhos None ignorados"""
+        arvore = criar_no('A', None, [criar_no('B'), None, criar_no('C', None, [criar_no('D')])])
+        registro, = percorrer_com_visitantes(arvore, [RegistroEventos()])
+        
+        self.assertEqual(registro.eventos, [
+            ('entrar', 'A', 0), ('entrar', 'B', 1), ('sair', 'B', 1),
+            ('entrar', 'C', 1), ('entrar', 'D', 2), ('sair', 'D', 2), ('sair', 'C', 1),
+            ('sair', 'A', 0)
+        ])
+    
+    def teste_varios_visitantes_uma_passada(self):
+        """teste contagem, altura, funções e anotação de tipos na mesma passada"""
+        arvore = parsear_arvore(parse_expressao("((A) 2.5 > (1 X) (2.5 Y) IF)"))['arvore']
+        separada = copy.deepcopy(arvore)
+        anotar_tipos_arvore(separada, inicializar_tabela_simbolos(), [])
+        
+        pos_ordem = []
+        visitantes = percorrer_com_visitantes(arvore, [
+            AnotadorTipos(inicializar_tabela_simbolos(), []),
+            ContadorNos(),
+            AlturaArvore(),
+            AplicarFuncao(lambda no: pos_ordem.append(no['tipo']), pos_ordem=True)
+        ])
+        
+        self.assertEqual(arvore, separada)
+        self.assertEqual(visitantes[1].resultado(), contar_nos(arvore))
+        self.assertEqual(visitantes[2].resultado(), calcular_altura(arvore))
+        self.assertEqual(pos_ordem, [no['tipo'] for no, _ in iterar_pos_ordem(arvore)])
+    
+    def teste_altura_com_filho_none(self):
+        """teste filho None conta como folha na altura"""
+        self.assertEqual(calcular_altura(criar_no('A', None, [None])), 1)
+        self.assertEqual(calcular_altura(criar_no('A')), 0)
+        self.assertEqual(calcular_altura(None), 0)
+    
+    def teste_arvore_alem_do_limite_de_recursao(self):
+        """teste percursos e análise em aninhamento mais fundo que o limite de recursão"""
+        profundidade = sys.getrecursionlimit() * 2
+        expressao = "(1 2 +)"
+        for _ in range(profundidade):
+            expressao = f"({expressao} 3 +)"
+        arvore = parsear_arvore(parse_expressao(expressao))['arvore']
+        
+        erros = []
+        anotar_tipos_arvore(arvore, inicializar_tabela_simbolos(), erros)
+        
+        self.assertEqual(erros, [])
+        self.assertEqual(arvore['tipo_inferido'], 'int')
+        self.assertEqual(calcular_altura(arvore), 2 * profundidade + 2)
+        self.assertEqual(contar_nos(arvore), 3 * profundidade + 4)
+    
+    def teste_aninhamento_controle(self):
+        """teste nível de IF/WHILE acompanhado na entrada e na saída"""
+        expressao = "(1 X)"
+        for _ in range(4):
+            expressao = f"(A B > ({expressao}) (0 Y) IF)"
+        arvore = parsear_arvore(parse_expressao(expressao))['arvore']
+        aninhamento, = percorrer_com_visitantes(arvore, [AninhamentoControle()])
+        
+        self.assertEqual(aninhamento.resultado(), 4)
+        self.assertEqual(len(aninhamento.avisos), 1)
+        self.assertEqual(aninhamento.nivel, 0)
+
+if __name__ == '__main__':
+    unittest.main()